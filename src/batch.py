@@ -0,0 +1,273 @@
+"""
+Headless batch map generation.
+
+Generates many maps in parallel with generate_voronoi_map. Every combination of the parameter
+grid is generated once for every seed of the seed range, spread over a process pool.
+Each finished map is written to the output folder (.h3m, plus .json unless --no-json is given)
+as soon as it is ready and recorded in manifest.jsonl, so an interrupted run can be resumed
+by running the same command again.
+
+A map depends only on its params and seed, so every manifest entry can be generated again.
+Because str hashes are salted per process, any iteration over a set of strings in the generator would
+still depend on the process, so the batch always runs with PYTHONHASHSEED=HASH_SEED (main() starts
+itself again with it when needed).
+
+Examples:
+    python src/batch.py --output maps --seeds 0-99 --size 72 144 --players 4 8
+    python src/batch.py --output maps --grid season_grid.json --seeds 0-49 --workers 8
+
+Grid file - JSON object mapping parameter names to a value or a list of values:
+    {
+        "size": [72, 108],
+        "players_count": [4, 8],
+        "neutral_cities": 2,
+        "difficulty": [1, 2],
+        "road_network_mode": ["mst", "steiner"],
+        "terrain_values": [{"WATER": 1, "GRASS": 3, "SAND": 2}, {"SNOW": 3, "DIRT": 2}]
+    }
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import itertools
+import contextlib
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from classes.tile.Tile import TerrainType
+from classes.H3mWriter import save_h3m
+from classes.MapJsonWriter import save_map_json
+from generation.map_gen.map_gen import generate_voronoi_map
+from generation.object_gen.json_parser import preload_catalogs
+from generation.tile_gen.roads_gen.RoadGenerator import ROAD_NETWORK_MODES
+
+MANIFEST_FILENAME = "manifest.jsonl"
+SUMMARY_FILENAME = "summary.json"
+
+# PYTHONHASHSEED of batch runs, maps of the same params and seed are identical only under the same value
+HASH_SEED = "0"
+
+# Parameters of generate_voronoi_map that can be set from the grid
+GRID_PARAMETERS = ("terrain_values", "size", "players_count", "player_cities", "neutral_cities", "difficulty",
+                   "road_network_mode")
+
+
+def parse_seeds(text: str) -> list[int]:
+    """Parse seeds given as '7', '0-99' or '1,5,10-12'."""
+    seeds = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            seeds.extend(range(int(first), int(last) + 1))
+        else:
+            seeds.append(int(part))
+    return seeds
+
+
+def expand_grid(grid: dict) -> list[dict]:
+    """Return every combination of the grid values as a list of parameter dicts."""
+    unknown = set(grid) - set(GRID_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown grid parameters: {', '.join(sorted(unknown))}")
+
+    keys = sorted(grid)
+    values = [grid[key] if isinstance(grid[key], list) else [grid[key]] for key in keys]
+    return [dict(zip(keys, combination)) for combination in itertools.product(*values)]
+
+
+def job_name(params: dict, seed: int) -> str:
+    """Stable, human readable name of a job, used for file names and for resuming."""
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+    size = params.get("size", 72)
+    players = params.get("players_count", 8)
+    return f"map_{size}_{players}p_{digest}_seed{seed}"
+
+
+def read_manifest(output_dir: str) -> dict[str, dict]:
+    """Read entries of an existing manifest, skipping a possibly truncated last line."""
+    entries = {}
+    path = os.path.join(output_dir, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return entries
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries[entry["name"]] = entry
+    return entries
+
+
+def generate_job(name: str, params: dict, seed: int, output_dir: str, write_json: bool, compact_json: bool,
+                 verbose: bool) -> dict:
+    """
+    Generate one map and write it to the output folder. Runs inside a worker process.
+
+    Returns:
+        dict: manifest entry of the job
+    """
+    entry = {"name": name, "seed": seed, "params": params, "hash_seed": os.environ.get("PYTHONHASHSEED"), "status": "ok"}
+    start = time.perf_counter()
+
+    kwargs = dict(params)
+    if "terrain_values" in kwargs:
+        kwargs["terrain_values"] = {TerrainType[terrain.upper()]: weight for terrain, weight in kwargs["terrain_values"].items()}
+    if "players_count" in kwargs and "player_cities" not in kwargs:
+        kwargs["player_cities"] = kwargs["players_count"]
+
+    try:
+        random.seed(seed)
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                devnull = stack.enter_context(open(os.devnull, "w"))
+                stack.enter_context(contextlib.redirect_stdout(devnull))
+            map, towns_generated, heroes_generated, monsters_generated = generate_voronoi_map(**kwargs)
+
+        if write_json:
+            json_file_path = os.path.join(output_dir, f"{name}.json")
+            save_map_json(map, json_file_path + ".tmp", compact=compact_json)
+            os.replace(json_file_path + ".tmp", json_file_path)
+            entry["json"] = os.path.basename(json_file_path)
+
+        h3m_file_path = os.path.join(output_dir, f"{name}.h3m")
+        save_h3m(map, h3m_file_path + ".tmp")
+        os.replace(h3m_file_path + ".tmp", h3m_file_path)
+        entry["h3m"] = os.path.basename(h3m_file_path)
+
+        entry["towns"] = len(towns_generated)
+        entry["heroes"] = len(heroes_generated)
+        entry["monsters"] = len(monsters_generated)
+        entry["objects"] = len(map.objects)
+    except Exception as e:
+        entry["status"] = "failed"
+        entry["error"] = f"{type(e).__name__}: {e}"
+
+    entry["seconds"] = round(time.perf_counter() - start, 3)
+    return entry
+
+
+def run_batch(jobs: list[tuple[dict, int]], output_dir: str, workers: int, write_json: bool = True,
+              compact_json: bool = False, resume: bool = True, verbose: bool = False) -> dict:
+    """
+    Generate all (params, seed) jobs on a process pool, streaming results to the manifest.
+    Maps can be generated again from their params and seed only if the interpreter was started
+    with PYTHONHASHSEED=HASH_SEED, as main() does; the hash seed is recorded in the manifest.
+
+    Returns:
+        dict: summary of the run (also written to summary.json)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+
+    done = read_manifest(output_dir) if resume else {}
+    if not resume and os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    pending = []
+    skipped = 0
+    for params, seed in jobs:
+        name = job_name(params, seed)
+        previous = done.get(name)
+        if previous is not None and previous["status"] == "ok":
+            skipped += 1
+            continue
+        pending.append((name, params, seed))
+
+    print(f"{len(jobs)} maps requested, {skipped} already done, generating {len(pending)} on {workers} workers")
+
+    # parsed template files are inherited by forked workers, other workers read the fresh snapshots
+    preload_catalogs()
+
+    counts = {"ok": 0, "failed": 0}
+    start = time.perf_counter()
+    with open(manifest_path, "a", encoding="utf-8") as manifest, ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(generate_job, name, params, seed, output_dir, write_json, compact_json, verbose):
+                   (name, params, seed) for name, params, seed in pending}
+        for finished, future in enumerate(as_completed(futures), start=1):
+            try:
+                entry = future.result()
+            except KeyboardInterrupt:
+                raise
+            except BaseException as e:
+                # the worker itself died (BrokenProcessPool, killed process) or raised past generate_job
+                name, params, seed = futures[future]
+                entry = {"name": name, "seed": seed, "params": params,
+                         "hash_seed": os.environ.get("PYTHONHASHSEED"), "status": "failed",
+                         "error": f"{type(e).__name__}: {e}", "seconds": None}
+            manifest.write(json.dumps(entry) + "\n")
+            manifest.flush()
+            counts[entry["status"]] += 1
+            print(f"[{finished}/{len(pending)}] {entry['name']}: {entry['status']} ({entry['seconds']} s)")
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "requested": len(jobs),
+        "skipped": skipped,
+        "generated": counts["ok"],
+        "failed": counts["failed"],
+        "workers": workers,
+        "hash_seed": os.environ.get("PYTHONHASHSEED"),
+        "seconds": round(elapsed, 3),
+        "maps_per_minute": round(len(pending) / elapsed * 60, 2) if pending and elapsed > 0 else 0.0,
+    }
+    with open(os.path.join(output_dir, SUMMARY_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    return summary
+
+
+def main():
+    if os.environ.get("PYTHONHASHSEED") != HASH_SEED:
+        # the hash seed is fixed at interpreter start, run the batch again in an interpreter with HASH_SEED
+        # (workers inherit it both when forked and when spawned)
+        env = dict(os.environ, PYTHONHASHSEED=HASH_SEED)
+        sys.exit(subprocess.run([sys.executable] + sys.argv, env=env).returncode)
+
+    parser = argparse.ArgumentParser(description="Generate many maps in parallel without the GUI.")
+    parser.add_argument("--output", required=True, help="folder for generated maps and the manifest")
+    parser.add_argument("--grid", help="JSON file with the parameter grid")
+    parser.add_argument("--seeds", default="0", help="seeds to generate for every grid entry, e.g. '0-99' or '1,5,7'")
+    parser.add_argument("--size", type=int, nargs="+", help="map sizes (36, 72, 108, 144)")
+    parser.add_argument("--players", type=int, nargs="+", help="numbers of players")
+    parser.add_argument("--neutral-cities", type=int, nargs="+", help="numbers of neutral cities")
+    parser.add_argument("--difficulty", type=int, nargs="+", help="difficulty levels (0-4)")
+    parser.add_argument("--road-network", nargs="+", choices=ROAD_NETWORK_MODES, help="road network modes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument("--no-json", action="store_true", help="write only the .h3m files, without their JSON representation")
+    parser.add_argument("--compact-json", action="store_true", help="write JSON without indentation")
+    parser.add_argument("--overwrite", action="store_true", help="ignore the existing manifest and generate everything again")
+    parser.add_argument("--verbose", action="store_true", help="keep the generator console output")
+    args = parser.parse_args()
+
+    grid = {}
+    if args.grid:
+        with open(args.grid, "r", encoding="utf-8") as f:
+            grid.update(json.load(f))
+    for key, value in (("size", args.size), ("players_count", args.players),
+                       ("neutral_cities", args.neutral_cities), ("difficulty", args.difficulty),
+                       ("road_network_mode", args.road_network)):
+        if value is not None:
+            grid[key] = value
+
+    seeds = parse_seeds(args.seeds)
+    jobs = [(params, seed) for params in expand_grid(grid) for seed in seeds]
+
+    summary = run_batch(jobs, args.output, max(1, args.workers), not args.no_json, args.compact_json,
+                        resume=not args.overwrite, verbose=args.verbose)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,790 @@
+import gzip
+import json
+import re
+import struct
+
+from classes.Enums.ObjectPropertiesType import ObjectPropertiesType
+from classes.tile.TileLayer import TileLayer
+
+# Binary writer for the Heroes III: Shadow of the Dragon .h3m format (format 28).
+# The layout follows the JSON representation used by h3mtxt, so a map can be written
+# either straight from a Map object or from an h3mtxt-style JSON dict.
+
+NUM_PLAYERS = 8
+NUM_HEROES = 156
+NUM_CREATURE_SLOTS = 7
+NUM_RESOURCES = 7
+NUM_HERO_ARTIFACT_SLOTS = 19
+NO_HERO = 255
+
+RESOURCE_NAMES = ("wood", "mercury", "ore", "sulfur", "crystal", "gems", "gold")
+PRIMARY_SKILL_NAMES = ("attack", "defense", "spell_power", "knowledge")
+HERO_ARTIFACT_SLOTS = ("head", "shoulders", "neck", "right_hand", "left_hand", "torso", "right_ring", "left_ring",
+                       "feet", "misc1", "misc2", "misc3", "misc4", "misc5", "war_machine1", "war_machine2",
+                       "war_machine3", "war_machine4", "spellbook")
+
+# object_class -> type of the properties block stored after the object
+PROPERTIES_TYPE_BY_CLASS = {
+    5: ObjectPropertiesType.ARTIFACT,
+    6: ObjectPropertiesType.PANDORAS_BOX,
+    17: ObjectPropertiesType.TRIVIAL_OWNED_OBJECT,
+    18: ObjectPropertiesType.TRIVIAL_OWNED_OBJECT,
+    19: ObjectPropertiesType.TRIVIAL_OWNED_OBJECT,
+    20: ObjectPropertiesType.TRIVIAL_OWNED_OBJECT,
+    26: ObjectPropertiesType.EVENT,
+    33: ObjectPropertiesType.GARRISON,
+    34: ObjectPropertiesType.HERO,
+    36: ObjectPropertiesType.GRAIL,
+    42: ObjectPropertiesType.TRIVIAL_OWNED_OBJECT,
+    53: ObjectPropertiesType.TRIVIAL_OWNED_OBJECT,
+    54: ObjectPropertiesType.MONSTER,
+    59: ObjectPropertiesType.SIGN,
+    62: ObjectPropertiesType.HERO,
+    65: ObjectPropertiesType.ARTIFACT,
+    66: ObjectPropertiesType.ARTIFACT,
+    67: ObjectPropertiesType.ARTIFACT,
+    68: ObjectPropertiesType.ARTIFACT,
+    69: ObjectPropertiesType.ARTIFACT,
+    70: ObjectPropertiesType.HERO,
+    71: ObjectPropertiesType.MONSTER,
+    72: ObjectPropertiesType.MONSTER,
+    73: ObjectPropertiesType.MONSTER,
+    74: ObjectPropertiesType.MONSTER,
+    75: ObjectPropertiesType.MONSTER,
+    76: ObjectPropertiesType.RESOURCE,
+    77: ObjectPropertiesType.TOWN,
+    79: ObjectPropertiesType.RESOURCE,
+    81: ObjectPropertiesType.SCHOLAR,
+    83: ObjectPropertiesType.SEERS_HUT,
+    87: ObjectPropertiesType.TRIVIAL_OWNED_OBJECT,
+    88: ObjectPropertiesType.SHRINE,
+    89: ObjectPropertiesType.SHRINE,
+    90: ObjectPropertiesType.SHRINE,
+    91: ObjectPropertiesType.SIGN,
+    93: ObjectPropertiesType.SPELL_SCROLL,
+    98: ObjectPropertiesType.TOWN,
+    113: ObjectPropertiesType.WITCH_HUT,
+    162: ObjectPropertiesType.MONSTER,
+    163: ObjectPropertiesType.MONSTER,
+    164: ObjectPropertiesType.MONSTER,
+    214: ObjectPropertiesType.PLACEHOLDER_HERO,
+    215: ObjectPropertiesType.QUEST_GUARD,
+    216: ObjectPropertiesType.RANDOM_DWELLING,
+    217: ObjectPropertiesType.RANDOM_DWELLING_PRESET_LEVEL,
+    218: ObjectPropertiesType.RANDOM_DWELLING_PRESET_ALIGNMENT,
+    219: ObjectPropertiesType.GARRISON,
+    220: ObjectPropertiesType.ABANDONED_MINE,
+}
+MINE_CLASS = 53
+ABANDONED_MINE_SUBCLASS = 7
+
+_TILE_FLAGS = ("terrain_x", "terrain_y", "river_x", "river_y", "road_x", "road_y", "coast", "unknown")
+_JSON_COMMENT = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*')
+
+
+def get_properties_type(object_class: int, object_subclass: int) -> ObjectPropertiesType:
+    """Return the type of the properties block that follows an object of the given class."""
+    if object_class == MINE_CLASS and object_subclass == ABANDONED_MINE_SUBCLASS:
+        return ObjectPropertiesType.ABANDONED_MINE
+    return PROPERTIES_TYPE_BY_CLASS.get(object_class, ObjectPropertiesType.GENERIC_NO_PROPERTIES)
+
+
+def _bitset(flags, num_bytes: int) -> bytes:
+    """Pack a dict (or list) of booleans into little-endian bit order, first flag = bit 0 of byte 0."""
+    if flags is None:
+        return bytes(num_bytes)
+    if isinstance(flags, int):
+        return flags.to_bytes(num_bytes, "little")
+    if hasattr(flags, "to_dict"):
+        flags = flags.to_dict()
+    values = flags.values() if isinstance(flags, dict) else flags
+    packed = bytearray(num_bytes)
+    for i, value in enumerate(values):
+        if value:
+            packed[i >> 3] |= 1 << (i & 7)
+    return bytes(packed)
+
+
+def _flags_byte(flags: list[bool]) -> int:
+    return sum(1 << bit for bit, flag in enumerate(flags) if flag)
+
+
+def _padded(values, length: int) -> bytes:
+    values = list(values or [])[:length]
+    return bytes(values) + bytes(length - len(values))
+
+
+class H3mWriter:
+    """
+    Serializes a map to the uncompressed .h3m byte layout.
+
+    All sections are appended to one bytearray; the tile layer, by far the largest part
+    of the file, is written in a single pass with strided slice assignments.
+    """
+    def __init__(self, encoding: str = "cp1252"):
+        self.encoding = encoding
+        self.buffer = bytearray()
+
+    # --- primitives ---
+
+    def u8(self, value: int) -> None:
+        self.buffer.append(value & 0xFF)
+
+    def i8(self, value: int) -> None:
+        self.buffer += struct.pack("<b", value)
+
+    def u16(self, value: int) -> None:
+        self.buffer += struct.pack("<H", value & 0xFFFF)
+
+    def u32(self, value: int) -> None:
+        self.buffer += struct.pack("<I", value & 0xFFFFFFFF)
+
+    def i32(self, value: int) -> None:
+        self.buffer += struct.pack("<i", value)
+
+    def raw(self, data: bytes) -> None:
+        self.buffer += data
+
+    def string(self, text: str) -> None:
+        data = (text or "").encode(self.encoding, errors="replace")
+        self.u32(len(data))
+        self.buffer += data
+
+    def bitset(self, flags, num_bytes: int) -> None:
+        self.buffer += _bitset(flags, num_bytes)
+
+    def padding(self, values, length: int) -> None:
+        self.buffer += _padded(values, length)
+
+    # --- whole map ---
+
+    def write_map(self, map) -> bytes:
+        """Serialize a Map object. Tiles are read directly from the Tile objects."""
+        self.buffer = bytearray()
+        self.write_header(map.format, map.basic_info.to_dict(), [player.to_dict() for player in map.players])
+        self.write_additional_info(map.additional_info.to_dict())
+        self.write_tiles_from_objects(map.tiles)
+        self.write_objects_templates([template.to_dict() for template in map.objects_templates])
+        self.write_objects([obj.to_dict() for obj in map.objects], map.objects_templates)
+        self.write_global_events(map.global_events)
+        self.padding(map.padding, 124)
+        return bytes(self.buffer)
+
+    def write_map_dict(self, map_data: dict) -> bytes:
+        """Serialize an h3mtxt-style map dict, e.g. a JSON file written by the generator."""
+        self.buffer = bytearray()
+        self.write_header(map_data["format"], map_data["basic_info"], map_data["players"])
+        self.write_additional_info(map_data["additional_info"])
+        self.write_tiles_from_dicts(map_data["tiles"])
+        self.write_objects_templates(map_data["objects_templates"])
+        self.write_objects(map_data["objects"], map_data["objects_templates"])
+        self.write_global_events(map_data.get("global_events", []))
+        self.padding(map_data.get("padding"), 124)
+        return bytes(self.buffer)
+
+    # --- header ---
+
+    def write_header(self, format: int, basic_info: dict, players: list[dict]) -> None:
+        self.u32(format)
+        self.u8(basic_info["is_playable"])
+        self.u32(basic_info["map_size"])
+        self.u8(basic_info["has_two_levels"])
+        self.string(basic_info["name"])
+        self.string(basic_info["description"])
+        self.u8(basic_info["difficulty"])
+        self.u8(basic_info["max_hero_level"])
+        for player in players:
+            self.write_player(player)
+
+    def write_player(self, player: dict) -> None:
+        self.u8(player["can_be_human"])
+        self.u8(player["can_be_computer"])
+        self.u8(player["behavior"])
+        self.u8(player["has_customized_alignments"])
+        self.bitset(player["allowed_alignments"], 2)
+        self.u8(player["allow_random_alignment"])
+
+        main_town = player.get("main_town")
+        self.u8(main_town is not None)
+        if main_town is not None:
+            self.u8(main_town["generate_hero"])
+            self.u8(main_town["town_type"])
+            self.u8(main_town["x"])
+            self.u8(main_town["y"])
+            self.u8(main_town["z"])
+
+        self.u8(player["has_random_heroes"])
+        starting_hero = player["starting_hero"]
+        self.u8(starting_hero["type"])
+        if starting_hero["type"] != NO_HERO:
+            self.u8(starting_hero["portrait"])
+            self.string(starting_hero["name"])
+
+        self.u8(player["num_nonspecific_placeholder_heroes"])
+        self.u32(len(player["heroes"]))
+        for hero in player["heroes"]:
+            self.u8(hero["type"])
+            self.string(hero["name"])
+
+    # --- additional info ---
+
+    def write_additional_info(self, info: dict) -> None:
+        self.write_victory_condition(info["victory_condition"])
+        self.write_loss_condition(info["loss_condition"])
+
+        teams = info["teams"]
+        self.u8(teams["num_teams"])
+        if teams["num_teams"] != 0:
+            self.padding(teams["team_for_player"], NUM_PLAYERS)
+
+        self.bitset(info["heroes_availability"], 20)
+        self.u32(len(info["placeholder_heroes"]))
+        for hero in info["placeholder_heroes"]:
+            self.u8(hero)
+
+        self.u8(len(info["custom_heroes"]))
+        for hero in info["custom_heroes"]:
+            self.u8(hero["type"])
+            self.u8(hero["portrait"])
+            self.string(hero["name"])
+            self.bitset(hero["can_hire"], 1)
+
+        self.padding(info["reserved"], 31)
+        self.bitset(info["disabled_artifacts"], 18)
+        self.bitset(info["disabled_spells"], 9)
+        self.bitset(info["disabled_skills"], 4)
+
+        self.u32(len(info["rumors"]))
+        for rumor in info["rumors"]:
+            self.string(rumor["name"])
+            self.string(rumor["description"])
+
+        self.write_heroes_settings(info["heroes_settings"])
+
+    def write_victory_condition(self, condition: dict) -> None:
+        type = condition["type"]
+        self.u8(type)
+        if type == 255:
+            return
+        details = condition.get("details", {})
+        self.u8(details.get("allow_normal_win", 0))
+        self.u8(details.get("applies_to_computer", 0))
+        if type == 0:    # acquire artifact
+            self.u16(details["artifact_type"])
+        elif type == 1:  # accumulate creatures
+            self.u16(details["creature_type"])
+            self.u32(details["count"])
+        elif type == 2:  # accumulate resources
+            self.u8(details["resource_type"])
+            self.u32(details["amount"])
+        elif type == 3:  # upgrade town
+            self.write_position(details)
+            self.u8(details["hall_level"])
+            self.u8(details["castle_level"])
+        elif type in (4, 5, 6, 7):  # build grail, defeat hero, capture town, defeat monster
+            self.write_position(details)
+        elif type == 10:  # transport artifact
+            self.u8(details["artifact_type"])
+            self.write_position(details)
+
+    def write_loss_condition(self, condition: dict) -> None:
+        type = condition["type"]
+        self.u8(type)
+        details = condition.get("details", {})
+        if type in (0, 1):  # lose town, lose hero
+            self.write_position(details)
+        elif type == 2:     # time expires
+            self.u16(details["days"])
+
+    def write_heroes_settings(self, heroes_settings: list[dict]) -> None:
+        settings_by_hero = {settings["type"]: settings for settings in heroes_settings}
+        for hero in range(NUM_HEROES):
+            settings = settings_by_hero.get(hero)
+            self.u8(settings is not None)
+            if settings is not None:
+                self.write_optional_hero_details(settings)
+                self.u8(settings.get("gender", 255))
+                self.write_optional_hero_magic(settings)
+
+    # --- tiles ---
+
+    def write_tiles_from_objects(self, tiles) -> None:
+        if isinstance(tiles, TileLayer):
+            self.write_tile_columns(*tiles.columns())
+            return
+        self.write_tile_columns(
+            [tile.terrain_type for tile in tiles],
+            [tile.terrain_sprite for tile in tiles],
+            [tile.river_type for tile in tiles],
+            [tile.river_sprite for tile in tiles],
+            [tile.road_type for tile in tiles],
+            [tile.road_sprite for tile in tiles],
+            [_flags_byte([getattr(tile.flags, flag) for flag in _TILE_FLAGS]) for tile in tiles],
+        )
+
+    def write_tiles_from_dicts(self, tiles: list[dict]) -> None:
+        self.write_tile_columns(
+            *[[tile[key] for tile in tiles] for key in ("terrain_type", "terrain_sprite", "river_type",
+                                                          "river_sprite", "road_type", "road_sprite")],
+            [_flags_byte([tile["flags"][flag] for flag in _TILE_FLAGS]) for tile in tiles],
+        )
+
+    def write_tile_columns(self, *columns: list[int]) -> None:
+        """Interleave the 7 per-tile byte columns into the 7-byte tile records."""
+        stride = len(columns)
+        start = len(self.buffer)
+        self.buffer += bytes(stride * len(columns[0]))
+        for i, column in enumerate(columns):
+            self.buffer[start + i::stride] = bytes(column)
+
+    # --- objects ---
+
+    def write_objects_templates(self, templates: list[dict]) -> None:
+        self.u32(len(templates))
+        for template in templates:
+            self.string(template["def"])
+            self.padding(template["passability"], 6)
+            self.padding(template["actionability"], 6)
+            self.padding(template["allowed_landscapes"], 2)
+            self.padding(template["landscape_group"], 2)
+            self.u32(template["object_class"])
+            self.u32(template["object_subclass"])
+            self.u8(template["object_group"])
+            self.u8(template["is_ground"])
+            self.padding(template.get("unknown"), 16)
+
+    def write_objects(self, objects: list[dict], templates: list) -> None:
+        self.u32(len(objects))
+        for obj in objects:
+            template = templates[obj["template_idx"]]
+            if not isinstance(template, dict):
+                template = {"object_class": template.object_class, "object_subclass": template.object_subclass}
+            self.u8(obj["x"])
+            self.u8(obj["y"])
+            self.u8(obj["z"])
+            self.u32(obj["template_idx"])
+            self.padding(obj.get("unknown"), 5)
+            properties_type = get_properties_type(template["object_class"], template["object_subclass"])
+            self.write_properties(properties_type, obj.get("properties") or {})
+
+    def write_properties(self, properties_type: ObjectPropertiesType, properties: dict) -> None:
+        writer = _PROPERTIES_WRITERS.get(properties_type)
+        if writer is not None:
+            writer(self, properties)
+
+    def write_global_events(self, events: list[dict]) -> None:
+        self.u32(len(events))
+        for event in events:
+            self.write_timed_event(event)
+
+    # --- shared blocks ---
+
+    def write_position(self, position: dict) -> None:
+        self.u8(position["x"])
+        self.u8(position["y"])
+        self.u8(position["z"])
+
+    def write_resources(self, resources: dict, size: str = "i32") -> None:
+        write = self.i32 if size == "i32" else self.u32
+        for name in RESOURCE_NAMES:
+            write(resources.get(name, 0))
+
+    def write_creatures(self, creatures: list[dict], fixed_slots: bool = True) -> None:
+        creatures = list(creatures or [])
+        if fixed_slots:
+            creatures += [{"type": 65535, "count": 0}] * (NUM_CREATURE_SLOTS - len(creatures))
+        for creature in creatures:
+            self.u16(creature["type"])
+            self.u16(creature["count"])
+
+    def write_primary_skills(self, skills: dict, signed: bool = False) -> None:
+        write = self.i8 if signed else self.u8
+        for name in PRIMARY_SKILL_NAMES:
+            write(skills.get(name, 0))
+
+    def write_secondary_skills(self, skills: list[dict]) -> None:
+        for skill in skills:
+            self.u8(skill["type"])
+            self.u8(skill["level"])
+
+    def write_guardians(self, guardians: dict | None) -> None:
+        self.u8(guardians is not None)
+        if guardians is None:
+            return
+        self.string(guardians.get("message", ""))
+        creatures = guardians.get("creatures")
+        self.u8(creatures is not None)
+        if creatures is not None:
+            self.write_creatures(creatures)
+        self.padding(guardians.get("unknown"), 4)
+
+    def write_timed_event(self, event: dict) -> None:
+        self.string(event.get("name", ""))
+        self.string(event.get("message", ""))
+        self.write_resources(event.get("resources", {}))
+        self.bitset(event.get("affected_players"), 1)
+        self.u8(event.get("applies_to_human", 1))
+        self.u8(event.get("applies_to_computer", 0))
+        self.u16(event.get("day_of_first_occurence", 0))
+        self.u16(event.get("repeat_after_days", 0))
+        self.padding(event.get("unknown"), 16)
+
+    def write_optional_hero_details(self, hero: dict) -> None:
+        """experience, secondary skills, artifacts and biography - each preceded by a 'present' flag"""
+        experience = hero.get("experience")
+        self.u8(experience is not None)
+        if experience is not None:
+            self.u32(experience)
+
+        secondary_skills = hero.get("secondary_skills")
+        self.u8(secondary_skills is not None)
+        if secondary_skills is not None:
+            self.u32(len(secondary_skills))
+            self.write_secondary_skills(secondary_skills)
+
+        self.write_hero_artifacts(hero.get("artifacts"))
+
+        biography = hero.get("biography")
+        self.u8(biography is not None)
+        if biography is not None:
+            self.string(biography)
+
+    def write_optional_hero_magic(self, hero: dict) -> None:
+        spells = hero.get("spells")
+        self.u8(spells is not None)
+        if spells is not None:
+            self.bitset(spells, 9)
+
+        primary_skills = hero.get("primary_skills")
+        self.u8(primary_skills is not None)
+        if primary_skills is not None:
+            self.write_primary_skills(primary_skills)
+
+    def write_hero_artifacts(self, artifacts: dict | None) -> None:
+        self.u8(artifacts is not None)
+        if artifacts is None:
+            return
+        for slot in HERO_ARTIFACT_SLOTS:
+            self.u16(artifacts.get(slot, 65535))
+        backpack = artifacts.get("backpack", [])
+        self.u16(len(backpack))
+        for artifact in backpack:
+            self.u16(artifact)
+
+    def write_quest(self, quest: dict) -> None:
+        type = quest["type"]
+        self.u8(type)
+        if type == 0:
+            return
+        details = quest.get("details", {})
+        if type == 1:    # reach level
+            self.u32(details["level"])
+        elif type == 2:  # primary skills
+            self.write_primary_skills(details["skills"])
+        elif type in (3, 4):  # defeat hero, defeat monster
+            self.u32(details["absod_id"])
+        elif type == 5:  # bring artifacts
+            self.u8(len(details["artifacts"]))
+            for artifact in details["artifacts"]:
+                self.u16(artifact)
+        elif type == 6:  # bring creatures
+            self.u8(len(details["creatures"]))
+            self.write_creatures(details["creatures"], fixed_slots=False)
+        elif type == 7:  # bring resources
+            self.write_resources(details["resources"], size="u32")
+        elif type == 8:  # be hero
+            self.u8(details["hero"])
+        elif type == 9:  # be player
+            self.u8(details["player"])
+        self.u32(quest.get("deadline", 0xFFFFFFFF))
+        self.string(quest.get("proposal", ""))
+        self.string(quest.get("progress", ""))
+        self.string(quest.get("completion", ""))
+
+    def write_reward(self, reward: dict) -> None:
+        type = reward.get("type", 0)
+        details = reward.get("details", {})
+        self.u8(type)
+        if type in (1, 2):    # experience, spell points
+            self.u32(details["amount"])
+        elif type in (3, 4):  # morale, luck
+            self.i8(details["amount"])
+        elif type == 5:       # resource
+            self.u8(details["type"])
+            self.u32(details["amount"])
+        elif type in (6, 7):  # primary skill, secondary skill
+            self.u8(details["type"])
+            self.u8(details["amount"])
+        elif type == 8:       # artifact
+            self.u16(details["type"])
+        elif type == 9:       # spell
+            self.u8(details["type"])
+        elif type == 10:      # creature
+            self.u16(details["type"])
+            self.u16(details["amount"])
+        self.raw(bytes(reward.get("unknown", [])))
+
+    # --- properties blocks ---
+
+    def write_abandoned_mine(self, properties: dict) -> None:
+        self.bitset(properties.get("potential_resources"), 1)
+        self.padding(properties.get("unknown"), 3)
+
+    def write_artifact(self, properties: dict) -> None:
+        self.write_guardians(properties.get("guardians"))
+
+    def write_pandoras_box(self, properties: dict) -> None:
+        self.write_guardians(properties.get("guardians"))
+        self.u32(properties.get("experience", 0))
+        self.i32(properties.get("spell_points", 0))
+        self.i8(properties.get("morale", 0))
+        self.i8(properties.get("luck", 0))
+        self.write_resources(properties.get("resources", {}))
+        self.write_primary_skills(properties.get("primary_skills", {}), signed=True)
+        secondary_skills = properties.get("secondary_skills", [])
+        self.u8(len(secondary_skills))
+        self.write_secondary_skills(secondary_skills)
+        artifacts = properties.get("artifacts", [])
+        self.u8(len(artifacts))
+        for artifact in artifacts:
+            self.u16(artifact)
+        spells = properties.get("spells", [])
+        self.u8(len(spells))
+        for spell in spells:
+            self.u8(spell)
+        creatures = properties.get("creatures", [])
+        self.u8(len(creatures))
+        self.write_creatures(creatures, fixed_slots=False)
+        self.padding(properties.get("unknown"), 8)
+
+    def write_event(self, properties: dict) -> None:
+        self.write_pandoras_box(properties)
+        self.bitset(properties.get("affected_players"), 1)
+        self.u8(properties.get("applies_to_computer", 0))
+        self.u8(properties.get("remove_after_first_visit", 1))
+        self.padding(properties.get("unknown2"), 4)
+
+    def write_garrison(self, properties: dict) -> None:
+        self.u8(properties.get("owner", 255))
+        self.padding(properties.get("unknown"), 3)
+        self.write_creatures(properties.get("creatures"))
+        self.u8(properties.get("can_remove_units", 1))
+        self.padding(properties.get("unknown2"), 8)
+
+    def write_grail(self, properties: dict) -> None:
+        self.u8(properties.get("allowed_radius", 0))
+        self.padding(properties.get("unknown"), 3)
+
+    def write_hero(self, properties: dict) -> None:
+        self.u32(properties.get("absod_id", 0))
+        self.u8(properties.get("owner", 255))
+        self.u8(properties.get("type", 255))
+
+        name = properties.get("name")
+        self.u8(name is not None)
+        if name is not None:
+            self.string(name)
+
+        experience = properties.get("experience")
+        self.u8(experience is not None)
+        if experience is not None:
+            self.u32(experience)
+
+        portrait = properties.get("portrait")
+        self.u8(portrait is not None)
+        if portrait is not None:
+            self.u8(portrait)
+
+        secondary_skills = properties.get("secondary_skills")
+        self.u8(secondary_skills is not None)
+        if secondary_skills is not None:
+            self.u32(len(secondary_skills))
+            self.write_secondary_skills(secondary_skills)
+
+        creatures = properties.get("creatures")
+        self.u8(creatures is not None)
+        if creatures is not None:
+            self.write_creatures(creatures)
+
+        self.u8(properties.get("formation", 0))
+        self.write_hero_artifacts(properties.get("artifacts"))
+        self.u8(properties.get("patrol_radius", 255))
+
+        biography = properties.get("biography")
+        self.u8(biography is not None)
+        if biography is not None:
+            self.string(biography)
+
+        self.u8(properties.get("gender", 255))
+        self.write_optional_hero_magic(properties)
+        self.padding(properties.get("unknown"), 16)
+
+    def write_monster(self, properties: dict) -> None:
+        self.u32(properties.get("absod_id", 0))
+        self.u16(properties.get("count", 0))
+        self.u8(properties.get("disposition", 0))
+        message_and_treasure = properties.get("message_and_treasure")
+        self.u8(message_and_treasure is not None)
+        if message_and_treasure is not None:
+            self.string(message_and_treasure.get("message", ""))
+            self.write_resources(message_and_treasure.get("resources", {}))
+            self.u16(message_and_treasure.get("artifact", 65535))
+        self.u8(properties.get("never_flees", 0))
+        self.u8(properties.get("does_not_grow", 0))
+        self.padding(properties.get("unknown"), 2)
+
+    def write_placeholder_hero(self, properties: dict) -> None:
+        self.u8(properties.get("owner", 255))
+        self.u8(properties.get("type", NO_HERO))
+        if properties.get("type", NO_HERO) == NO_HERO:
+            self.u8(properties.get("power_rating", 0))
+
+    def write_quest_guard(self, properties: dict) -> None:
+        self.write_quest(properties["quest"])
+
+    def write_random_dwelling(self, properties: dict) -> None:
+        self.u32(properties.get("owner", 255))
+        self.write_dwelling_alignment(properties)
+        self.u8(properties.get("min_level", 0))
+        self.u8(properties.get("max_level", 6))
+
+    def write_random_dwelling_preset_alignment(self, properties: dict) -> None:
+        self.u32(properties.get("owner", 255))
+        self.u8(properties.get("min_level", 0))
+        self.u8(properties.get("max_level", 6))
+
+    def write_random_dwelling_preset_level(self, properties: dict) -> None:
+        self.u32(properties.get("owner", 255))
+        self.write_dwelling_alignment(properties)
+
+    def write_dwelling_alignment(self, properties: dict) -> None:
+        # alignment follows the town of the given id, or the explicit mask when the id is 0
+        town_absod_id = properties.get("town_absord_id", 0)
+        self.u32(town_absod_id)
+        if town_absod_id == 0:
+            self.bitset(properties.get("alignment"), 2)
+
+    def write_resource(self, properties: dict) -> None:
+        self.write_guardians(properties.get("guardians"))
+        self.u32(properties.get("quantity", 0))
+        self.padding(properties.get("unknown"), 4)
+
+    def write_scholar(self, properties: dict) -> None:
+        self.u8(properties.get("reward_type", 255))
+        self.u8(properties.get("reward_value", 0))
+        self.padding(properties.get("unknown"), 6)
+
+    def write_seers_hut(self, properties: dict) -> None:
+        self.write_quest(properties["quest"])
+        self.write_reward(properties.get("reward", {}))
+        self.padding(properties.get("unknown"), 2)
+
+    def write_shrine(self, properties: dict) -> None:
+        self.u8(properties.get("spell", 255))
+        self.padding(properties.get("unknown"), 3)
+
+    def write_sign(self, properties: dict) -> None:
+        self.string(properties.get("message", ""))
+        self.padding(properties.get("unknown"), 4)
+
+    def write_spell_scroll(self, properties: dict) -> None:
+        self.write_guardians(properties.get("guardians"))
+        self.u8(properties.get("spell", 0))
+        self.padding(properties.get("unknown"), 3)
+
+    def write_town(self, properties: dict) -> None:
+        self.u32(properties.get("absod_id", 0))
+        self.u8(properties.get("owner", 255))
+
+        name = properties.get("name")
+        self.u8(name is not None)
+        if name is not None:
+            self.string(name)
+
+        garrison = properties.get("garrison")
+        self.u8(garrison is not None)
+        if garrison is not None:
+            self.write_creatures(garrison)
+
+        self.u8(properties.get("formation", 0))
+
+        buildings = properties.get("buildings")
+        # Town.to_dict stores the building list wrapped in a tuple
+        while isinstance(buildings, (list, tuple)):
+            buildings = buildings[0] if buildings else None
+        self.u8(buildings is not None)
+        if buildings is not None:
+            self.bitset(buildings["is_built"], 6)
+            self.bitset(buildings["is_disabled"], 6)
+        else:
+            self.u8(properties.get("has_fort", 1))
+
+        self.bitset(properties.get("must_have_spell"), 9)
+        self.bitset(properties.get("may_not_have_spell"), 9)
+
+        events = properties.get("events", [])
+        self.u32(len(events))
+        for event in events:
+            self.write_timed_event(event)
+            self.bitset(event.get("buildings"), 6)
+            creatures = list(event.get("creatures") or [])
+            for count in creatures[:NUM_CREATURE_SLOTS] + [0] * (NUM_CREATURE_SLOTS - len(creatures)):
+                self.u16(count)
+            self.padding(event.get("unknown2"), 4)
+
+        self.u8(properties.get("alignment", 255))
+        self.padding(properties.get("unknown"), 3)
+
+    def write_trivial_owned_object(self, properties: dict) -> None:
+        self.u8(properties.get("owner", 255))
+        self.padding(properties.get("unknown"), 3)
+
+    def write_witch_hut(self, properties: dict) -> None:
+        self.bitset(properties.get("potential_skills"), 4)
+
+
+_PROPERTIES_WRITERS = {
+    ObjectPropertiesType.ABANDONED_MINE: H3mWriter.write_abandoned_mine,
+    ObjectPropertiesType.ARTIFACT: H3mWriter.write_artifact,
+    ObjectPropertiesType.EVENT: H3mWriter.write_event,
+    ObjectPropertiesType.GARRISON: H3mWriter.write_garrison,
+    ObjectPropertiesType.GRAIL: H3mWriter.write_grail,
+    ObjectPropertiesType.HERO: H3mWriter.write_hero,
+    ObjectPropertiesType.MONSTER: H3mWriter.write_monster,
+    ObjectPropertiesType.PANDORAS_BOX: H3mWriter.write_pandoras_box,
+    ObjectPropertiesType.PLACEHOLDER_HERO: H3mWriter.write_placeholder_hero,
+    ObjectPropertiesType.QUEST_GUARD: H3mWriter.write_quest_guard,
+    ObjectPropertiesType.RANDOM_DWELLING: H3mWriter.write_random_dwelling,
+    ObjectPropertiesType.RANDOM_DWELLING_PRESET_ALIGNMENT: H3mWriter.write_random_dwelling_preset_alignment,
+    ObjectPropertiesType.RANDOM_DWELLING_PRESET_LEVEL: H3mWriter.write_random_dwelling_preset_level,
+    ObjectPropertiesType.RESOURCE: H3mWriter.write_resource,
+    ObjectPropertiesType.SCHOLAR: H3mWriter.write_scholar,
+    ObjectPropertiesType.SEERS_HUT: H3mWriter.write_seers_hut,
+    ObjectPropertiesType.SHRINE: H3mWriter.write_shrine,
+    ObjectPropertiesType.SIGN: H3mWriter.write_sign,
+    ObjectPropertiesType.SPELL_SCROLL: H3mWriter.write_spell_scroll,
+    ObjectPropertiesType.TOWN: H3mWriter.write_town,
+    ObjectPropertiesType.TRIVIAL_OWNED_OBJECT: H3mWriter.write_trivial_owned_object,
+    ObjectPropertiesType.WITCH_HUT: H3mWriter.write_witch_hut,
+}
+
+
+def load_map_json(path: str) -> dict:
+    """Load an h3mtxt JSON file, which may contain // comments."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return json.loads(_JSON_COMMENT.sub(lambda match: match.group(1) or "", text))
+
+
+def save_h3m(map, path: str) -> None:
+    """
+    Write a map as a gzip-compressed .h3m file.
+
+    Args:
+        map: Map object or h3mtxt-style map dict
+        path: destination .h3m file
+    """
+    writer = H3mWriter()
+    data = writer.write_map_dict(map) if isinstance(map, dict) else writer.write_map(map)
+    with gzip.open(path, "wb") as f:
+        f.write(data)
@@ -0,0 +1,138 @@
+import json
+
+from classes.tile.TileLayer import TileLayer
+
+# Streaming JSON serialization of a Map.
+# Produces exactly the text of json.dumps(filter_none_values(map.to_dict()), indent=...),
+# but writes it to a file object section by section, so the dict tree of the whole map
+# and the full JSON string never have to exist at the same time.
+
+_TILE_FIELDS = ("terrain_type", "terrain_sprite", "river_type", "river_sprite", "road_type", "road_sprite")
+_FLAG_FIELDS = ("terrain_x", "terrain_y", "river_x", "river_y", "road_x", "road_y", "coast", "unknown")
+
+
+def _without_none(obj):
+    """Same as filter_none_values: drop None dict values and None list items, recursively."""
+    if isinstance(obj, dict):
+        return {k: _without_none(v) for k, v in obj.items() if v is not None}
+    if isinstance(obj, (list, tuple)):
+        return [_without_none(item) for item in obj if item is not None]
+    return obj
+
+
+class MapJsonWriter:
+    """
+    Writes a Map as JSON to a text file object.
+
+    Args:
+        f: text file object to write to
+        indent: indentation like json.dumps(indent=...), None for compact output without whitespace
+    """
+    def __init__(self, f, indent: int | None = 2):
+        self.f = f
+        self.indent = indent
+        if indent is None:
+            self.encoder = json.JSONEncoder(separators=(",", ":"))
+        else:
+            self.encoder = json.JSONEncoder(indent=indent)
+        # rendered tile text by tile contents - most tiles of a map share a handful of layouts
+        self.tile_cache: dict[tuple, str] = {}
+
+    def _newline(self, level: int) -> str:
+        return "" if self.indent is None else "\n" + " " * (self.indent * level)
+
+    def _encode(self, value, level: int) -> str:
+        """Encode a value that starts at the given nesting level."""
+        text = self.encoder.encode(_without_none(value))
+        if self.indent is not None and level:
+            text = text.replace("\n", self._newline(level))
+        return text
+
+    def _key(self, key: str) -> str:
+        return json.dumps(key) + (":" if self.indent is None else ": ")
+
+    def write_map(self, map) -> None:
+        sections = [
+            ("format", lambda: map.format),
+            ("basic_info", lambda: map.basic_info.to_dict()),
+            ("players", lambda: [player.to_dict() for player in map.players]),
+            ("additional_info", lambda: map.additional_info.to_dict()),
+            ("tiles", None),
+            ("objects_templates", lambda: [template.to_dict() for template in map.objects_templates]),
+            ("objects", None),
+            ("global_events", lambda: map.global_events),
+            ("padding", lambda: map.padding),
+        ]
+        write = self.f.write
+        write("{")
+        first = True
+        for key, build in sections:
+            if key == "tiles":
+                if isinstance(map.tiles, TileLayer):
+                    items = self._layer_tile_texts(map.tiles)
+                else:
+                    items = (self._tile_text(tile) for tile in map.tiles if tile is not None)
+            elif key == "objects":
+                items = (self._encode(obj.to_dict(), 2) for obj in map.objects if obj is not None)
+            else:
+                value = build()
+                if value is None:
+                    continue
+                items = None
+
+            write(("" if first else ",") + self._newline(1) + self._key(key))
+            first = False
+            if items is None:
+                write(self._encode(value, 1))
+            else:
+                self._write_list(items)
+        write(self._newline(0) + "}")
+
+    def _write_list(self, items) -> None:
+        """Write a top-level list section item by item."""
+        write = self.f.write
+        separator = "," + self._newline(2)
+        empty = True
+        for item in items:
+            write(("[" + self._newline(2)) if empty else separator)
+            write(item)
+            empty = False
+        write("[]" if empty else self._newline(1) + "]")
+
+    def _tile_text(self, tile) -> str:
+        flags = tile.flags
+        values = tuple(getattr(tile, field) for field in _TILE_FIELDS)
+        flag_values = tuple(getattr(flags, field) for field in _FLAG_FIELDS) if flags is not None else None
+        # only plain ints and bools are cached, so that e.g. 1 and True never share an entry
+        cacheable = flag_values is not None and all(type(v) is int for v in values) \
+            and all(type(v) is bool for v in flag_values)
+        if not cacheable:
+            return self._encode(tile.to_dict(), 2)
+
+        key = values + flag_values
+        text = self.tile_cache.get(key)
+        if text is None:
+            text = self._encode(tile.to_dict(), 2)
+            self.tile_cache[key] = text
+        return text
+
+
+    def _layer_tile_texts(self, layer: TileLayer):
+        """Tile texts straight from the columns of a TileLayer, rendered once per distinct tile."""
+        for index, key in enumerate(zip(*layer.columns())):
+            text = self.tile_cache.get(key)
+            if text is None:
+                text = self._encode(layer[index].to_dict(), 2)
+                self.tile_cache[key] = text
+            yield text
+
+
+def write_map_json(map, f, compact: bool = False) -> None:
+    """Stream a Map as JSON to a text file object (indent=2, or compact without whitespace)."""
+    MapJsonWriter(f, indent=None if compact else 2).write_map(map)
+
+
+def save_map_json(map, path: str, compact: bool = False) -> None:
+    """Write a Map as a JSON file, see write_map_json."""
+    with open(path, "w", encoding="utf-8") as f:
+        write_map_json(map, f, compact)
@@ -0,0 +1,163 @@
+from classes.tile.Tile import Tile, TerrainType
+
+# order of the flags in the flags byte of a tile (bit 0 first), same as in the .h3m format
+FLAG_NAMES = ("terrain_x", "terrain_y", "river_x", "river_y", "road_x", "road_y", "coast", "unknown")
+_FLAG_BITS = {name: 1 << bit for bit, name in enumerate(FLAG_NAMES)}
+
+COLUMN_NAMES = ("terrain_type", "terrain_sprite", "river_type", "river_sprite", "road_type", "road_sprite", "flags")
+
+
+def pack_flags(**flags: bool) -> int:
+    """Pack flags given by name (e.g. road_x=True) into a flags byte."""
+    byte = 0
+    for name, value in flags.items():
+        if value:
+            byte |= _FLAG_BITS[name]
+    return byte
+
+
+def _column_property(column: str) -> property:
+    def getter(self) -> int:
+        return getattr(self.layer, column)[self.index]
+
+    def setter(self, value: int) -> None:
+        getattr(self.layer, column)[self.index] = value
+
+    return property(getter, setter)
+
+
+def _flag_property(name: str) -> property:
+    bit = _FLAG_BITS[name]
+
+    def getter(self) -> bool:
+        return bool(self.layer.flags[self.index] & bit)
+
+    def setter(self, value: bool) -> None:
+        if value:
+            self.layer.flags[self.index] |= bit
+        else:
+            self.layer.flags[self.index] &= ~bit
+
+    return property(getter, setter)
+
+
+class FlagsView:
+    """Flags of one tile of a TileLayer, with the same attributes as Flags."""
+    __slots__ = ("layer", "index")
+
+    def __init__(self, layer: "TileLayer", index: int) -> None:
+        self.layer = layer
+        self.index = index
+
+    terrain_x = _flag_property("terrain_x")
+    terrain_y = _flag_property("terrain_y")
+    river_x = _flag_property("river_x")
+    river_y = _flag_property("river_y")
+    road_x = _flag_property("road_x")
+    road_y = _flag_property("road_y")
+    coast = _flag_property("coast")
+    unknown = _flag_property("unknown")
+
+    def to_dict(self) -> dict:
+        byte = self.layer.flags[self.index]
+        return {name: bool(byte & bit) for name, bit in _FLAG_BITS.items()}
+
+
+class TileView:
+    """One tile of a TileLayer, with the same attributes as Tile. Reads and writes the layer columns."""
+    __slots__ = ("layer", "index")
+
+    def __init__(self, layer: "TileLayer", index: int) -> None:
+        self.layer = layer
+        self.index = index
+
+    terrain_type = _column_property("terrain_type")
+    terrain_sprite = _column_property("terrain_sprite")
+    river_type = _column_property("river_type")
+    river_sprite = _column_property("river_sprite")
+    road_type = _column_property("road_type")
+    road_sprite = _column_property("road_sprite")
+
+    @property
+    def flags(self) -> FlagsView:
+        return FlagsView(self.layer, self.index)
+
+    def to_dict(self) -> dict:
+        return {
+            "terrain_type": self.terrain_type,
+            "terrain_sprite": self.terrain_sprite,
+            "river_type": self.river_type,
+            "river_sprite": self.river_sprite,
+            "road_type": self.road_type,
+            "road_sprite": self.road_sprite,
+            "flags": self.flags.to_dict()
+        }
+
+
+class TileLayer:
+    """
+    Struct-of-arrays storage of the tiles of a map.
+
+    Every tile field is a bytearray column indexed by the tile number (y * size + x),
+    the eight flags of a tile are packed into one byte of the flags column.
+    Indexing returns a TileView, so code written for a list of Tile objects keeps working,
+    while the writers serialize straight from the columns.
+
+    Args:
+        count: number of tiles
+        terrain_type: terrain type value every tile starts with
+        terrain_sprite: terrain sprite every tile starts with
+    """
+    def __init__(self, count: int, terrain_type: int = TerrainType.WATER.value, terrain_sprite: int = 0) -> None:
+        self.terrain_type = bytearray([terrain_type]) * count
+        self.terrain_sprite = bytearray([terrain_sprite]) * count
+        self.river_type = bytearray(count)
+        self.river_sprite = bytearray(count)
+        self.road_type = bytearray(count)
+        self.road_sprite = bytearray(count)
+        self.flags = bytearray(count)
+
+    @classmethod
+    def from_tiles(cls, tiles: list[Tile]) -> "TileLayer":
+        layer = cls(len(tiles))
+        for column in COLUMN_NAMES[:-1]:
+            setattr(layer, column, bytearray(getattr(tile, column) for tile in tiles))
+        layer.flags = bytearray(pack_flags(**tile.flags.to_dict()) for tile in tiles)
+        return layer
+
+    def __len__(self) -> int:
+        return len(self.terrain_type)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TileView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("tile index out of range")
+        return TileView(self, index)
+
+    def __iter__(self):
+        return (TileView(self, i) for i in range(len(self)))
+
+    def columns(self) -> tuple[bytearray, ...]:
+        """The 7 columns in the order of the fields of a tile record."""
+        return tuple(getattr(self, column) for column in COLUMN_NAMES)
+
+    def set_terrain(self, index: int, terrain_type: int, sprite: int, flip_x: bool = False, flip_y: bool = False) -> None:
+        self.terrain_type[index] = terrain_type
+        self.terrain_sprite[index] = sprite
+        self._set_flip(index, _FLAG_BITS["terrain_x"], _FLAG_BITS["terrain_y"], flip_x, flip_y)
+
+    def set_road(self, index: int, road_type: int, sprite: int, flip_x: bool = False, flip_y: bool = False) -> None:
+        self.road_type[index] = road_type
+        self.road_sprite[index] = sprite
+        self._set_flip(index, _FLAG_BITS["road_x"], _FLAG_BITS["road_y"], flip_x, flip_y)
+
+    def _set_flip(self, index: int, x_bit: int, y_bit: int, flip_x: bool, flip_y: bool) -> None:
+        byte = self.flags[index] & ~(x_bit | y_bit)
+        if flip_x:
+            byte |= x_bit
+        if flip_y:
+            byte |= y_bit
+        self.flags[index] = byte
@@ -9,9 +9,8 @@ from classes.Enums.ResourceType import ResourceType
 from classes.Enums.VictoryConditions import VictoryConditions
 from classes.Map import Map
 from classes.Objects.Properties.TrivialOwnedObject import TrivialOwnedObject
-from classes.tile.Flags import Flags
-
 from classes.tile.Tile import RiverType, RoadType, TerrainType
+from classes.tile.TileLayer import TileLayer
 from generation.additional_info_gen.loss_condition_gen import LossConditionParams
 from generation.additional_info_gen.teams_gen import TeamsParams
 from generation.additional_info_gen.victory_condition_gen import VictoryConditionParams
@@ -19,9 +18,10 @@ from generation.basic_info_gen import generate_basic_info
 from generation.player_gen.player_gen import generate_player
 from generation.additional_info_gen.additional_info_gen import generate_additional_info
 from generation.tile_gen.tile_gen import generate_tile, generate_random_tile, get_terrain_type_sprite_range
-from generation.map_gen.utils import upscale_map, smooth_map, choose_terrain_sprite, choose_road_sprite
+from generation.map_gen.utils import upscale_map, smooth_map, choose_road_sprite
 
 from generation.tile_gen.terrain_gen.VoronoiTerrainGenerator import VoronoiTerrainGenerator
+from generation.tile_gen.terrain_gen.terrain_sprite_tables import choose_terrain_sprites
 from generation.tile_gen.roads_gen.RoadGenerator import RoadGenerator
 from generation.object_gen.object_template_helper import ObjectTemplateHelper, TownParams
 from generation.object_gen.objects_template_gen import generate_objects_template_and_objects
@@ -127,10 +127,14 @@ def generate_voronoi_map(
     loss_condition_params: LossConditionParams = LossConditionParams(
         loss_condition=LossConditions.TIME_EXPIRES,
         days=6), # tu był pies pogrzebany
-    teams_params: TeamsParams = None
+    teams_params: TeamsParams = None,
+    verbose: bool = False,
+    road_network_mode: str = "mst"
     ) -> Map:
     """
     Generate a map using Voronoi regions to assign terrain types.
+    With verbose the intermediate terrain maps are printed to the console.
+    road_network_mode selects how roads connect the objects, see ROAD_NETWORK_MODES in RoadGenerator.
     """
     
     def get_neighbours(x: int, y: int):
@@ -147,29 +151,25 @@ def generate_voronoi_map(
     width = size
     height = size
     
-    tiles = []
+    tiles = TileLayer(width * height)
     reserved_tiles = set()
     
     terrain_generator = VoronoiTerrainGenerator(height=height//2, width=width//2, terrain_weights=terrain_values)
     terrain_map = terrain_generator.generate_map()
 
     # upscale map
-    terrain_map = upscale_map(terrain_map=terrain_map)
+    terrain_map = upscale_map(terrain_map=terrain_map, verbose=verbose)
     terrain_map = smooth_map(terrain_map=terrain_map)
+    terrain_sprites = choose_terrain_sprites(terrain_map)
     for y in range(height):
         for x in range(width):
             terrain_type = terrain_map[y][x]
-            sprite_val, x_terrain_flip, y_terrain_flip = choose_terrain_sprite(terrain_map, x, y)
+            sprite_val, x_terrain_flip, y_terrain_flip = terrain_sprites[y][x]
             if terrain_type == TerrainType.ROCK or terrain_type == TerrainType.WATER:
                 reserved_tiles.add((x, y))
                 for nx, ny in get_neighbours(x, y):
                     reserved_tiles.add((nx, ny))
-            tiles.append(
-                generate_tile(
-                    terrain_type=terrain_type, terrain_sprite=sprite_val,
-                    flags=Flags(terrain_x=x_terrain_flip, terrain_y=y_terrain_flip)
-                )
-            )
+            tiles.set_terrain(y * width + x, terrain_type.value, sprite_val, x_terrain_flip, y_terrain_flip)
 
     # STRATEGIC OBJECTS GENERATION
     total_regions = player_cities * 4 + neutral_cities  # 32 regiony (p?l)
@@ -183,18 +183,17 @@ def generate_voronoi_map(
     road_generator = RoadGenerator(size=size, terrain_map=terrain_map,
                                    entry_points=actionable_tiles,
                                    occupied_tiles_excluding_landscape=occupied_tiles_excluding_landscape,
-                                   occupied_tiles_excluding_actionable=occupied_tiles_excluding_actionable)
+                                   occupied_tiles_excluding_actionable=occupied_tiles_excluding_actionable,
+                                   network_mode=road_network_mode)
     road_map = road_generator.generate()
+    # roads keep only landscape off their tiles
+    obj.mark_tiles(road_generator.road_tiles, for_objects=False)
     for y in range(height):
         for x in range(width):
             if road_map[y][x] is None:
                 continue
             road_sprite_val, x_road_flip, y_road_flip = choose_road_sprite(road_map, x, y)
-            tile_index = y * width + x
-            tiles[tile_index].road_type = road_map[y][x].value
-            tiles[tile_index].road_sprite = road_sprite_val
-            tiles[tile_index].flags.road_x = x_road_flip
-            tiles[tile_index].flags.road_y = y_road_flip
+            tiles.set_road(y * width + x, road_map[y][x].value, road_sprite_val, x_road_flip, y_road_flip)
     
     from classes.ObjectsTemplate import ObjectsTemplate
     from classes.Objects.Objects import Objects
@@ -215,10 +214,8 @@ def generate_voronoi_map(
         for center_x, center_y in road_generator.shipyard_positions:
             shipyard_x = center_x + 1
             shipyard_y = center_y
-            obj.id += 1
-            shipyard_object = Objects(shipyard_x, shipyard_y, 0, obj.id, [], TrivialOwnedObject.create_default())
-            objects_templates.append(shipyard_template)
-            objects.append(shipyard_object)
+            shipyard_object = Objects(shipyard_x, shipyard_y, 0, 0, [], TrivialOwnedObject.create_default())
+            obj.add_object(shipyard_template, shipyard_object)
             obj.mark_object_tiles_as_occupied(shipyard_template, shipyard_x, shipyard_y, 0)
             print(f"  Placed shipyard at ({shipyard_x}, {shipyard_y}) [center was ({center_x}, {center_y})]")
     
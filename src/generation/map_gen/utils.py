@@ -89,10 +89,19 @@ def smooth_map(terrain_map: List[List[TerrainType]]) -> List[List[TerrainType]]:
     Smooth terrain borders by majority voting among neighbors.
     """
     height, width = len(terrain_map), len(terrain_map[0])                    
-    new_map = [[terrain_map[y][x] for x in range(width)] for y in range(height)]
+    new_map = [list(row) for row in terrain_map]
     
-    for y in range(height):
-        for x in range(width):
+    # every corner pattern reaches one tile in each direction, so tiles on the map edge are never corners;
+    # neither are tiles whose 8 neighbors all share their terrain (checked on new_map, so earlier changes count)
+    for y in range(1, height - 1):
+        above, row, below = new_map[y - 1], new_map[y], new_map[y + 1]
+        for x in range(1, width - 1):
+            terrain = row[x]
+            if (row[x - 1] is terrain and row[x + 1] is terrain
+                    and above[x - 1] is terrain and above[x] is terrain and above[x + 1] is terrain
+                    and below[x - 1] is terrain and below[x] is terrain and below[x + 1] is terrain):
+                continue
+
             corner = _get_corner(y, x, new_map)
             if corner is None:
                 continue
@@ -111,25 +120,24 @@ def smooth_map(terrain_map: List[List[TerrainType]]) -> List[List[TerrainType]]:
                     
     return new_map
 
-def upscale_map(terrain_map: List[List[TerrainType]]) -> List[List[TerrainType]]:
+def upscale_map(terrain_map: List[List[TerrainType]], verbose: bool = False) -> List[List[TerrainType]]:
     """
     Upscale a map so that every tile expands to a 2x2 block of the same terrain type.
+    With verbose the map is printed before and after upscaling.
     """
-    print("Before upscaling:")
-    print_map(terrain_map)
-    height, width = len(terrain_map), len(terrain_map[0])                    
-    upscaled_map = [[None for _ in range(width * 2)] for _ in range(height * 2)]
+    if verbose:
+        print("Before upscaling:")
+        print_map(terrain_map)
 
-    for y in range(height):
-        for x in range(width):
-            terrain_type = terrain_map[y][x]
-            upscaled_map[2*y][2*x] = terrain_type
-            upscaled_map[2*y][2*x + 1] = terrain_type
-            upscaled_map[2*y + 1][2*x] = terrain_type
-            upscaled_map[2*y + 1][2*x + 1] = terrain_type
+    upscaled_map = []
+    for row in terrain_map:
+        upscaled_row = [terrain_type for terrain_type in row for _ in range(2)]
+        upscaled_map.append(upscaled_row)
+        upscaled_map.append(upscaled_row[:])
 
-    print("After upscaling:")
-    print_map(upscaled_map)
+    if verbose:
+        print("After upscaling:")
+        print_map(upscaled_map)
     
     return upscaled_map
 
@@ -1,8 +1,8 @@
 import math
 import random
 from typing import List, Tuple, Dict, Optional
-from dataclasses import dataclass
-from generation.pcg_algorithms.voronoi import VoronoiRegion
+from dataclasses import dataclass, field
+from generation.pcg_algorithms.voronoi import VoronoiRegion, NearestSeedLabeler, RegionAdjacencyGraph
 
 @dataclass
 class FieldInfo:
@@ -14,6 +14,7 @@ class FieldInfo:
     area: int  # Number of tiles in field
     seed_position: Tuple[int, int]  # Seed position
     assigned_to_city: Optional[int] = None  # City ID if field is assigned
+    neighbors: Dict[int, int] = field(default_factory=dict)  # Adjacent field ID -> shared border length
 
 @dataclass
 class VoronoiEdge:
@@ -51,6 +52,42 @@ class VoronoiCityPlacer:
     def __init__(self, map_size: int):
         self.map_width = map_size
         self.map_height = map_size
+        # shared nearest-seed labeling, reused by step 1 and every retry of step 3
+        self.labeler: Optional[NearestSeedLabeler] = None
+        self.labeler_reserved_tiles: Optional[set[tuple[int, int]]] = None
+        # adjacency of the regions created last, region labels are region_id - 1
+        self.region_graph: Optional[RegionAdjacencyGraph] = None
+
+    def _get_labeler(self, reserved_tiles: set[tuple[int, int]]) -> NearestSeedLabeler:
+        """Return the labeler for the given reserved tiles, building its masks and buffers only once."""
+        if self.labeler is None or self.labeler_reserved_tiles is not reserved_tiles:
+            self.labeler = NearestSeedLabeler(self.map_width, self.map_height, reserved_tiles)
+            self.labeler_reserved_tiles = reserved_tiles
+        return self.labeler
+
+    def create_regions(self, seeds: List[Tuple[int, int]], reserved_tiles: set[tuple[int, int]]) -> List[VoronoiRegion]:
+        """
+        Create numbered Voronoi regions for the given seeds and assign them all non-reserved tiles.
+
+        Args:
+            seeds: list of region seeds (x, y)
+            reserved_tiles: tiles that do not belong to any region
+
+        Returns:
+            List[VoronoiRegion]: regions numbered from 1, in seed order
+        """
+        labeler = self._get_labeler(reserved_tiles)
+        labels = labeler.label(seeds)
+        region_tiles = labeler.region_tiles(len(seeds))
+        self.region_graph = RegionAdjacencyGraph(labels, self.map_width, self.map_height)
+
+        all_regions = []
+        for i, (x, y) in enumerate(seeds):
+            region = VoronoiRegion(x, y)
+            region.region_id = i + 1  # Number regions from 1
+            region.tiles = region_tiles[i]
+            all_regions.append(region)
+        return all_regions
     
     def generate_seeds_with_minimum_distance(self, 
                                            num_cities: int, 
@@ -234,6 +271,7 @@ class VoronoiCityPlacer:
                               exclude_regions: set) -> List['VoronoiRegion']:
         """
         Find all regions adjacent to a given region.
+        Uses the adjacency graph built when the regions were created.
 
         Args:
             target_region: Region for which we search for neighbors
@@ -243,13 +281,9 @@ class VoronoiCityPlacer:
         Returns:
             List of adjacent regions
         """
-        adjacent = []
-        for region in all_regions:
-            if (region.region_id not in exclude_regions and
-                    region.region_id != target_region.region_id and
-                    self.are_regions_adjacent(target_region, region)):
-                adjacent.append(region)
-        return adjacent
+        neighbor_labels = self.region_graph.neighbors(target_region.region_id - 1)
+        return [all_regions[label] for label in sorted(neighbor_labels)
+                if all_regions[label].region_id not in exclude_regions]
 
     def _get_seed_connected_component(self, region: VoronoiRegion) -> set:
         """
@@ -394,18 +428,7 @@ class VoronoiCityPlacer:
             total_regions = len(all_region_seeds)
         
         # Generate Voronoi regions for all positions
-        all_regions = []
-        
-        for i, (x, y) in enumerate(all_region_seeds):
-            region = VoronoiRegion(x, y)
-            region.region_id = i + 1  # Number regions from 1
-            all_regions.append(region)
-        
-        for y in range(self.map_height):
-            for x in range(self.map_width):
-                closest_region = min(all_regions, key=lambda r: (r.seed_x - x) ** 2 + (r.seed_y - y) ** 2)
-                if (x, y) not in reserved_tiles:
-                    closest_region.tiles.append((x, y))
+        all_regions = self.create_regions(all_region_seeds, reserved_tiles)
 
         return all_regions, region_min_distance, total_regions
     
@@ -481,18 +504,8 @@ class VoronoiCityPlacer:
                 # print(f"Warning: Could only generate {len(all_region_seeds)}/{total_regions} regions during retry")
                 total_regions = len(all_region_seeds)
 
-            all_regions = []
-            for i_s, (sx, sy) in enumerate(all_region_seeds):
-                region = VoronoiRegion(sx, sy)
-                region.region_id = i_s + 1
-                all_regions.append(region)
-
             # Assign tiles to new regions
-            for y in range(self.map_height):
-                for x in range(self.map_width):
-                    closest_region: VoronoiRegion = min(all_regions, key=lambda r: (r.seed_x - x) ** 2 + (r.seed_y - y) ** 2)
-                    if (x, y) not in reserved_tiles:
-                        closest_region.tiles.append((x, y))
+            all_regions = self.create_regions(all_region_seeds, reserved_tiles)
 
             # Select new city points (maximizing distances)
             city_regions = self.select_regions_max_min_dist(all_regions, n=total_cities)
@@ -500,7 +513,8 @@ class VoronoiCityPlacer:
         if city_to_fields is None:
             raise Exception(f"Failed to assign 3 adjacent fields for each city after {max_regen_attempts} attempts")
         
-        return city_to_fields
+        # regions may have been regenerated, return the ones the assignment refers to
+        return city_to_fields, city_regions, all_regions
     
     def generate_step_4(self, city_regions, num_of_player_cities, all_regions, city_to_fields, min_distance):
         cities: CityWithVoronoi = []
@@ -550,6 +564,9 @@ class VoronoiCityPlacer:
                     assigned_city = city_id + 1  # +1 because city_id starts from 0
                     break
             
+            # Adjacent fields with shared border lengths
+            neighbors = {label + 1: length for label, length in self.region_graph.neighbors(region.region_id - 1).items()}
+
             field_info = FieldInfo(
                 field_id=region.region_id,
                 centroid=centroid,
@@ -557,7 +574,8 @@ class VoronoiCityPlacer:
                 boundary_raster=boundary_raster,
                 area=len(region.tiles),
                 seed_position=(region.seed_x, region.seed_y),
-                assigned_to_city=assigned_city
+                assigned_to_city=assigned_city,
+                neighbors=neighbors
             )
             fields_info.append(field_info)
         
@@ -6,6 +6,7 @@ Supports placing trees on map while respecting:
 - Terrain suitability for different tree types
 - Occupied tiles from previously placed objects
 - Density-based clustering for natural-looking forests
+- Poisson-disk (Bridson) sampling for evenly spaced forests
 """
 
 import random
@@ -16,6 +17,13 @@ from dataclasses import dataclass
 from classes.ObjectsTemplate import ObjectsTemplate
 from classes.Objects.Objects import Objects
 from classes.tile.Tile import TerrainType
+from generation.object_gen.template_footprint import get_template_footprint, place_row_mask, grid_to_row_bits
+
+
+# sposoby losowania pozycji drzew w generate_forest_on_region
+FOREST_SAMPLING_MODES = ("random", "poisson")
+# liczba kandydatow losowanych wokol aktywnego punktu w algorytmie Bridsona
+POISSON_CANDIDATES = 30
 
 
 @dataclass
@@ -29,12 +37,46 @@ class TreeType:
     min_distance: int  # Minimalna odległość od innych drzew
 
 
+class TreeSpatialHash:
+    """
+    Siatka kubełków z pozycjami postawionych drzew do sprawdzania minimalnej odległości.
+    
+    Kubełek ma bok cell_size, więc sprawdzenie odległości mniejszej niż d przegląda tylko
+    kubełki w promieniu ceil(d / cell_size) wokół kafelka zamiast wszystkich drzew.
+    """
+    
+    def __init__(self, cell_size: int = 3):
+        self.cell_size = max(1, cell_size)
+        self.buckets: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+    
+    def add(self, x: int, y: int):
+        key = (x // self.cell_size, y // self.cell_size)
+        self.buckets.setdefault(key, []).append((x, y))
+    
+    def has_point_closer_than(self, x: int, y: int, distance: float) -> bool:
+        """
+        Sprawdza czy jakiekolwiek drzewo leży w odległości euklidesowej mniejszej niż distance od (x, y).
+        """
+        if distance <= 0:
+            return False
+        reach = math.ceil(distance / self.cell_size)
+        bucket_x, bucket_y = x // self.cell_size, y // self.cell_size
+        limit = distance * distance
+        for bx in range(bucket_x - reach, bucket_x + reach + 1):
+            for by in range(bucket_y - reach, bucket_y + reach + 1):
+                for px, py in self.buckets.get((bx, by), ()):
+                    if (x - px) ** 2 + (y - py) ** 2 < limit:
+                        return True
+        return False
+
+
 class ForestPlacer:
     """
     Algorytm rozmieszczania lasów na mapie.
     
     Strategie:
     1. Density Clustering: grupa drzew wokół centroidu
+       (lub próbkowanie Poissona, które zachowuje min_distance bez losowania na ślepo)
     2. Terrain Preference: wybór drzew na podstawie terenu
     3. Hitbox Avoidance: sprawdzenie kolizji z passability/actionability
     4. Occupied Tiles: pomijanie zajetych kafelków
@@ -45,12 +87,21 @@ class ForestPlacer:
         Args:
             map_width: szerokość mapy
             map_height: wysokość mapy
-            occupied_tiles: tablica bool zajetych kafelków (6x8 dla każdego obiektu)
+            occupied_tiles: tablica bool zajetych kafelków [y][x], uzupełniana o kafelki postawionych drzew
         """
         self.map_width = map_width
         self.map_height = map_height
         self.occupied_tiles = occupied_tiles
         self.placed_trees: List[Tuple[int, int, ObjectsTemplate]] = []
+        # occupied_tiles jako bitsety wierszy (bit x wiersza y = kafelek (x, y)), sprawdzane przez can_place_object
+        self.occupied_rows: List[int] = []
+        self.refresh_occupancy_rows()
+    
+    def refresh_occupancy_rows(self):
+        """
+        Odbudowuje bitsety wierszy z occupied_tiles. Wywołaj po zmianie occupied_tiles poza mark_object_as_placed.
+        """
+        self.occupied_rows = grid_to_row_bits(self.occupied_tiles)
     
     def is_tile_available(self, x: int, y: int) -> bool:
         """
@@ -70,11 +121,13 @@ class ForestPlacer:
         """
         Sprawdza czy obiekt można umieścić na pozycji bez kolizji z hitboxem.
         
-        Hitbox obiektu to obszar 6x8 wyznaczony przez passability/actionability.
+        Hitbox obiektu to kafelki zablokowane lub akcjonowalne według passability/actionability,
+        w tej samej konwencji co ObjectTemplateHelper (get_template_footprint): obiekt w (x, y)
+        zajmuje kafelki (x - col, y - 5 + row). Każdy kafelek hitboxa musi leżeć na mapie i być wolny.
         
         Args:
             template: template obiektu (zawiera passability/actionability)
-            x, y: pozycja lewego górnego rogu
+            x, y: pozycja obiektu (prawy dolny róg obszaru 8x6)
             
         Returns:
             True jeśli można umieścić obiekt bez kolizji
@@ -82,60 +135,47 @@ class ForestPlacer:
         if not template.passability or not template.actionability:
             return True
         
-        rows = 6
-        cols = 8
+        footprint = get_template_footprint(template)
+        if footprint.tiles and not (0 <= x + footprint.min_dx and x + footprint.max_dx < self.map_width
+                                    and 0 <= y + footprint.min_dy and y + footprint.max_dy < self.map_height):
+            return False
         
-        for row in range(rows):
-            for col in range(cols):
-                tile_x = x + col
-                tile_y = y + row
-                
-                # Sprawdź granice mapy
-                if not (0 <= tile_x < self.map_width and 0 <= tile_y < self.map_height):
-                    return False
-                
-                # Pobierz bity passability i actionability
-                if row < len(template.passability) and col < 8:
-                    passable = bool((template.passability[row] >> col) & 1)
-                    actionable = False
-                    if row < len(template.actionability):
-                        actionable = bool((template.actionability[row] >> col) & 1)
-                    
-                    # Jeśli drzewo ma "hitbox" na tym kafelku, sprawdź czy jest zajęty
-                    if not passable or actionable:
-                        if self.occupied_tiles[tile_y][tile_x]:
-                            return False
+        for dy, covered_mask, _ in footprint.rows:
+            if self.occupied_rows[y + dy] & place_row_mask(covered_mask, x):
+                return False
         
         return True
     
-    def mark_object_as_placed(self, template: ObjectsTemplate, x: int, y: int):
+    def object_tiles(self, template: ObjectsTemplate, x: int, y: int) -> List[Tuple[int, int]]:
         """
-        Oznacza kafelki obiektu jako zajęte.
+        Kafelki hitboxa obiektu (te same co w can_place_object) leżące na mapie.
         
         Args:
             template: template obiektu
-            x, y: pozycja lewego górnego rogu
+            x, y: pozycja obiektu (prawy dolny róg obszaru 8x6)
         """
         if not template.passability or not template.actionability:
-            return
+            return []
         
-        rows = 6
-        cols = 8
+        tiles = []
+        for dx, dy, _ in get_template_footprint(template).tiles:
+            tile_x = x + dx
+            tile_y = y + dy
+            if 0 <= tile_x < self.map_width and 0 <= tile_y < self.map_height:
+                tiles.append((tile_x, tile_y))
+        return tiles
+    
+    def mark_object_as_placed(self, template: ObjectsTemplate, x: int, y: int):
+        """
+        Oznacza kafelki hitboxa obiektu (te same co w can_place_object) jako zajęte.
         
-        for row in range(rows):
-            for col in range(cols):
-                tile_x = x + col
-                tile_y = y + row
-                
-                if 0 <= tile_x < self.map_width and 0 <= tile_y < self.map_height:
-                    if row < len(template.passability) and col < 8:
-                        passable = bool((template.passability[row] >> col) & 1)
-                        actionable = False
-                        if row < len(template.actionability):
-                            actionable = bool((template.actionability[row] >> col) & 1)
-                        
-                        if not passable or actionable:
-                            self.occupied_tiles[tile_y][tile_x] = True
+        Args:
+            template: template obiektu
+            x, y: pozycja obiektu (prawy dolny róg obszaru 8x6)
+        """
+        for tile_x, tile_y in self.object_tiles(template, x, y):
+            self.occupied_tiles[tile_y][tile_x] = True
+            self.occupied_rows[tile_y] |= 1 << tile_x
     
     def get_terrain_suitability(self, tiles: List[Tuple[int, int]], 
                                terrain_affinity: Dict[TerrainType, float]) -> float:
@@ -166,6 +206,28 @@ class ForestPlacer:
         
         return total_affinity / len(tiles) if tiles else 0.5
     
+    def free_tile_sums(self, x_from: int, y_from: int, x_to: int, y_to: int) -> List[List[int]]:
+        """
+        Tablica sum prefiksowych (summed-area table) wolnych kafelków prostokąta [x_from, x_to) x [y_from, y_to).
+        
+        sums[j][i] to liczba wolnych kafelków (is_tile_available) w [x_from, x_from + i) x [y_from, y_from + j),
+        kafelki poza mapą liczą się jako zajęte.
+        
+        Returns:
+            Tablica (y_to - y_from + 1) x (x_to - x_from + 1)
+        """
+        width = x_to - x_from
+        sums = [[0] * (width + 1)]
+        for y in range(y_from, y_to):
+            previous = sums[-1]
+            row = [0] * (width + 1)
+            running = 0
+            for i in range(width):
+                running += self.is_tile_available(x_from + i, y)
+                row[i + 1] = previous[i + 1] + running
+            sums.append(row)
+        return sums
+    
     def find_cluster_center(self, cluster_seed_x: int, cluster_seed_y: int, 
                            cluster_radius: int) -> Tuple[int, int]:
         """
@@ -181,15 +243,21 @@ class ForestPlacer:
         best_x, best_y = cluster_seed_x, cluster_seed_y
         best_count = 0
         
-        for cx in range(max(0, cluster_seed_x - cluster_radius), 
-                       min(self.map_width, cluster_seed_x + cluster_radius + 1)):
-            for cy in range(max(0, cluster_seed_y - cluster_radius), 
-                           min(self.map_height, cluster_seed_y + cluster_radius + 1)):
-                free_count = 0
-                for dx in range(-2, 3):
-                    for dy in range(-2, 3):
-                        if self.is_tile_available(cx + dx, cy + dy):
-                            free_count += 1
+        x_from = max(0, cluster_seed_x - cluster_radius)
+        x_to = min(self.map_width, cluster_seed_x + cluster_radius + 1)
+        y_from = max(0, cluster_seed_y - cluster_radius)
+        y_to = min(self.map_height, cluster_seed_y + cluster_radius + 1)
+        if x_from >= x_to or y_from >= y_to:
+            return best_x, best_y
+        
+        # tablica sum prefiksowych wolnych kafelków obszaru z marginesem okna 5x5
+        origin_x, origin_y = x_from - 2, y_from - 2
+        sums = self.free_tile_sums(origin_x, origin_y, x_to + 2, y_to + 2)
+        
+        for cx in range(x_from, x_to):
+            for cy in range(y_from, y_to):
+                left, top = cx - 2 - origin_x, cy - 2 - origin_y
+                free_count = sums[top + 5][left + 5] - sums[top][left + 5] - sums[top + 5][left] + sums[top][left]
                 
                 if free_count > best_count:
                     best_count = free_count
@@ -214,6 +282,7 @@ class ForestPlacer:
             Lista (x, y, template) umieszczonych drzew
         """
         trees_placed = []
+        tree_hash = TreeSpatialHash(max((tree_type.min_distance for tree_type in tree_types), default=1))
         
         # Próbuj umieścić drzewa w obrębie klastra
         attempts = int(cluster_radius ** 2 * density * 2)  # Heurystyka liczby prób
@@ -236,17 +305,8 @@ class ForestPlacer:
             # Sprawdź czy można umieścić
             if self.can_place_object(tree_type.template, tree_x, tree_y):
                 # Sprawdź minimalną odległość do innych drzew
-                too_close = False
-                for placed_x, placed_y, _ in trees_placed:
-                    dist_to_placed = math.sqrt((tree_x - placed_x) ** 2 + (tree_y - placed_y) ** 2)
-                    if dist_to_placed < tree_type.min_distance:
-                        too_close = True
-                        break
-                
-                if not too_close:
-                    self.mark_object_as_placed(tree_type.template, tree_x, tree_y)
-                    trees_placed.append((tree_x, tree_y, tree_type.template))
-                    self.placed_trees.append((tree_x, tree_y, tree_type.template))
+                if not tree_hash.has_point_closer_than(tree_x, tree_y, tree_type.min_distance):
+                    self.place_tree(tree_type, tree_x, tree_y, trees_placed, tree_hash)
         
         return trees_placed
     
@@ -290,7 +350,8 @@ class ForestPlacer:
     
     def generate_forest_on_region(self, tree_types: List[TreeType],
                                   region_tiles: List[Tuple[int, int]],
-                                  density: float = 0.4) -> List[Tuple[int, int, ObjectsTemplate]]:
+                                  density: float = 0.4,
+                                  sampling: str = "random") -> List[Tuple[int, int, ObjectsTemplate]]:
         """
         Generuje las na podanym regionie (z listy kafelków, np. z diagramu Voronoi).
         
@@ -298,14 +359,22 @@ class ForestPlacer:
             tree_types: lista dostępnych typów drzew
             region_tiles: lista kafelków (x, y) z regionu
             density: gęstość drzew (0.0-1.0)
+            sampling: sposób losowania pozycji, jeden z FOREST_SAMPLING_MODES:
+                "random" - len(region_tiles) * density losowych kafelków regionu,
+                "poisson" - próbkowanie Poissona (Bridson), co najwyżej len(region_tiles) * density drzew
             
         Returns:
             Lista umieszczonych drzew (x, y, template)
         """
+        if sampling not in FOREST_SAMPLING_MODES:
+            raise ValueError(f"Unknown forest sampling mode: {sampling}, expected one of {FOREST_SAMPLING_MODES}")
         if not region_tiles:
             return []
+        if sampling == "poisson":
+            return self.generate_forest_poisson(tree_types, region_tiles, int(len(region_tiles) * density))
         
         trees_placed = []
+        tree_hash = TreeSpatialHash(max((tree_type.min_distance for tree_type in tree_types), default=1))
         
         # Liczba prób umieszczenia drzew
         num_attempts = int(len(region_tiles) * density)
@@ -321,22 +390,83 @@ class ForestPlacer:
             # Wybierz losowy typ drzewa
             tree_type = random.choice(tree_types)
             
-            # Sprawdź czy można umieścić (pozycja to lewy górny róg hitboxa)
+            # Sprawdź czy można umieścić (pozycja to prawy dolny róg obszaru 8x6)
             if self.can_place_object(tree_type.template, tile_x, tile_y):
                 # Sprawdzenie minimalne odległości
-                too_close = False
-                for placed_x, placed_y, _ in trees_placed:
-                    dist = math.sqrt((tile_x - placed_x) ** 2 + (tile_y - placed_y) ** 2)
-                    if dist < tree_type.min_distance:
-                        too_close = True
-                        break
-                
-                if not too_close:
-                    self.mark_object_as_placed(tree_type.template, tile_x, tile_y)
-                    trees_placed.append((tile_x, tile_y, tree_type.template))
-                    self.placed_trees.append((tile_x, tile_y, tree_type.template))
+                if not tree_hash.has_point_closer_than(tile_x, tile_y, tree_type.min_distance):
+                    self.place_tree(tree_type, tile_x, tile_y, trees_placed, tree_hash)
+        
+        return trees_placed
+    
+    def generate_forest_poisson(self, tree_types: List[TreeType],
+                                region_tiles: List[Tuple[int, int]],
+                                max_trees: int) -> List[Tuple[int, int, ObjectsTemplate]]:
+        """
+        Generuje las na regionie próbkowaniem Poissona (algorytm Bridsona).
+        
+        Każde nowe drzewo jest losowane w pierścieniu [min_distance, 2 * min_distance) wokół aktywnego
+        drzewa, więc odstępy są zachowane bez losowania pozycji z całego regionu. Drzewo, wokół którego
+        POISSON_CANDIDATES kandydatów nie dało się postawić, przestaje być aktywne. Gdy aktywnych drzew
+        zabraknie, losowany jest nowy punkt startowy (region może nie być spójny).
+        
+        Args:
+            tree_types: lista dostępnych typów drzew
+            region_tiles: lista kafelków (x, y) z regionu
+            max_trees: maksymalna liczba drzew
+            
+        Returns:
+            Lista umieszczonych drzew (x, y, template)
+        """
+        trees_placed = []
+        if not region_tiles or not tree_types or max_trees <= 0:
+            return trees_placed
+        
+        region = set(region_tiles)
+        tree_hash = TreeSpatialHash(max((tree_type.min_distance for tree_type in tree_types), default=1))
+        radius = max(1, max(tree_type.min_distance for tree_type in tree_types))
+        active: List[Tuple[int, int]] = []
+        
+        def try_place(x: int, y: int) -> bool:
+            if (x, y) not in region or not self.is_tile_available(x, y):
+                return False
+            tree_type = random.choice(tree_types)
+            if tree_hash.has_point_closer_than(x, y, tree_type.min_distance):
+                return False
+            if not self.can_place_object(tree_type.template, x, y):
+                return False
+            self.place_tree(tree_type, x, y, trees_placed, tree_hash)
+            active.append((x, y))
+            return True
+        
+        seeds = 0
+        while len(trees_placed) < max_trees:
+            if not active:
+                # nowy punkt startowy, najwyżej POISSON_CANDIDATES nieudanych prób z rzędu
+                if seeds >= POISSON_CANDIDATES:
+                    break
+                seeds = 0 if try_place(*random.choice(region_tiles)) else seeds + 1
+                continue
+            
+            index = random.randrange(len(active))
+            center_x, center_y = active[index]
+            for _ in range(POISSON_CANDIDATES):
+                angle = random.uniform(0, 2 * math.pi)
+                dist = random.uniform(radius, 2 * radius)
+                if try_place(round(center_x + dist * math.cos(angle)), round(center_y + dist * math.sin(angle))):
+                    break
+            else:
+                active[index] = active[-1]
+                active.pop()
         
         return trees_placed
+    
+    def place_tree(self, tree_type: TreeType, x: int, y: int,
+                   trees_placed: List[Tuple[int, int, ObjectsTemplate]], tree_hash: TreeSpatialHash):
+        """Oznacza drzewo jako postawione i zapisuje je na listach oraz w siatce kubełków."""
+        self.mark_object_as_placed(tree_type.template, x, y)
+        trees_placed.append((x, y, tree_type.template))
+        self.placed_trees.append((x, y, tree_type.template))
+        tree_hash.add(x, y)
 
 
 def create_default_tree_types(tree_templates: List[ObjectsTemplate]) -> List[TreeType]:
@@ -0,0 +1,66 @@
+from random import randint
+
+
+class FreeTileSampler:
+    """
+    Pool of free tiles of a map for uniform random sampling.
+
+    The tiles are kept as row bitsets (bit x of row y is the tile (x, y)) with a Fenwick tree over the
+    number of free tiles in every row. Drawing a tile walks the tree down to its row and bisects that row
+    by bit counts, replacing a row updates the tree, both in O(log n) steps.
+    """
+    def __init__(self, rows: list[int]) -> None:
+        self.rows = list(rows)
+        self.height = len(self.rows)
+        self._tree = [0] * (self.height + 1)
+        for y, row in enumerate(self.rows):
+            i = y + 1
+            self._tree[i] += row.bit_count()
+            parent = i + (i & -i)
+            if parent <= self.height:
+                self._tree[parent] += self._tree[i]
+        self._top = 1 << self.height.bit_length() if self.height else 0
+        self.count = sum(row.bit_count() for row in self.rows)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def update_row(self, y: int, row: int) -> None:
+        """Replaces the free tiles of row y."""
+        delta = row.bit_count() - self.rows[y].bit_count()
+        self.rows[y] = row
+        if not delta:
+            return
+        self.count += delta
+        i = y + 1
+        while i <= self.height:
+            self._tree[i] += delta
+            i += i & -i
+
+    def tile(self, index: int) -> tuple[int, int]:
+        """The index-th free tile (0 <= index < len(self)), counting row by row."""
+        # walk down the Fenwick tree to the row holding the tile
+        y = 0
+        step = self._top
+        while step:
+            if y + step <= self.height and self._tree[y + step] <= index:
+                y += step
+                index -= self._tree[y]
+            step >>= 1
+
+        # bisect the row for the smallest x with index + 1 free tiles among bits 0..x
+        row = self.rows[y]
+        low, high = 0, row.bit_length() - 1
+        while low < high:
+            middle = (low + high) // 2
+            if (row & ((2 << middle) - 1)).bit_count() > index:
+                high = middle
+            else:
+                low = middle + 1
+        return low, y
+
+    def sample(self) -> tuple[int, int] | None:
+        """A uniformly random free tile, None if there are none."""
+        if not self.count:
+            return None
+        return self.tile(randint(0, self.count - 1))
@@ -1,5 +1,6 @@
 import json
 import os
+import pickle
 import re
 import sys
 
@@ -65,6 +66,65 @@ def load_json_with_comments(filename):
 
     return data
 
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# path -> ((st_mtime_ns, st_size) of the file, pickled load_json_with_comments result)
+_catalogs: dict[str, tuple[tuple[int, int], bytes]] = {}
+
+
+def _snapshot_path(path: str) -> str:
+    return os.path.join(os.path.dirname(path), "__pycache__", os.path.basename(path) + ".pickle")
+
+
+def _read_catalog_snapshot(path: str, key: tuple[int, int]) -> bytes:
+    """
+    Pickled content of a JSON file, from its snapshot in __pycache__ if that was made from the same
+    version of the file (same mtime and size), otherwise parsed and saved as a new snapshot.
+    """
+    snapshot = _snapshot_path(path)
+    try:
+        with open(snapshot, "rb") as f:
+            snapshot_key, data = pickle.load(f)
+        if snapshot_key == key:
+            return data
+    except Exception:
+        pass  # missing or damaged snapshot, parse the file again
+
+    data = pickle.dumps(load_json_with_comments(path), protocol=pickle.HIGHEST_PROTOCOL)
+    try:
+        os.makedirs(os.path.dirname(snapshot), exist_ok=True)
+        temporary = f"{snapshot}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            pickle.dump((key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, snapshot)
+    except OSError:
+        pass  # read-only location, the snapshot is only an optimization
+    return data
+
+
+def load_catalog(path: str):
+    """
+    Cached version of load_json_with_comments, shared by the whole process.
+    Files are parsed once and kept as immutable pickled bytes, invalidated when the file changes.
+    Every call returns a fresh copy, so callers may freely modify the returned data.
+    """
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _catalogs.get(path)
+    if cached is None or cached[0] != key:
+        cached = (key, _read_catalog_snapshot(path, key))
+        _catalogs[path] = cached
+    return pickle.loads(cached[1])
+
+
+def preload_catalogs():
+    """Load every template file into the cache (e.g. before starting worker processes)."""
+    for directory in (TEMPLATES_DIR, os.path.join(TEMPLATES_DIR, "objects")):
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".json"):
+                load_catalog(os.path.join(directory, name))
+
+
 def json_to_object_template(data):
     object_templates = []
     for row in data:
@@ -108,18 +168,18 @@ def json_to_objects(data):
     return objects
 
 def read_object_templates_from_json(filename):
-    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"templates\\{filename}.json")
-    data = load_json_with_comments(path)
+    path = os.path.join(TEMPLATES_DIR, f"{filename}.json")
+    data = load_catalog(path)
     return json_to_object_template(data)
 
 def read_object_from_json(filename):
-    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"templates\\objects\\{filename}.json")
-    data = load_json_with_comments(path)
+    path = os.path.join(TEMPLATES_DIR, "objects", f"{filename}.json")
+    data = load_catalog(path)
     return json_to_objects(data)
 
 def read_object_and_template_from_json(filename):
-    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"templates\\{filename}.json")
-    data = load_json_with_comments(path)
+    path = os.path.join(TEMPLATES_DIR, f"{filename}.json")
+    data = load_catalog(path)
     return json_to_objects(data)
 
 if __name__ == "__main__":
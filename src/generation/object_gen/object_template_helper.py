@@ -47,9 +47,26 @@ from classes.Objects.Properties.Town import Town
 from classes.ObjectsTemplate import ObjectsTemplate
 from classes.tile.Tile import Tile, TerrainType
 from generation.object_gen.json_parser import read_object_templates_from_json, read_object_from_json
+from generation.object_gen.template_registry import TemplateRegistry
+from generation.object_gen.free_tile_sampler import FreeTileSampler
+from generation.object_gen.forest_placer import ForestPlacer, create_default_tree_types
+from generation.object_gen.template_footprint import get_template_footprint, place_row_mask, grid_to_row_bits, tiles_to_row_bits, \
+    colliding_anchors, nearest_bit_distance, erode_row_bits
 from generation.object_gen.city_gen.voronoi_city_placement import generate_city_positions_with_fields, get_region_tiles
 
 
+# obiekty wodne moga stac tylko tam, gdzie wszystkie kafelki w tym promieniu sa zarezerwowane (daleko od ladu)
+WATER_OBJECT_RESERVED_RADIUS = 3
+# liczba najdalszych punktow sprawdzanych przy stawianiu artefaktu z warunku zwyciestwa
+FURTHEST_POINT_CANDIDATES = 8
+# do tego promienia find_alternative_position sprawdza pozycje po kolei zamiast liczyc wiersze wolnych pozycji
+DIRECT_SEARCH_MAX_OFFSET = 4
+
+# szablon testowy find_place_one_by_one (losowy potwor): akcjonowalny kafelek (x, y) i zablokowany kafelek (x - 7, y)
+ONE_BY_ONE_TEMPLATE = ObjectsTemplate("AVWmrnd0.def", [255, 255, 255, 255, 255, 254], [0, 0, 0, 0, 0, 128], [255, 0],
+                                      [1, 0], 71, 0, 2, 0)
+
+
 @dataclass
 class TownParams:
     """Parameters for Town."""
@@ -59,14 +76,30 @@ class TownParams:
     total_regions: int
 
 
+@dataclass
+class WaterAnalysis:
+    """Zbiorniki wody mapy (spojne w 8 kierunkach), wyliczane raz przez ObjectTemplateHelper.analyze_water."""
+    labels: list[list[int]]          # [y][x] numer zbiornika, -1 dla ladu
+    body_areas: list[int]            # liczba kafelkow kazdego zbiornika
+    deep_water: list[tuple[int, int]]  # kafelki wody bez ladu wsrod 8 sasiadow, wierszami
+    shore: list[tuple[int, int]]     # kafelki ladu sasiadujace z woda, wierszami
+    deep_water_rows: list[int]
+    shore_rows: list[int]
+
+    @property
+    def water_area(self) -> int:
+        return sum(self.body_areas)
+
+
 class ObjectTemplateHelper:
     def __init__(self, tiles: list[Tile], town_params: TownParams, number_of_players: int = 8,
                  victory_condition_params: VictoryConditionParams = None, reserved_tiles: set[tuple[int, int]] = None,
                  difficulty: int = 1):
-        self.id = 1
         self.absod_id = 0
         self.tiles: list[Tile] = tiles
-        self.objectTemplates: list[ObjectsTemplate] = []
+        # tabela szablonow mapy, rowne szablony dostaja ten sam indeks (objectTemplates to jej lista)
+        self.template_registry = TemplateRegistry()
+        self.objectTemplates: list[ObjectsTemplate] = self.template_registry.templates
         self.objects: list[Objects] = []
         self.players = [generate_player() for _ in range(number_of_players)]
 
@@ -100,9 +133,25 @@ class ObjectTemplateHelper:
         self.occupied_tiles = [[False for _ in range(self.map_format)] for _ in range(self.map_format)]
         self.occupied_tiles_excluding_landscape = [[False for _ in range(self.map_format)] for _ in range(self.map_format)]
         self.occupied_tiles_excluding_actionable = [[False for _ in range(self.map_format)] for _ in range(self.map_format)]
+        # Te same mapy jako bitsety wierszy (bit x wiersza y = kafelek (x, y)), uzywane przez walidacje
+        self.occupied_rows: list[int] = []
+        self.occupied_rows_excluding_landscape: list[int] = []
+        self.reserved_rows: list[int] = []
+        # kafelki, ktorych cale otoczenie 7x7 jest zarezerwowane (erozja reserved_tiles), i maska wody
+        self.deep_reserved_rows: list[int] = []
+        self.water_rows: list[int] = [0] * self.map_format
+        # zwiekszany przy kazdej zmianie bitsetow zajetosci, uniewaznia zapamietana transformate odleglosci
+        self.occupancy_version = 0
+        self._distance_layers: tuple[int, list[list[int]]] | None = None
+        # pula wolnych pozycji find_place_one_by_one, budowana przy pierwszym uzyciu
+        self._free_tile_sampler: FreeTileSampler | None = None
+        # bitsety wierszy kafelkow kazdego typu terenu, teren nie zmienia sie podczas stawiania obiektow
+        self._terrain_rows: list[list[int]] | None = None
+        self.refresh_occupancy_rows()
         self.city_field_mapping = []  # Lista do przechowywania mapowania miast do p�l
         self.final_city_positions: list[tuple[int, int, int]] = [] # TownType.value, pos_x, pos_y
         self.water = []
+        self._water_analysis: WaterAnalysis | None = None
 
         ### params ###
         self.town_params = town_params
@@ -125,8 +174,7 @@ class ObjectTemplateHelper:
                             [(5, 10), (10, 15), (15, 20), (20, 25)]] #resources
 
         self.limits = [i[int(self.map_format/36) - 1] for i in limitations]
-        water, _ = self.bfs()
-        water_percentage = len(water) / (self.map_format * self.map_format)
+        water_percentage = self.analyze_water().water_area / (self.map_format * self.map_format)
         for i in range(7, len(self.limits)):
             self.limits[i] = (int(self.limits[i][0] * (1 - water_percentage)), int(self.limits[i][1] * (1 - water_percentage)))
 
@@ -164,11 +212,20 @@ class ObjectTemplateHelper:
                 self.players, self.occupied_tiles_excluding_landscape, self.occupied_tiles_excluding_actionable, self.actionable_tiles, self.towns_generated, self.heroes_generated, self.monsters_generated)
 
     def create_default_object_template(self):
-        self.objectTemplates.append(ObjectsTemplate.create_default())
-        self.objectTemplates.append(
+        self.template_registry.add(ObjectsTemplate.create_default())
+        self.template_registry.add(
             ObjectsTemplate("AVLholg0.def", [255, 255, 255, 255, 255, 255], [0, 0, 0, 0, 0, 0], [4, 0], [4, 0], 124, 0,
                             0, 1))
 
+    def add_object(self, template: ObjectsTemplate, object: Objects) -> Objects:
+        """
+        Dodaje obiekt do mapy, template_idx obiektu wskazuje jego szablon w tabeli szablonow.
+        Rowne szablony sa zapisywane w tabeli tylko raz.
+        """
+        object.template_idx = self.template_registry.add(template)
+        self.objects.append(object)
+        return object
+
     def mark_object_tiles_as_occupied(self, template: ObjectsTemplate, x: int, y: int, offset: int = 0):
         """
         Oznacza kafelki obiektu jako zajete na podstawie passability i actionability.
@@ -181,33 +238,73 @@ class ObjectTemplateHelper:
         if not template.passability:
             return
 
-        rows = 6
-        cols = 8
-
-        for row in range(rows):
-            for col in range(cols):
-                tile_x = x - col
-                tile_y = y - 5 + row
-
-                passable = bool(not((template.passability[row] >> (7 - col)) & 1))
-                actionable = bool((template.actionability[row] >> (7 - col)) & 1)
-
-                # Oznacz kafelek jako zajety jesli jest nieprzejezdny lub akcjonowalny
-                if passable or actionable:
-                    self.occupied_tiles_excluding_landscape[tile_y][tile_x] = True
-                    if not actionable:
-                        self.occupied_tiles_excluding_actionable[tile_y][tile_x] = True
-                    self.occupied_tiles[tile_y][tile_x] = True
-                    # oznaczaj obszar z offsetem w macierzy glównej
-                    for dy in range(-offset, offset + 1):
-                        for dx in range(-offset, offset + 1):
-                            nx = tile_x + dx
-                            ny = tile_y + dy
-                            if 0 <= nx < self.map_format and 0 <= ny < self.map_format:
-                                self.occupied_tiles[ny][nx] = True
-                    if actionable:
-                        self.actionable_tiles.append((tile_x, tile_y))
+        size = self.map_format
+        self.occupancy_version += 1
+        for dx, dy, actionable in get_template_footprint(template).tiles:
+            tile_x = x + dx
+            tile_y = y + dy
+
+            # Oznacz kafelek jako zajety (jest nieprzejezdny lub akcjonowalny)
+            self.occupied_tiles_excluding_landscape[tile_y][tile_x] = True
+            if not actionable:
+                self.occupied_tiles_excluding_actionable[tile_y][tile_x] = True
+            self.occupied_tiles[tile_y][tile_x] = True
+            # ujemne pozycje zawijaja sie tak samo jak indeksy list powyzej
+            bit = 1 << (tile_x % size)
+            self.occupied_rows_excluding_landscape[tile_y % size] |= bit
+            self.occupied_rows[tile_y % size] |= bit
+            # oznaczaj obszar z offsetem w macierzy glównej
+            if offset:
+                x_from, x_to = max(tile_x - offset, 0), min(tile_x + offset, size - 1)
+                if x_from <= x_to:
+                    span = ((1 << (x_to - x_from + 1)) - 1) << x_from
+                    for ny in range(max(tile_y - offset, 0), min(tile_y + offset, size - 1) + 1):
+                        self.occupied_tiles[ny][x_from:x_to + 1] = [True] * (x_to - x_from + 1)
+                        self.occupied_rows[ny] |= span
+            if actionable:
+                self.actionable_tiles.append((tile_x, tile_y))
+
+        if self._free_tile_sampler is not None:
+            self._update_free_tile_sampler({(y + dy) % size for dy, _, _ in get_template_footprint(template).rows})
+
+    def mark_tiles(self, tiles: list[tuple[int, int]], for_objects: bool = True, for_landscape: bool = True):
+        """
+        Oznacza kafelki jako zajete w mapach zajetosci i w ich bitsetach wierszy.
+        Obok mark_object_tiles_as_occupied jedyne miejsce zmiany zajetosci, RoadGenerator i ForestPlacer
+        pracuja na kopiach map i zwracaja zajete kafelki, ktore sa tu zapisywane.
 
+        Args:
+            tiles: kafelki (x, y) lezace na mapie
+            for_objects: zajmij je dla obiektow (occupied_tiles), np. drzewa
+            for_landscape: zajmij je dla krajobrazu (occupied_tiles_excluding_landscape), np. drogi
+        """
+        changed_rows = set()
+        for x, y in tiles:
+            bit = 1 << x
+            if for_objects:
+                self.occupied_tiles[y][x] = True
+                self.occupied_rows[y] |= bit
+            if for_landscape:
+                self.occupied_tiles_excluding_landscape[y][x] = True
+                self.occupied_rows_excluding_landscape[y] |= bit
+            changed_rows.add(y)
+
+        if changed_rows:
+            self.occupancy_version += 1
+            if self._free_tile_sampler is not None:
+                self._update_free_tile_sampler(changed_rows)
+
+    def refresh_occupancy_rows(self):
+        """
+        Odbudowuje bitsety wierszy z map zajetosci i reserved_tiles.
+        Mapy zmieniaja tylko mark_object_tiles_as_occupied i mark_tiles, ktore same aktualizuja bitsety.
+        """
+        self.occupancy_version += 1
+        self.occupied_rows = grid_to_row_bits(self.occupied_tiles)
+        self.occupied_rows_excluding_landscape = grid_to_row_bits(self.occupied_tiles_excluding_landscape)
+        self.reserved_rows = tiles_to_row_bits(self.reserved_tiles, self.map_format)
+        self.deep_reserved_rows = erode_row_bits(self.reserved_rows, WATER_OBJECT_RESERVED_RADIUS)
+        self._free_tile_sampler = None
 
     def get_occupied_tiles_count(self) -> int:
         """Zwraca liczbe zajetych kafelkow na mapie"""
@@ -238,40 +335,26 @@ class ObjectTemplateHelper:
         if not template.passability:
             return False
 
-        rows = 6
-        cols = 8
-
-        for row in range(rows):
-            for col in range(cols):
-                tile_x = x - col
-                tile_y = y - 5 + row
-
-                passable = bool(not((template.passability[row] >> (7 - col)) & 1))
-                actionable = bool((template.actionability[row] >> (7 - col)) & 1)
+        footprint = get_template_footprint(template)
+        # Jeśli kafelek, który obiekt by zajmował, leży poza mapą (bez 2-kafelkowej ramki) -> invalid
+        if not footprint.fits(x, y, 2, self.map_format - 2):
+            return False
 
-                # Jeśli kafelek, który obiekt by zajmował, leży poza mapą -> invalid
-                if not (2 <= tile_x < self.map_format - 2 and 2 <= tile_y < self.map_format - 2):
-                    if passable or actionable:
-                        # obiekt wychodzi poza mapę
-                        return False
-                    continue
-                
-                if passable or actionable:
-                    if self.occupied_tiles[tile_y][tile_x]:
-                        return False
-                    if (tile_x, tile_y) in self.reserved_tiles:
-                        return False
-
-                if actionable:
-                    neighbors_occupied = 0
-                    for i in [(-1,0), (1,0), (0,-1), (0,1)]:
-                        nx = tile_x + i[0]
-                        ny = tile_y + i[1]
-                        if 0 <= nx < self.map_format and 0 <= ny < self.map_format:
-                            if self.occupied_tiles[ny][nx] or (nx, ny) in self.reserved_tiles:
-                                neighbors_occupied += 1
-                    if neighbors_occupied == 4: # all neighbors occupied
-                        return False
+        occupied = self.occupied_rows
+        reserved = self.reserved_rows
+        for dy, covered_mask, actionable_mask in footprint.rows:
+            tile_y = y + dy
+            blocked = occupied[tile_y] | reserved[tile_y]
+            if blocked & place_row_mask(covered_mask, x):
+                return False
+
+            # kafelek akcji, ktorego wszyscy czterej sasiedzi sa zajeci -> invalid
+            if actionable_mask:
+                blocked_around = ((blocked << 1) & (blocked >> 1)
+                                  & (occupied[tile_y - 1] | reserved[tile_y - 1])
+                                  & (occupied[tile_y + 1] | reserved[tile_y + 1]))
+                if blocked_around & place_row_mask(actionable_mask, x):
+                    return False
 
         return True
 
@@ -283,28 +366,17 @@ class ObjectTemplateHelper:
         if not template.passability:
             return False
 
-        rows = 6
-        cols = 8
-
-        for row in range(rows):
-            for col in range(cols):
-                tile_x = x - col
-                tile_y = y - 5 + row
-
-                passable = bool(not((template.passability[row] >> (7 - col)) & 1))
-                actionable = bool((template.actionability[row] >> (7 - col)) & 1)
-
-                # Jeśli kafelek, który obiekt by zajmował, leży poza mapą -> invalid
-                if not (0 <= tile_x < self.map_format and 0 <= tile_y < self.map_format):
-                    if passable or actionable:
-                        # obiekt wychodzi poza mapę
-                        return False
-                    continue
+        footprint = get_template_footprint(template)
+        # Jeśli kafelek, który obiekt by zajmował, leży poza mapą -> invalid
+        if not footprint.fits(x, y, 0, self.map_format):
+            return False
 
-                if passable or actionable:
-                    if self.occupied_tiles_excluding_landscape[tile_y][tile_x] or (tile_x, tile_y) in self.reserved_tiles:
-                        # print(f"Pozycja ({x}, {y}) - kolizja na kafelku ({tile_x}, {tile_y})")
-                        return False
+        occupied = self.occupied_rows_excluding_landscape
+        reserved = self.reserved_rows
+        for dy, covered_mask, _ in footprint.rows:
+            tile_y = y + dy
+            if (occupied[tile_y] | reserved[tile_y]) & place_row_mask(covered_mask, x):
+                return False
 
         return True
 
@@ -316,35 +388,68 @@ class ObjectTemplateHelper:
         if not template.passability:
             return False
 
-        rows = 6
-        cols = 8
+        footprint = get_template_footprint(template)
+        # Jeśli kafelek, który obiekt by zajmował, leży poza mapą -> invalid
+        if not footprint.fits(x, y, 0, self.map_format):
+            return False
+
+        for dy, covered_mask, _ in footprint.rows:
+            tile_y = y + dy
+            # zajete moga byc tylko kafelki wody, a otoczenie kazdego kafelka musi byc zarezerwowane
+            if self._blocked_row_for_water_objects(tile_y) & place_row_mask(covered_mask, x):
+                return False
 
-        for row in range(rows):
-            for col in range(cols):
-                tile_x = x - col
-                tile_y = y - 5 + row
+        return True
 
-                passable = bool(not ((template.passability[row] >> (7 - col)) & 1))
-                actionable = bool((template.actionability[row] >> (7 - col)) & 1)
+    def _blocked_row(self, y: int) -> int:
+        return self.occupied_rows[y] | self.reserved_rows[y]
 
-                # Jeśli kafelek, który obiekt by zajmował, leży poza mapą -> invalid
-                if not (0 <= tile_x < self.map_format and 0 <= tile_y < self.map_format):
-                    if passable or actionable:
-                        # obiekt wychodzi poza mapę
-                        return False
-                    continue
+    def _blocked_row_for_landscape(self, y: int) -> int:
+        return self.occupied_rows_excluding_landscape[y] | self.reserved_rows[y]
 
-                if passable or actionable:
-                    if self.occupied_tiles[tile_y][tile_x] and (tile_y, tile_x) not in self.water:
-                        # print(f"Pozycja ({x}, {y}) - kolizja na kafelku ({tile_x}, {tile_y})")
-                        return False
-                    offset = 3
-                    for i in range(-offset, offset + 1):
-                        for j in range(-offset, offset + 1):
-                            if (tile_x + i, tile_y + j) not in self.reserved_tiles:
-                                return False
+    def _blocked_row_for_water_objects(self, y: int) -> int:
+        full_row = (1 << self.map_format) - 1
+        return (self.occupied_rows[y] & ~self.water_rows[y]) | (full_row & ~self.deep_reserved_rows[y])
 
-        return True
+    def free_anchor_row(self, template: ObjectsTemplate, y: int) -> int:
+        """Bitset wszystkich x, dla ktorych validate_placement(template, x, y) zwraca True."""
+        return self._free_anchor_row(template, y, 2, self._blocked_row, True)
+
+    def free_anchor_row_for_landscape(self, template: ObjectsTemplate, y: int) -> int:
+        """Bitset wszystkich x, dla ktorych validate_placement_for_landscape(template, x, y) zwraca True."""
+        return self._free_anchor_row(template, y, 0, self._blocked_row_for_landscape, False)
+
+    def free_anchor_row_for_water_objects(self, template: ObjectsTemplate, y: int) -> int:
+        """Bitset wszystkich x, dla ktorych validate_placement_for_water_objects(template, x, y) zwraca True."""
+        return self._free_anchor_row(template, y, 0, self._blocked_row_for_water_objects, False)
+
+    def _free_anchor_row(self, template: ObjectsTemplate, y: int, border: int, blocked_row,
+                         check_actionable: bool) -> int:
+        size = self.map_format
+        if not 0 <= y < size or not template.passability:
+            return 0
+
+        footprint = get_template_footprint(template)
+        x_from, x_to = 0, size - 1
+        if footprint.tiles:
+            if not (border <= y + footprint.min_dy and y + footprint.max_dy < size - border):
+                return 0
+            x_from = max(x_from, border - footprint.min_dx)
+            x_to = min(x_to, size - border - 1 - footprint.max_dx)
+        if x_from > x_to:
+            return 0
+
+        anchors = ((1 << (x_to - x_from + 1)) - 1) << x_from
+        for dy, covered_mask, actionable_mask in footprint.rows:
+            tile_y = y + dy
+            blocked = blocked_row(tile_y)
+            anchors &= ~colliding_anchors(blocked, covered_mask)
+            if check_actionable and actionable_mask:
+                blocked_around = (blocked << 1) & (blocked >> 1) & blocked_row(tile_y - 1) & blocked_row(tile_y + 1)
+                anchors &= ~colliding_anchors(blocked_around, actionable_mask)
+            if not anchors:
+                break
+        return anchors
 
     def find_alternative_position(self, template: ObjectsTemplate, preferred_x: int, preferred_y: int,
                                   max_offset: int = 3, validation_function = None) -> tuple:
@@ -361,6 +466,19 @@ class ObjectTemplateHelper:
             # self.occ.append((preferred_x, preferred_y))
             return preferred_x, preferred_y
 
+        # Walidacje oparte o bitsety wierszy licza cale wiersze wolnych pozycji naraz, co dla wiekszych
+        # promieni jest szybsze niz sprawdzanie pozycji po kolei
+        if max_offset > DIRECT_SEARCH_MAX_OFFSET:
+            if validation_function == self.validate_placement:
+                return self._find_nearest_free_anchor(template, preferred_x, preferred_y, max_offset,
+                                                      self.free_anchor_row)
+            if validation_function == self.validate_placement_for_landscape:
+                return self._find_nearest_free_anchor(template, preferred_x, preferred_y, max_offset,
+                                                      self.free_anchor_row_for_landscape)
+            if validation_function == self.validate_placement_for_water_objects:
+                return self._find_nearest_free_anchor(template, preferred_x, preferred_y, max_offset,
+                                                      self.free_anchor_row_for_water_objects)
+
         # Sprobuj pozycje w coraz wiekszych okreslach wokol preferowanej pozycji
         for offset in range(1, max_offset + 1):
             for dx in range(-offset, offset + 1):
@@ -378,6 +496,43 @@ class ObjectTemplateHelper:
         # print(f"Nie znaleziono alternatywnej pozycji dla ({preferred_x}, {preferred_y}) w promieniu {max_offset}")
         return None, None
 
+    def _find_nearest_free_anchor(self, template: ObjectsTemplate, preferred_x: int, preferred_y: int,
+                                  max_offset: int, anchor_row) -> tuple:
+        """
+        Ten sam wynik co przeszukiwanie kolejnych okregow w find_alternative_position, liczony z wierszy
+        wolnych pozycji (anchor_row): najblizszy okrag z wolna pozycja, a na nim najmniejsze dx, potem dy.
+        Wiersze sa liczone od preferowanej pozycji na zewnatrz, tylko dopoki moga zawierac blizsza pozycje.
+        """
+        size = self.map_format
+        x_from, x_to = max(preferred_x - max_offset, 0), min(preferred_x + max_offset, size - 1)
+        if x_from > x_to:
+            return None, None
+        window = ((1 << (x_to - x_from + 1)) - 1) << x_from
+
+        rows = {}
+        best = max_offset + 1
+        distance_y = 0
+        while distance_y <= min(best, max_offset):
+            for y in {preferred_y - distance_y, preferred_y + distance_y}:
+                anchors = anchor_row(template, y) & window
+                rows[y] = anchors
+                if anchors:
+                    best = min(best, max(distance_y, nearest_bit_distance(anchors, preferred_x)))
+            distance_y += 1
+        if best > max_offset:
+            return None, None
+
+        x_from, x_to = max(preferred_x - best, 0), min(preferred_x + best, size - 1)
+        columns = ((1 << (x_to - x_from + 1)) - 1) << x_from
+        candidates = 0
+        for y in range(preferred_y - best, preferred_y + best + 1):
+            candidates |= rows.get(y, 0) & columns
+        x = (candidates & -candidates).bit_length() - 1
+        for y in range(preferred_y - best, preferred_y + best + 1):
+            if rows.get(y, 0) >> x & 1:
+                return x, y
+        return None, None
+
     def get_town_type(self, x: int, y: int) -> int:
         num: int = x + y * self.map_format
         tile_type = TerrainType(self.tiles[num].terrain_type)
@@ -438,7 +593,6 @@ class ObjectTemplateHelper:
 
         cities = []
         cities_templates = []
-        id = self.id
         absod_id = self.absod_id
 
         try:
@@ -467,11 +621,10 @@ class ObjectTemplateHelper:
                 final_city_x, final_city_y = self.find_alternative_position(town_template, city_x, city_y, max_offset=15)
 
                 if final_city_x is not None and final_city_y is not None:
-                    id = id + 1
                     absod_id = absod_id + 1
 
                     cities_templates.append(town_template)
-                    cities.append(Objects(final_city_x, final_city_y, 0, id, [],
+                    cities.append(Objects(final_city_x, final_city_y, 0, 0, [],
                                           Town(absod_id, i, None, None, Formation.SPREAD, None, 1,
                                                MustHaveSpell.create_default(), MayNotHaveSpell.create_default(), [],
                                                255, [])))
@@ -483,14 +636,13 @@ class ObjectTemplateHelper:
                     self.players[i].main_town = MainTown(0, town_type_index, final_city_x - 2, final_city_y, 0)
                     self.mark_object_tiles_as_occupied(tmp, final_city_x, final_city_y, 3)
 
-            self.objectTemplates.extend(cities_templates)
-            self.objects.extend(cities)
+            for city_template, city in zip(cities_templates, cities):
+                self.add_object(city_template, city)
 
             for city in cities:
                 # append tuple of x-2, y, z
                 self.towns_generated.append((city.x-2, city.y, city.z))
 
-            self.id = id
             self.absod_id = absod_id
 
             # Wyswietl statystyki zajetosci mapy
@@ -512,10 +664,9 @@ class ObjectTemplateHelper:
             return round(additional_field.centroid[0] * 2) / 2, round(additional_field.centroid[1] * 2) / 2
 
     def get_city_type(self, i):
-        objectTemplate: ObjectsTemplate = self.objectTemplates[i + 2]
-        for i, city in enumerate(self.towns):
-            if objectTemplate == city:
-                return i
+        # typ i-tego postawionego miasta (indeks w self.towns)
+        if i < len(self.final_city_positions):
+            return self.final_city_positions[i][0]
         return None
 
     def generate_dwelling_precise_positioning(self):
@@ -526,7 +677,6 @@ class ObjectTemplateHelper:
 
         dwellings = []
         dwelling_templates = []
-        id = self.id
         absod_id = self.absod_id
 
         for i, pos in enumerate(city_positions):
@@ -555,25 +705,22 @@ class ObjectTemplateHelper:
                                                                                         dwelling_y, max_offset=3)
 
                     if final_dwelling_x is not None and final_dwelling_y is not None:
-                        id = id + 1
                         absod_id = absod_id + 1
                         dwelling_templates.append(dwelling_template)
-                        dwellings.append(Objects(final_dwelling_x, final_dwelling_y, 0, id, [],
+                        dwellings.append(Objects(final_dwelling_x, final_dwelling_y, 0, 0, [],
                                                  RandomDwellingPresetAlignment.create_default()))
 
                         # Oznacz kafelki dwelling jako zajete
                         self.mark_object_tiles_as_occupied(dwelling_template, final_dwelling_x, final_dwelling_y, 2)
 
-        self.objectTemplates.extend(dwelling_templates)
-        self.objects.extend(dwellings)
+        for dwelling_template, dwelling in zip(dwelling_templates, dwellings):
+            self.add_object(dwelling_template, dwelling)
 
-        self.id = id
         self.absod_id = absod_id
 
     def generate_heroes_positioning(self):
         heroes = []
         heroes_templates = []
-        id = self.id
         absod_id = self.absod_id
         used_heroes = []
 
@@ -592,12 +739,10 @@ class ObjectTemplateHelper:
                 final_x, final_y = self.find_alternative_position(heroTemplate, pos_x, pos_y, max_offset=5,
                                                                   validation_function=self.validate_placement_for_landscape)
                 if final_x is not None and final_y is not None:
-                    id = id + 1
                     absod_id = absod_id + 1
 
                     hero.x = final_x
                     hero.y = final_y
-                    hero.template_idx = id
                     hero.properties['absod_id'] = absod_id
                     hero.properties['type'] = type
                     hero.properties['owner'] = i
@@ -637,10 +782,9 @@ class ObjectTemplateHelper:
             else:
                 raise Exception(f"Can not set a hero")
 
-        self.objectTemplates.extend(heroes_templates)
-        self.objects.extend(heroes)
+        for hero_template, hero in zip(heroes_templates, heroes):
+            self.add_object(hero_template, hero)
 
-        self.id = id
         self.absod_id = absod_id
 
     def generate_special_building(self):
@@ -671,37 +815,32 @@ class ObjectTemplateHelper:
                     if final_x is not None and final_y is not None:
 
                         if r == 6:
-                            object = Objects(final_x, final_y, 0, self.id, [], WitchHut.create_default())
+                            object = Objects(final_x, final_y, 0, 0, [], WitchHut.create_default())
                         elif r == 9:
-                            object = Objects(final_x, final_y, 0, self.id, [], Shrine.create_default())
+                            object = Objects(final_x, final_y, 0, 0, [], Shrine.create_default())
                         elif r == 12:
-                            object = Objects(final_x, final_y, 0, self.id, [], Scholar.create_default())
+                            object = Objects(final_x, final_y, 0, 0, [], Scholar.create_default())
                         elif 13 <= r <= 15:
-                            object = Objects(final_x, final_y, 0, self.id, [], self.generate_seers_hut())
+                            object = Objects(final_x, final_y, 0, 0, [], self.generate_seers_hut())
                         else:
-                            object = Objects(final_x, final_y, 0, self.id, [], None)
+                            object = Objects(final_x, final_y, 0, 0, [], None)
 
-                        self.id = self.id + 1
-                        object.template_idx = self.id
                         # print(f"Lv1 ({final_x, final_y})")
-                        self.objectTemplates.append(template)
-                        self.objects.append(object)
+                        self.add_object(template, object)
 
                         self.mark_object_tiles_as_occupied(template, final_x, final_y, 3)
 
                         if r == 8:
                             final_x, final_y = self.find_place_one_by_one()
                             if final_x is not None and final_y is not None:
-                                self.id += 1
-                                object = Objects(final_x, final_y, 0, self.id, [], None)
+                                object = Objects(final_x, final_y, 0, 0, [], None)
                                 objectTemplate = ObjectsTemplate("AVXeyem0.def", [255, 255, 255, 255, 255, 127],
                                                                  [0, 0, 0, 0, 0, 128], [255, 1],
                                                                  [255, 0], 27, 0, 0, 0)
 
                                 self.mark_object_tiles_as_occupied(objectTemplate, final_x, final_y, 2)
 
-                                self.objectTemplates.append(objectTemplate)
-                                self.objects.append(object)
+                                self.add_object(objectTemplate, object)
 
 
 
@@ -721,7 +860,6 @@ class ObjectTemplateHelper:
         buildings_templates = []
         buildings = []
 
-        id = self.id
         absod_id = self.absod_id
 
         city_to_fields = self.result['city_to_fields']
@@ -744,9 +882,6 @@ class ObjectTemplateHelper:
                         if tile_type < 8:
                             template, object = sample(buildings_obj[tile_type], k=1)[0]
                             if template.object_class not in object_class:
-                                id = id + 1
-
-                                object.template_idx = id
                                 object.x = final_x
                                 object.y = final_y
                                 # print(f"Lv1.5 ({final_x, final_y})")
@@ -766,8 +901,7 @@ class ObjectTemplateHelper:
                                             final_x, final_y = self.find_alternative_position(res_template, pos_x + k[0], pos_y + k[1],
                                                                                               max_offset=1, validation_function=self.validate_placement_for_landscape)
                                             if final_x is not None and final_y is not None:
-                                                id = id + 1
-                                                object = Objects(final_x, final_y, 0, id, [], Resource.create_default())
+                                                object = Objects(final_x, final_y, 0, 0, [], Resource.create_default())
 
                                                 buildings_templates.append(res_template)
                                                 buildings.append(object)
@@ -780,9 +914,8 @@ class ObjectTemplateHelper:
                                                                                           validation_function=self.validate_placement_for_landscape)
 
                                         if final_x is not None and final_y is not None:
-                                            id = id + 1
                                             absod_id = absod_id + 1
-                                            object = Objects(final_x, final_y, 0, id, [], Monster.create_default())
+                                            object = Objects(final_x, final_y, 0, 0, [], Monster.create_default())
                                             object.properties.absod_id = absod_id
 
                                             buildings_templates.append(monster_template)
@@ -791,10 +924,9 @@ class ObjectTemplateHelper:
                                             self.monsters_generated.append((final_x, final_y, 0))
                                             self.monsters_generated_obj.append(object)
 
-        self.objectTemplates.extend(buildings_templates)
-        self.objects.extend(buildings)
+        for building_template, building in zip(buildings_templates, buildings):
+            self.add_object(building_template, building)
 
-        self.id = id
         self.absod_id = absod_id
 
 
@@ -811,7 +943,6 @@ class ObjectTemplateHelper:
 
         buildings = []
         buildings_templates = []
-        id = self.id
 
         for region in empty_regions:
             boundary_raster = fields_info[region].boundary_raster
@@ -831,12 +962,9 @@ class ObjectTemplateHelper:
                         r = r - highest - 1
 
                     if r == 6:
-                        building = Objects(final_x, final_y, 0, id, [], Shrine.create_default())
+                        building = Objects(final_x, final_y, 0, 0, [], Shrine.create_default())
                     else:
-                        building = Objects(final_x, final_y, 0, id, [], None)
-
-                    id = id + 1
-                    building.template_idx = id
+                        building = Objects(final_x, final_y, 0, 0, [], None)
 
                     template = special_buildings_templates[r]
                     # print(f"Lv2 ({final_x, final_y})")
@@ -845,10 +973,8 @@ class ObjectTemplateHelper:
 
                     self.mark_object_tiles_as_occupied(template, final_x, final_y, 4)
 
-        self.objectTemplates.extend(buildings_templates)
-        self.objects.extend(buildings)
-
-        self.id = id
+        for building_template, building in zip(buildings_templates, buildings):
+            self.add_object(building_template, building)
 
 
     def get_regions_without_cities(self):
@@ -866,7 +992,6 @@ class ObjectTemplateHelper:
 
         buildings = []
         buildings_templates = []
-        id = self.id
         absod_id = self.absod_id
         l = 0
 
@@ -879,12 +1004,10 @@ class ObjectTemplateHelper:
             final_x, final_y = self.find_alternative_position(template, int(pos_x), int(pos_y), max_offset=10)
 
             if final_x is not None and final_y is not None:
-                id = id + 1
-
                 if l != self.town_params.neutral_cities:
                     l += 1
                     print(f"Neutral cities {l}: {final_x} {final_y}")
-                    building = Objects(final_x, final_y, 0, id, [],
+                    building = Objects(final_x, final_y, 0, 0, [],
                                           Town(absod_id, 255, None, None, Formation.SPREAD, None, 1,
                                                MustHaveSpell.create_default(), MayNotHaveSpell.create_default(), [],
                                                255, []))
@@ -902,73 +1025,77 @@ class ObjectTemplateHelper:
                     hero.absod_id = absod_id
                     absod_id = absod_id + 1
 
-                    building = Objects(final_x, final_y, 0, id, [], hero)
+                    building = Objects(final_x, final_y, 0, 0, [], hero)
                 elif r == 3:
-                    building = Objects(final_x, final_y, 0, id, [], Shrine.create_default())
+                    building = Objects(final_x, final_y, 0, 0, [], Shrine.create_default())
                 else:
-                    building = Objects(final_x, final_y, 0, id, [], None)
+                    building = Objects(final_x, final_y, 0, 0, [], None)
 
-                building.template_idx = id
                 # print(f"Lv3 ({final_x, final_y})")
                 buildings_templates.append(template)
                 buildings.append(building)
 
                 self.mark_object_tiles_as_occupied(template, final_x, final_y, 4)
 
-        self.objectTemplates.extend(buildings_templates)
-        self.objects.extend(buildings)
+        for building_template, building in zip(buildings_templates, buildings):
+            self.add_object(building_template, building)
 
-        self.id = id
         self.absod_id = absod_id
 
 
-    def find_furtherest_point(self):
-        points = []
-
-        for x in range(self.map_format):
-            for y in range(self.map_format):
-                if self.occupied_tiles[x][y]:
-                    points.append((x, y))
-
-        dirs = [(1,0), (-1,0), (0,1), (0,-1)]
-        dist = [[-1] * self.map_format for _ in range(self.map_format)]
-
-        queue = deque()
-
-        # wrzucamy wszystkie punkty startowe do BFS
-        for x, y in points:
-            dist[x][y] = 0
-            queue.append((x, y))
-            # print((x, y))
-
-        # BFS wieloźródłowy
-        while queue:
-            x, y = queue.popleft()
-            for dx, dy in dirs:
-                nx, ny = x + dx, y + dy
-                if 5 <= nx < self.map_format - 5 and 5 <= ny < self.map_format - 5 and dist[nx][ny] == -1:
-                    dist[nx][ny] = dist[x][y] + 1
-                    queue.append((nx, ny))
-
-        # znajdujemy punkt o maksymalnej minimalnej odległości
-        best_x = best_y = -1
-        best_dist = -1
+    def occupancy_distance_layers(self) -> list[list[int]]:
+        """
+        Transformata odleglosci (Chebyshev) od zajetych kafelkow: warstwa d to bitsety wierszy kafelkow
+        w odleglosci dokladnie d od najblizszego zajetego kafelka. Kolejne warstwy powstaja przez dylatacje
+        bitsetow kwadratem 3x3. Wynik jest zapamietywany do nastepnej zmiany zajetosci.
+        """
+        if self._distance_layers is not None and self._distance_layers[0] == self.occupancy_version:
+            return self._distance_layers[1]
+
+        size = self.map_format
+        full_row = (1 << size) - 1
+        reached = list(self.occupied_rows)
+        layers = [list(reached)] if any(reached) else []
+        while layers:
+            vertical = [reached[y] | (reached[y - 1] if y > 0 else 0) | (reached[y + 1] if y < size - 1 else 0)
+                        for y in range(size)]
+            layer = [((row | (row << 1) | (row >> 1)) & full_row) & ~reached[y] for y, row in enumerate(vertical)]
+            if not any(layer):
+                break
+            layers.append(layer)
+            reached = [reached[y] | layer[y] for y in range(size)]
 
-        for x in range(self.map_format):
-            for y in range(self.map_format):
-                if dist[x][y] > best_dist:
-                    best_dist = dist[x][y]
-                    best_x = x
-                    best_y = y
+        self._distance_layers = (self.occupancy_version, layers)
+        return layers
 
-        # for x in range(self.map_format):
-        #     print(dist[x])
+    def find_furthest_points(self, count: int = 1, border: int = 5) -> list[tuple[int, int, int]]:
+        """
+        Zwraca do `count` punktow (x, y, odleglosc) najdalszych od zajetych kafelkow, poza ramka
+        o szerokosci `border`, od najdalszego (przy rownej odleglosci wierszami).
+        """
+        size = self.map_format
+        if size - 2 * border <= 0:
+            return []
+        inner_row = ((1 << (size - 2 * border)) - 1) << border
 
-        return best_y, best_x, best_dist
+        points = []
+        layers = self.occupancy_distance_layers()
+        for distance in range(len(layers) - 1, -1, -1):
+            layer = layers[distance]
+            for y in range(border, size - border):
+                row = layer[y] & inner_row
+                while row and len(points) < count:
+                    x = (row & -row).bit_length() - 1
+                    points.append((x, y, distance))
+                    row &= row - 1
+            if len(points) >= count:
+                break
+        return points
 
     def generate_win_lose_condition(self):
         if self.victory_condition_params.victory_condition == VictoryConditions.ACQUIRE_ARTIFACT or self.victory_condition_params.victory_condition == VictoryConditions.TRANSPORT_ARTIFACT:
-            pos_x, pos_y, dist = self.find_furtherest_point()
+            furthest_points = self.find_furthest_points(FURTHEST_POINT_CANDIDATES)
+            pos_x, pos_y, dist = furthest_points[0] if furthest_points else (-1, -1, -1)
             print(f"win condition {pos_x}, {pos_y}, {dist}")
             r: int = ar_converterTypeToNum(self.victory_condition_params.artifact_type)
             if r <= 9:
@@ -982,11 +1109,17 @@ class ObjectTemplateHelper:
             template = ObjectsTemplate(s, [255, 255, 255, 255, 255, 127], [0, 0, 0, 0, 0, 128],
                                        [255, 1], [255, 0], 5, r, 4, 0)
 
-            final_x, final_y = self.find_alternative_position(template, int(pos_x), int(pos_y), max_offset=100)
+            # najpierw blisko kolejnych najdalszych punktow, szerokie szukanie tylko gdy zaden nie pasuje
+            final_x, final_y = None, None
+            for pos_x, pos_y, _ in furthest_points:
+                final_x, final_y = self.find_alternative_position(template, pos_x, pos_y)
+                if final_x is not None:
+                    break
+            if final_x is None and furthest_points:
+                pos_x, pos_y, _ = furthest_points[0]
+                final_x, final_y = self.find_alternative_position(template, pos_x, pos_y, max_offset=100)
 
             if final_x is not None and final_y is not None:
-                self.id = self.id + 1
-
                 self.mark_object_tiles_as_occupied(template, final_x, final_y, 2)
                 artifact: str = self.victory_condition_params.artifact_type.value
 
@@ -1017,8 +1150,7 @@ class ObjectTemplateHelper:
                         creatures=creatures)
 
                 # print(f"Artifact type: {artifact} position ({pos_x}, {pos_y}) {type % 14} {cr_converterNumToType(CreatureNum(type))}")
-                self.objectTemplates.append(template)
-                self.objects.append(Objects(final_x, final_y, 0, self.id, [], Artifact(guardian)))
+                self.add_object(template, Objects(final_x, final_y, 0, 0, [], Artifact(guardian)))
 
         elif self.victory_condition_params.victory_condition == VictoryConditions.ACCUMULATE_CREATURES or self.victory_condition_params.victory_condition == VictoryConditions.ACCUMULATE_RESOURCES:
             special_buildings_templates = read_object_templates_from_json("special_buildings_level3")
@@ -1042,21 +1174,18 @@ class ObjectTemplateHelper:
                     if tile_type_idx >= 8:
                         continue
 
-                    self.id = self.id + 1
-
                     if self.victory_condition_params.victory_condition == VictoryConditions.ACCUMULATE_CREATURES:
                         creature = cr_converterTypeToNum(self.victory_condition_params.creature_type)
                         template: ObjectsTemplate = self.dwellings[int(creature / 2)]
-                        object: Objects = Objects(final_x, final_y, 0, self.id, [],
+                        object: Objects = Objects(final_x, final_y, 0, 0, [],
                                                  TrivialOwnedObject.create_default())
 
                     else:
                         template: ObjectsTemplate = self.mines[tile_type_idx * 7 + self.victory_condition_params.resource_type.value]
-                        object: Objects = Objects(final_x, final_y, 0, self.id, [],
+                        object: Objects = Objects(final_x, final_y, 0, 0, [],
                                                   TrivialOwnedObject.create_default())
 
-                    self.objectTemplates.append(template)
-                    self.objects.append(object)
+                    self.add_object(template, object)
                     self.mark_object_tiles_as_occupied(template, final_x, final_y, 3)
 
 
@@ -1132,60 +1261,77 @@ class ObjectTemplateHelper:
                         for y in range(size):
                             if not tab[x][y] == '.':
                                 if tab[x][y] == 'o':
-                                    self.id = self.id + 1
-                                    object = Objects(final_x - size + x, final_y - size + y, 0, self.id, [], None)
+                                    object = Objects(final_x - size + x, final_y - size + y, 0, 0, [], None)
                                     template: ObjectsTemplate = ObjectsTemplate("AvXOblG.def", [255, 255, 255, 255, 255, 127], [0, 0, 0, 0, 0, 128], [255, 1], [1, 0], 57, 0 , 0, 0)
                                 # else: Jeśli dodane zostranie generowanie terenu, cofnij wcięcie niżej
                                 #     self.absod_id = self.absod_id + 1
                                 #     monster = Monster(self.absod_id, 82, Disposition.HOSTILE, None, 0, 0)
-                                #     object = Objects(final_x - size + x, final_y - size + y, 0, self.id, [], monster)
+                                #     object = Objects(final_x - size + x, final_y - size + y, 0, 0, [], monster)
                                 #     template: ObjectsTemplate = ObjectsTemplate("AVWgobx0.def", [255, 255, 255, 255, 255, 127], [0, 0, 0, 0, 0, 128], [255, 1], [1, 0], 54, 85, 2 ,0)
 
 
-                                    self.objectTemplates.append(template)
-                                    self.objects.append(object)
+                                    self.add_object(template, object)
                                     self.mark_object_tiles_as_occupied(template, final_x - size + x, final_y - size + y)
 
-    def bfs(self):
-        visited = [[False for _ in range(self.map_format)] for _ in range(self.map_format)]
-        queue = []
-        water = set()
-        shore = set()
+    def analyze_water(self) -> WaterAnalysis:
+        """
+        Etykietuje wszystkie zbiorniki wody jednym przejsciem po mapie (BFS w 8 kierunkach od kazdego
+        nieodwiedzonego kafelka wody) i wyznacza gleboka wode oraz brzeg. Teren sie nie zmienia,
+        wiec wynik jest liczony raz i zapamietywany.
+        """
+        if self._water_analysis is not None:
+            return self._water_analysis
+
+        size = self.map_format
+        water_value = TerrainType.WATER.value
+        is_water = [tile.terrain_type == water_value for tile in self.tiles]
+        labels = [[-1] * size for _ in range(size)]
+        body_areas = []
+        deep_water_rows = [0] * size
+        shore_rows = [0] * size
         directions = [(-1, -1), (0, -1), (1, -1),
                       (-1, 0), (1, 0),
                       (-1, 1), (0, 1), (1, 1)]
 
-        for y in range(len(visited)):
-            for x in range(len(visited)):
-                if self.tiles[y * self.map_format + x].terrain_type == TerrainType.WATER.value:
-                    queue.append((x, y))
-                    break
-            if len(queue) > 0:
-                break
-
-        while queue:
-            x, y = queue.pop(0)
-
-            if not visited[x][y]:
-                visited[x][y] = True
+        for start_y in range(size):
+            for start_x in range(size):
+                if not is_water[start_y * size + start_x] or labels[start_y][start_x] != -1:
+                    continue
 
-                near_shore = False
-                for m, n in directions:
-                    if 0 <= x + m < self.map_format and 0 <= y + n < self.map_format:
-                        if self.tiles[(y + n) * self.map_format + (x + m)].terrain_type != TerrainType.WATER.value:
-                            shore.add((x + m, y + n))
+                body = len(body_areas)
+                area = 0
+                labels[start_y][start_x] = body
+                queue = deque([(start_x, start_y)])
+                while queue:
+                    x, y = queue.popleft()
+                    area += 1
+                    near_shore = False
+                    for m, n in directions:
+                        nx, ny = x + m, y + n
+                        if not (0 <= nx < size and 0 <= ny < size):
+                            continue
+                        if not is_water[ny * size + nx]:
+                            shore_rows[ny] |= 1 << nx
                             near_shore = True
-                        else:
-                            queue.append((x + m, y + n))
+                        elif labels[ny][nx] == -1:
+                            labels[ny][nx] = body
+                            queue.append((nx, ny))
+                    if not near_shore:
+                        deep_water_rows[y] |= 1 << x
+                body_areas.append(area)
 
-                if not near_shore:
-                    water.add((x, y))
+        def row_tiles(rows: list[int]) -> list[tuple[int, int]]:
+            return [(x, y) for y, row in enumerate(rows) for x in range(size) if row >> x & 1]
 
-        return list(water), list(shore)
+        self._water_analysis = WaterAnalysis(labels, body_areas, row_tiles(deep_water_rows), row_tiles(shore_rows),
+                                             deep_water_rows, shore_rows)
+        return self._water_analysis
 
 
     def generate_water_object(self):
-        self.water, shore = self.bfs()
+        water_analysis = self.analyze_water()
+        self.water = list(water_analysis.deep_water)
+        self.water_rows = list(water_analysis.deep_water_rows)
 
         chosen = sample(self.water, k=int(len(self.water)/40))
 
@@ -1215,15 +1361,12 @@ class ObjectTemplateHelper:
 
             final_x, final_y = self.find_alternative_position(template, x, y, max_offset=5, validation_function=self.validate_placement_for_water_objects)
             if final_x is not None and final_y is not None:
-                self.id = self.id + 1
-
                 if r != 31:
-                    object = Objects(final_x, final_y, 0, self.id, [], None)
+                    object = Objects(final_x, final_y, 0, 0, [], None)
                 else:
-                    object = Objects(final_x, final_y, 0, self.id, [], Sign.create_default())
+                    object = Objects(final_x, final_y, 0, 0, [], Sign.create_default())
 
-                self.objectTemplates.append(template)
-                self.objects.append(object)
+                self.add_object(template, object)
 
 
                 self.mark_object_tiles_as_occupied(template, final_x, final_y, 5)
@@ -1238,36 +1381,51 @@ class ObjectTemplateHelper:
         self.generate_monsters()
 
     def find_place_one_by_one(self):
-        test_template = ObjectsTemplate.create_default()
-        test_template.passability = [255, 255, 255, 255, 255, 254]
-        for _ in range(100):
-            x, y = randint(0, self.map_format), randint(0, self.map_format)
-            final_x, final_y = self.find_alternative_position(test_template, x, y, max_offset=5, validation_function=self.validate_placement_for_landscape)
-            if final_x is not None and final_y is not None:
-                return final_x, final_y
-        return None, None
+        """
+        Losuje (jednostajnie) pozycje, na ktorej validate_placement_for_landscape przyjmuje szablon testowy
+        ONE_BY_ONE_TEMPLATE. Zwraca (None, None), jesli takiej pozycji nie ma.
+        """
+        position = self.free_tile_sampler().sample()
+        if position is None:
+            return None, None
+        return position
+
+    def free_tile_sampler(self) -> FreeTileSampler:
+        """
+        Pula pozycji find_place_one_by_one (wiersze free_anchor_row_for_landscape szablonu testowego).
+        mark_object_tiles_as_occupied i mark_tiles przeliczaja w niej tylko zmienione wiersze, refresh_occupancy_rows ja uniewaznia.
+        """
+        if self._free_tile_sampler is None:
+            self._free_tile_sampler = FreeTileSampler(
+                [self.free_anchor_row_for_landscape(ONE_BY_ONE_TEMPLATE, y) for y in range(self.map_format)])
+        return self._free_tile_sampler
+
+    def _update_free_tile_sampler(self, tile_rows: set[int]):
+        # pozycje z wiersza y zaleza od wierszy y + dy szablonu testowego
+        footprint = get_template_footprint(ONE_BY_ONE_TEMPLATE)
+        for y in {tile_y - dy for tile_y in tile_rows for dy, _, _ in footprint.rows}:
+            if 0 <= y < self.map_format:
+                self._free_tile_sampler.update_row(y, self.free_anchor_row_for_landscape(ONE_BY_ONE_TEMPLATE, y))
 
 
     def generate_artifacts(self):
         for _ in range(0, 1):
             final_x, final_y = self.find_place_one_by_one()
             if final_x is not None and final_y is not None:
-                self.id += 1
                 ch = 60
                 r = randint(0, len(self.artifacts) - 1 + ch)
                 if r == 0:
-                    object = Objects(final_x, final_y, 0, self.id, [], SpellScroll.create_default())
+                    object = Objects(final_x, final_y, 0, 0, [], SpellScroll.create_default())
                 elif len(self.artifacts) - 1 <= r:
-                    object = Objects(final_x, final_y, 0, self.id, [], self.create_pandoras_box())
+                    object = Objects(final_x, final_y, 0, 0, [], self.create_pandoras_box())
                     r = len(self.artifacts) - 1
                 else:
-                    object = Objects(final_x, final_y, 0, self.id, [], {})
+                    object = Objects(final_x, final_y, 0, 0, [], {})
                 objectTemplate = self.artifacts[r]
 
                 self.mark_object_tiles_as_occupied(objectTemplate, final_x, final_y, 0)
 
-                self.objects.append(object)
-                self.objectTemplates.append(objectTemplate)
+                self.add_object(objectTemplate, object)
 
 
     def create_pandoras_box(self):
@@ -1315,18 +1473,16 @@ class ObjectTemplateHelper:
         for _ in range(0, randint(self.limits[8][0], self.limits[8][1])):
             final_x, final_y = self.find_place_one_by_one()
             if final_x is not None and final_y is not None:
-                self.id += 1
                 r = randint(0, len(self.resources) - 1)
                 if r == 8:
-                    object = Objects(final_x, final_y, 0, self.id, [], None)
+                    object = Objects(final_x, final_y, 0, 0, [], None)
                 else:
-                    object = Objects(final_x, final_y, 0, self.id, [], Resource.create_default())
+                    object = Objects(final_x, final_y, 0, 0, [], Resource.create_default())
                 objectTemplate = self.resources[r]
 
                 self.mark_object_tiles_as_occupied(objectTemplate, final_x, final_y, 0)
 
-                self.objects.append(object)
-                self.objectTemplates.append(objectTemplate)
+                self.add_object(objectTemplate, object)
 
 
     def generate_monsters(self):
@@ -1336,17 +1492,15 @@ class ObjectTemplateHelper:
     def generate_monster(self):
         final_x, final_y = self.find_place_one_by_one()
         if final_x is not None and final_y is not None:
-            self.id += 1
             self.absod_id += 1
             r = randint(0, len(self.random_monsters) - 1)
-            object = Objects(final_x, final_y, 0, self.id, [], Monster.create_default())
+            object = Objects(final_x, final_y, 0, 0, [], Monster.create_default())
             object.properties.absod_id = self.absod_id
             objectTemplate = self.random_monsters[r]
 
             self.mark_object_tiles_as_occupied(objectTemplate, final_x, final_y, 0)
 
-            self.objects.append(object)
-            self.objectTemplates.append(objectTemplate)
+            self.add_object(objectTemplate, object)
             self.monsters_generated.append((final_x, final_y, 0))
             self.monsters_generated_obj.append(object)
 
@@ -1406,13 +1560,33 @@ class ObjectTemplateHelper:
         return res
 
 
-    def count_each_terrain_free_tiles(self):
-        counters = [0 for _ in range(10)]
+    def terrain_rows(self) -> list[list[int]]:
+        """
+        Bitsety wierszy kafelkow kazdego typu terenu (indeks to TerrainType.value),
+        liczone jednym przejsciem po kafelkach przy pierwszym uzyciu.
+        """
+        if self._terrain_rows is None:
+            size = self.map_format
+            rows = [[0] * size for _ in TerrainType]
+            for index, tile in enumerate(self.tiles):
+                rows[tile.terrain_type][index // size] |= 1 << (index % size)
+            self._terrain_rows = rows
+        return self._terrain_rows
+
+    def free_terrain_rows(self, terrain_type: TerrainType | None) -> list[int]:
+        """
+        Bitsety wierszy wolnych kafelkow danego terenu (None - dowolnego): nie zajetych
+        w occupied_tiles_excluding_landscape i nie zarezerwowanych.
+        """
+        if terrain_type is None:
+            terrain = [(1 << self.map_format) - 1] * self.map_format
+        else:
+            terrain = self.terrain_rows()[terrain_type.value]
+        return [row & ~self._blocked_row_for_landscape(y) for y, row in enumerate(terrain)]
 
-        for i in range(self.map_format):
-            for j in range(self.map_format):
-                if not self.occupied_tiles_excluding_landscape[j][i]:
-                    counters[self.tiles[i * self.map_format + j].terrain_type] += 1
+    def count_each_terrain_free_tiles(self):
+        counters = [sum((row & ~occupied).bit_count() for row, occupied in zip(rows, self.occupied_rows_excluding_landscape))
+                    for rows in self.terrain_rows()]
 
         print(f"counters: {[counter/(self.map_format ** 2) for counter in counters]}")
         return [counter/(self.map_format ** 2) for counter in counters]
@@ -1438,7 +1612,7 @@ class ObjectTemplateHelper:
 
 
     def generate_forests_on_region(self, region_tiles: list, tree_templates: list = None,
-                                  density: float = 0.3):
+                                  density: float = 0.3, sampling: str = "random"):
         """
         Generuje las na podanym regionie (np. polu diagramu Voronoi).
 
@@ -1446,6 +1620,7 @@ class ObjectTemplateHelper:
             region_tiles: lista (x, y) kafelków z regionu
             tree_templates: opcjonalna lista szablonów drzew
             density: gęstość drzew (0.0-1.0)
+            sampling: sposób losowania pozycji drzew, jeden z FOREST_SAMPLING_MODES
 
         Returns:
             Liczba umieszczonych drzew
@@ -1460,20 +1635,21 @@ class ObjectTemplateHelper:
             return 0
 
         tree_types = create_default_tree_types(tree_templates)
-        placer = ForestPlacer(self.map_format, self.map_format, self.occupied_tiles)
+        # placer zaznacza drzewa na swojej kopii mapy, w mapach helpera zapisuje je mark_tiles
+        placer = ForestPlacer(self.map_format, self.map_format, [list(row) for row in self.occupied_tiles])
 
         trees_placed = placer.generate_forest_on_region(
             tree_types,
             region_tiles,
-            density=density
+            density=density,
+            sampling=sampling
         )
 
         for tree_x, tree_y, tree_template in trees_placed:
-            self.id += 1
-            tree_object = Objects(tree_x, tree_y, 0, self.id, [], TrivialOwnedObject.create_default())
+            tree_object = Objects(tree_x, tree_y, 0, 0, [], TrivialOwnedObject.create_default())
 
-            self.objects.append(tree_object)
-            self.objectTemplates.append(tree_template)
+            self.add_object(tree_template, tree_object)
+            self.mark_tiles(placer.object_tiles(tree_template, tree_x, tree_y), for_landscape=False)
 
         print(f"Umieszczono {len(trees_placed)} drzew na regionie")
         return len(trees_placed)
@@ -1498,6 +1674,12 @@ class ObjectTemplateHelper:
                 continue
         return []
 
+    @staticmethod
+    def terrain_of_key(terrain_key: str) -> TerrainType | None:
+        """Typ terenu z nazwy pliku obiektow ('grass_obj', 'grass_obj.json'), None jesli nazwa nie jest terenem."""
+        name = terrain_key.lower().replace('.json', '').replace('_obj', '')
+        return TerrainType.__members__.get(name.upper())
+
     def place_objects_from_terrain_on_region(self, region_tiles: list, terrain_key: str, count: int = 1,
                                              max_offset: int = 5) -> int:
         """
@@ -1511,27 +1693,10 @@ class ObjectTemplateHelper:
         if not templates:
             return 0
 
-        # Ustal enum terenu na podstawie klucza
-        name = terrain_key.lower().replace('.json', '').replace('_obj', '')
-        try:
-            terrain_enum = TerrainType[name.upper()]
-        except Exception:
-            terrain_enum = None
-
         # Filtruj kafelki regionu: zgodne z terenem i nie zajęte w occupied_tiles_excluding_landscape
-        candidates = []
-        for tx, ty in region_tiles:
-            if not (0 <= tx < self.map_format and 0 <= ty < self.map_format):
-                continue
-            tile_idx = ty * self.map_format + tx
-            tile_enum = TerrainType(self.tiles[tile_idx].terrain_type)
-            if terrain_enum is not None and tile_enum != terrain_enum:
-                continue
-            if self.occupied_tiles_excluding_landscape[ty][tx]:
-                continue
-            if (tx, ty) in self.reserved_tiles:
-                continue
-            candidates.append((tx, ty))
+        free_rows = self.free_terrain_rows(self.terrain_of_key(terrain_key))
+        candidates = [(tx, ty) for tx, ty in region_tiles
+                      if 0 <= tx < self.map_format and 0 <= ty < self.map_format and free_rows[ty] >> tx & 1]
 
         if not candidates:
             return 0
@@ -1543,10 +1708,8 @@ class ObjectTemplateHelper:
             final_x, final_y = self.find_alternative_position(template, px, py, max_offset=max_offset,
                                                               validation_function=self.validate_placement_for_landscape)
             if final_x is not None and final_y is not None:
-                self.id += 1
                 self.absod_id += 1
-                self.objectTemplates.append(template)
-                self.objects.append(Objects(final_x, final_y, 0, self.id, [], None))
+                self.add_object(template, Objects(final_x, final_y, 0, 0, [], None))
                 # Zaznaczamy kafelki obiektu jako zajete wg reguły excluding_landscape
                 self.mark_object_tiles_as_occupied(template, final_x, final_y, 0)
                 placed += 1
@@ -1563,26 +1726,9 @@ class ObjectTemplateHelper:
         if not templates:
             return 0
 
-        # Spróbuj znaleźć kandydatów na całej mapie
-        candidates = []
-        for y in range(self.map_format):
-            for x in range(self.map_format):
-                if self.occupied_tiles_excluding_landscape[y][x]:
-                    continue
-                if (x, y) in self.reserved_tiles:
-                    continue
-                # opcjonalne dopasowanie po nazwie terenu
-                name = terrain_key.lower().replace('.json', '').replace('_obj', '')
-                try:
-                    terrain_enum = TerrainType[name.upper()]
-                except Exception:
-                    terrain_enum = None
-
-                tile_enum = TerrainType(self.tiles[y * self.map_format + x].terrain_type)
-                if terrain_enum is not None and tile_enum != terrain_enum:
-                    continue
-
-                candidates.append((x, y))
+        # kandydaci na calej mapie, wierszami
+        candidates = [(x, y) for y, row in enumerate(self.free_terrain_rows(self.terrain_of_key(terrain_key)))
+                      for x in range(row.bit_length()) if row >> x & 1]
 
         if not candidates:
             return 0
@@ -1593,10 +1739,8 @@ class ObjectTemplateHelper:
             final_x, final_y = self.find_alternative_position(template, px, py, max_offset=max_offset,
                                                               validation_function=self.validate_placement_for_landscape)
             if final_x is not None and final_y is not None:
-                self.id += 1
                 self.absod_id += 1
-                self.objectTemplates.append(template)
-                self.objects.append(Objects(final_x, final_y, 0, self.id, [], None))
+                self.add_object(template, Objects(final_x, final_y, 0, 0, [], None))
                 self.mark_object_tiles_as_occupied(template, final_x, final_y, 0)
                 placed += 1
 
@@ -0,0 +1,127 @@
+from classes.ObjectsTemplate import ObjectsTemplate
+
+# An object template covers up to 8x6 tiles. For an object placed at (x, y) (its lower right tile),
+# bit (7 - col) of passability[row] and actionability[row] describes the tile (x - col, y - 5 + row):
+# a cleared passability bit blocks the tile, a set actionability bit makes it actionable.
+# Footprints decode those bytes once per template. Their row masks use the bit order of occupancy
+# row bitsets (bit i of a row is the tile with x == i), so place_row_mask(mask, x) puts them on the map.
+
+TEMPLATE_ROWS = 6
+TEMPLATE_COLS = 8
+
+
+class TemplateFootprint:
+    """
+    Tiles covered (blocked or actionable) by an object template.
+
+    Attributes:
+        tiles: (dx, dy, actionable) offsets from the object position, in the order the
+            template bytes are read (row by row, column 0 first)
+        rows: (dy, covered_mask, actionable_mask) of every row covering at least one tile
+        min_dx, max_dx, min_dy, max_dy: bounds of the covered offsets (all 0 if nothing is covered)
+    """
+    __slots__ = ("tiles", "rows", "min_dx", "max_dx", "min_dy", "max_dy")
+
+    def __init__(self, passability: list[int], actionability: list[int]) -> None:
+        tiles = []
+        rows = []
+        for row in range(TEMPLATE_ROWS):
+            covered_mask = (~passability[row] | actionability[row]) & 0xFF
+            if not covered_mask:
+                continue
+            rows.append((row - 5, covered_mask, actionability[row] & 0xFF))
+            for col in range(TEMPLATE_COLS):
+                bit = 1 << (7 - col)
+                if covered_mask & bit:
+                    tiles.append((-col, row - 5, bool(actionability[row] & bit)))
+
+        self.tiles = tuple(tiles)
+        self.rows = tuple(rows)
+        self.min_dx = min((dx for dx, _, _ in tiles), default=0)
+        self.max_dx = max((dx for dx, _, _ in tiles), default=0)
+        self.min_dy = min((dy for _, dy, _ in tiles), default=0)
+        self.max_dy = max((dy for _, dy, _ in tiles), default=0)
+
+    def fits(self, x: int, y: int, low: int, high: int) -> bool:
+        """Whether every covered tile of an object placed at (x, y) lies in low <= tile_x, tile_y < high."""
+        if not self.tiles:
+            return True
+        return (low <= x + self.min_dx and x + self.max_dx < high
+                and low <= y + self.min_dy and y + self.max_dy < high)
+
+
+_footprints: dict[tuple[tuple[int, ...], tuple[int, ...]], TemplateFootprint] = {}
+
+
+def get_template_footprint(template: ObjectsTemplate) -> TemplateFootprint:
+    """Footprint of a template, decoded once per distinct passability and actionability."""
+    key = (tuple(template.passability), tuple(template.actionability))
+    footprint = _footprints.get(key)
+    if footprint is None:
+        footprint = TemplateFootprint(template.passability, template.actionability)
+        _footprints[key] = footprint
+    return footprint
+
+
+def place_row_mask(mask: int, x: int) -> int:
+    """Move a footprint row mask onto an occupancy row for an object placed at column x."""
+    return mask << (x - 7) if x >= 7 else mask >> (7 - x)
+
+
+def grid_to_row_bits(grid: list[list[bool]]) -> list[int]:
+    """Occupancy row bitsets of a [y][x] bool grid."""
+    return [sum(1 << x for x, cell in enumerate(row) if cell) for row in grid]
+
+
+def tiles_to_row_bits(tiles, size: int) -> list[int]:
+    """Occupancy row bitsets of a collection of (x, y) tiles, tiles outside of the map are skipped."""
+    rows = [0] * size
+    for x, y in tiles:
+        if 0 <= x < size and 0 <= y < size:
+            rows[y] |= 1 << x
+    return rows
+
+
+def colliding_anchors(row_bits: int, mask: int) -> int:
+    """Columns x at which a footprint row mask, placed with place_row_mask, would overlap row_bits."""
+    anchors = 0
+    for bit in range(TEMPLATE_COLS):
+        if mask >> bit & 1:
+            anchors |= row_bits << (7 - bit)
+    return anchors
+
+
+def nearest_bit_distance(row_bits: int, x: int) -> int:
+    """Distance from column x to the nearest set bit of a non-empty row bitset."""
+    distances = []
+    right = row_bits >> x if x >= 0 else row_bits << -x
+    if right:
+        distances.append((right & -right).bit_length() - 1)
+    left = row_bits & ((1 << (x + 1)) - 1) if x >= 0 else 0
+    if left:
+        distances.append(x - (left.bit_length() - 1))
+    return min(distances)
+
+
+def erode_row_bits(rows: list[int], radius: int) -> list[int]:
+    """
+    Morphological erosion of row bitsets with a (2 * radius + 1) square: a bit stays set only if every
+    bit within radius of it (in both directions) is set. Tiles outside of the rows count as unset.
+    """
+    horizontal = []
+    for row in rows:
+        eroded = row
+        for shift in range(1, radius + 1):
+            eroded &= (row >> shift) & (row << shift)
+        horizontal.append(eroded)
+
+    height = len(rows)
+    eroded_rows = []
+    for y in range(height):
+        eroded = 0 if y < radius or y + radius >= height else horizontal[y]
+        for dy in range(-radius, radius + 1):
+            if not eroded:
+                break
+            eroded &= horizontal[y + dy]
+        eroded_rows.append(eroded)
+    return eroded_rows
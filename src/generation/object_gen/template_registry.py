@@ -0,0 +1,34 @@
+from classes.ObjectsTemplate import ObjectsTemplate
+
+
+def template_key(template: ObjectsTemplate) -> tuple:
+    """Hashable value of a template, equal for templates serialized to the same record."""
+    return tuple(tuple(value) if isinstance(value, list) else value for value in template.to_dict().values())
+
+
+class TemplateRegistry:
+    """
+    The objects_templates table of a map, with templates interned by value.
+
+    Adding a template equal to one already in the table returns the index of the one in the table,
+    so objects placed from the same template share one record. Indices never change once handed out.
+    """
+    def __init__(self) -> None:
+        self.templates: list[ObjectsTemplate] = []
+        self._indices: dict[tuple, int] = {}
+
+    def add(self, template: ObjectsTemplate) -> int:
+        """Index of the template in the table, added to its end if no equal template is there yet."""
+        key = template_key(template)
+        index = self._indices.get(key)
+        if index is None:
+            index = len(self.templates)
+            self.templates.append(template)
+            self._indices[key] = index
+        return index
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def __getitem__(self, index: int) -> ObjectsTemplate:
+        return self.templates[index]
@@ -1,4 +1,5 @@
-from typing import List, Tuple, Set
+from typing import List, Tuple, Set, Dict, Optional
+from collections import Counter
 import random
 
 from classes.tile.Tile import TerrainType
@@ -12,6 +13,11 @@ class VoronoiRegion:
         self.neighbors: Set["VoronoiRegion"] = set()
         self.iteration = 0
 
+    def __hash__(self):
+        # regions are compared by identity, but hashed by their seed, so that iterating over sets of regions
+        # does not depend on memory addresses and a random seed always gives the same map
+        return hash((self.seed_x, self.seed_y))
+
     def __str__(self):
         return (
             f"VoronoiRegion(seed: ({self.seed_x}, {self.seed_y}), "
@@ -19,3 +25,175 @@ class VoronoiRegion:
             f"tiles: {len(self.tiles)}, "
             f"neighbors: {len(self.neighbors)})"
         )
+
+
+def label_nearest_seeds(width: int, height: int, seeds: List[Tuple[int, int]],
+                        labels: Optional[List[int]] = None) -> List[int]:
+    """
+    Assign every tile of a width x height grid to its nearest seed (squared Euclidean distance).
+
+    Works row by row on the lower envelope of the seed distance parabolas, so the cost is
+    O(height * (seeds + width)) instead of O(height * width * seeds).
+    Ties are resolved towards the lower seed index, exactly like min() over the seed list.
+
+    Args:
+        width, height: grid dimensions
+        seeds: list of seed positions (x, y)
+        labels: optional buffer of width * height ints to fill in place
+
+    Returns:
+        List[int]: flat, row-major list of seed indices (labels[y * width + x])
+    """
+    if labels is None:
+        labels = [0] * (width * height)
+    if not seeds:
+        return labels
+
+    # seeds sharing a column compete only on their vertical distance
+    columns: Dict[int, List[Tuple[int, int]]] = {}
+    for idx, (sx, sy) in enumerate(seeds):
+        columns.setdefault(sx, []).append((sy, idx))
+    column_xs = sorted(columns)
+
+    for y in range(height):
+        # closest seed of every column for this row: (column x, squared dy, seed index)
+        candidates = []
+        for sx in column_xs:
+            dy2, idx = min(((sy - y) ** 2, idx) for sy, idx in columns[sx])
+            candidates.append((sx, dy2, idx))
+
+        # lower envelope of parabolas (x - sx)^2 + dy2, boundaries kept as exact fractions
+        envelope = [0]
+        bound_num = [0]
+        bound_den = [1]
+        for q in range(1, len(candidates)):
+            sq, cq, _ = candidates[q]
+            fq = cq + sq * sq
+            while True:
+                sp, cp, _ = candidates[envelope[-1]]
+                num = fq - (cp + sp * sp)
+                den = 2 * (sq - sp)
+                if len(envelope) > 1 and num * bound_den[-1] <= bound_num[-1] * den:
+                    envelope.pop()
+                    bound_num.pop()
+                    bound_den.pop()
+                    continue
+                break
+            envelope.append(q)
+            bound_num.append(num)
+            bound_den.append(den)
+
+        k = 0
+        last = len(envelope) - 1
+        row_start = y * width
+        for x in range(width):
+            while k < last and bound_num[k + 1] < x * bound_den[k + 1]:
+                k += 1
+            if k < last and bound_num[k + 1] == x * bound_den[k + 1]:
+                # tile lies exactly on a border between two parabolas - settle the tie by index
+                labels[row_start + x] = min(((x - s) ** 2 + c, idx) for s, c, idx in candidates)[1]
+            else:
+                labels[row_start + x] = candidates[envelope[k]][2]
+
+    return labels
+
+
+def label_neighbor_pairs(labels: List[int], width: int, height: int) -> Set[Tuple[int, int]]:
+    """
+    Find all pairs of different labels that touch along a tile edge (4-neighborhood).
+
+    Compares the label array with copies of itself shifted by one column and by one row.
+
+    Returns:
+        Set of (label_a, label_b) pairs, each pair reported in both directions
+    """
+    pairs: Set[Tuple[int, int]] = set()
+    for y in range(height):
+        row = labels[y * width:(y + 1) * width]
+        pairs.update(zip(row, row[1:]))
+    pairs.update(zip(labels, labels[width:]))
+
+    pairs = {(a, b) for a, b in pairs if a != b}
+    pairs.update([(b, a) for a, b in pairs])
+    return pairs
+
+
+class RegionAdjacencyGraph:
+    """
+    Adjacency graph of labeled regions with the length of every shared border.
+
+    Built once from a label raster by counting label changes between horizontally and
+    vertically neighboring tiles. Negative labels (reserved tiles) belong to no region.
+    """
+    def __init__(self, labels: List[int], width: int, height: int):
+        border_counts: Counter = Counter()
+        for y in range(height):
+            row = labels[y * width:(y + 1) * width]
+            border_counts.update(zip(row, row[1:]))
+        border_counts.update(zip(labels, labels[width:]))
+
+        # label -> {neighbor label: number of shared tile edges}
+        self.borders: Dict[int, Dict[int, int]] = {}
+        for (a, b), length in border_counts.items():
+            if a == b or a < 0 or b < 0:
+                continue
+            self.borders.setdefault(a, {})
+            self.borders.setdefault(b, {})
+            self.borders[a][b] = self.borders[a].get(b, 0) + length
+            self.borders[b][a] = self.borders[b].get(a, 0) + length
+
+    def neighbors(self, label: int) -> Dict[int, int]:
+        """Return the neighbors of a region as {neighbor label: shared border length}."""
+        return self.borders.get(label, {})
+
+    def are_adjacent(self, a: int, b: int) -> bool:
+        return b in self.borders.get(a, {})
+
+    def border_length(self, a: int, b: int) -> int:
+        return self.borders.get(a, {}).get(b, 0)
+
+
+class NearestSeedLabeler:
+    """
+    Reusable nearest-seed labeling of a fixed grid that skips reserved tiles.
+
+    The reserved-tile mask, the tile coordinates and the label buffer are built once
+    and reused by every call to label(), so relabeling the grid for a new set of seeds
+    only pays for the envelope pass itself.
+    """
+    def __init__(self, width: int, height: int, reserved_tiles: Optional[Set[Tuple[int, int]]] = None):
+        self.width = width
+        self.height = height
+        # 1 = reserved tile, kept out of every region
+        self.reserved_mask = bytearray(width * height)
+        for x, y in reserved_tiles or ():
+            if 0 <= x < width and 0 <= y < height:
+                self.reserved_mask[y * width + x] = 1
+        self.reserved_indices: List[int] = [i for i, reserved in enumerate(self.reserved_mask) if reserved]
+        self.coords: List[Tuple[int, int]] = [(x, y) for y in range(height) for x in range(width)]
+        # label raster of the last labeling, -1 marks reserved tiles
+        self.labels: List[int] = [0] * (width * height)
+
+    def label(self, seeds: List[Tuple[int, int]]) -> List[int]:
+        """
+        Relabel the grid for the given seeds, reusing the internal buffer.
+
+        Returns:
+            List[int]: the label raster (seed index per tile, -1 for reserved tiles)
+        """
+        labels = label_nearest_seeds(self.width, self.height, seeds, self.labels)
+        for i in self.reserved_indices:
+            labels[i] = -1
+        return labels
+
+    def region_tiles(self, num_regions: int) -> List[List[Tuple[int, int]]]:
+        """
+        Split the last label raster into per-region tile lists (row-major order, reserved tiles skipped).
+        """
+        tiles: List[List[Tuple[int, int]]] = [[] for _ in range(num_regions)]
+        appenders = [t.append for t in tiles]
+        coords = self.coords
+        for i, label in enumerate(self.labels):
+            if label >= 0:
+                appenders[label](coords[i])
+        return tiles
@@ -1,12 +1,22 @@
 import random
 import heapq
+from collections import deque
 import math
+from array import array
 from math import sqrt
 from typing import List, Tuple, Optional
 
 from classes.tile.Tile import TerrainType, RoadType
 
 
+# "mst" - a varied A* path for every edge of the minimum spanning tree of the entry points
+# "steiner" - one shortest-path forest grown from all entry points at once (see get_steiner_paths)
+ROAD_NETWORK_MODES = ("mst", "steiner")
+
+# neighbor order of the breadth-first shipyard search
+SHIPYARD_SEARCH_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
 class RoadGenerator:
     """
     Encapsulates the empty-space / road mask generation.
@@ -19,135 +29,267 @@ class RoadGenerator:
         entry_points: List[Tuple[int,int]],
         occupied_tiles_excluding_landscape: List[List[bool]],
         occupied_tiles_excluding_actionable: List[List[bool]],
-        reserve_radius: int = 1
+        reserve_radius: int = 1,
+        noise_pool_size: int = 8,
+        noise_seed: Optional[int] = None,
+        network_mode: str = "mst"
     ) -> None:
+        if network_mode not in ROAD_NETWORK_MODES:
+            raise ValueError(f"Unknown road network mode: {network_mode} (expected one of {', '.join(ROAD_NETWORK_MODES)})")
+
         self.width = size
         self.height = size
         self.terrain_map = terrain_map
         self.entry_points = entry_points
-        self.occupied_tiles_excluding_landscape = occupied_tiles_excluding_landscape
+        # own copy, tiles occupied by the roads are listed in road_tiles for the owner of the map to mark
+        self.occupied_tiles_excluding_landscape = [list(row) for row in occupied_tiles_excluding_landscape]
         self.occupied_tiles_excluding_actionable = occupied_tiles_excluding_actionable
         self.reserve_radius = reserve_radius
+        self.network_mode = network_mode
+        # noise cost fields shared by all find_varied_path attempts, see _noise_fields
+        self.noise_pool_size = noise_pool_size
+        self.noise_seed = noise_seed
+        self.noise_fields: dict[float, List[array]] = {}
         self.restricted_terrain = {TerrainType.WATER, TerrainType.ROCK}
         
         # self.entry_points: List[Tuple[int,int]] = []
         # grid marking of road tiles (RoadType or None)
         self.paths: List[List[RoadType | None]] = [[None for _ in range(self.width)] for _ in range(self.height)]
+        # tiles newly occupied by roads, in the order they were laid
+        self.road_tiles: List[Tuple[int, int]] = []
         self.shipyard_positions: List[Tuple[int, int]] = []
 
+        # shipyard candidate mask and memoized search orders, built by _prepare_shipyard_search
+        self.shipyard_candidates: List[List[bool]] | None = None
+        self.shipyard_search_orders: dict[Tuple[int, int, int], List[Tuple[int, int]]] = {}
+
+        # search buffers of _a_star_with_costs, built by _prepare_search
+        self.search_stride = 0
+        self.walkable_mask: bytearray | None = None
+        self.g_score: List[float] = []
+        self.came_from: List[int] = []
+        self.closed = bytearray()
+        self.cell_x: List[int] = []
+        self.cell_y: List[int] = []
+
     def in_bounds(self, x: int, y: int) -> bool:
         return 0 <= x < self.width and 0 <= y < self.height
 
     def is_walkable_cell(self, x: int, y: int) -> bool:
         return self.in_bounds(x, y) and (not self.occupied_tiles_excluding_actionable[y][x])
     
-    def can_place_shipyard(self, center_x: int, center_y: int, path_tiles: set[Tuple[int, int]]) -> bool:
+    def has_shipyard_water_access(self, center_x: int, center_y: int) -> bool:
+        """Static part of can_place_shipyard: the position is inside the map border and next to water."""
         if not (1 <= center_x < self.width - 1 and 1 <= center_y < self.height - 1):
             return False
-        
-        for dx in [-1, 0, 1]:
-            x = center_x + dx
-            y = center_y
-            if (x, y) not in path_tiles and self.occupied_tiles_excluding_landscape[y][x]:
-                return False
-        
-        has_water_access = False
+
         for dx in [-1, 0, 1]:
             x = center_x + dx
             if self.in_bounds(x, center_y - 1):
                 if self.terrain_map[center_y - 1][x] == TerrainType.WATER:
-                    has_water_access = True
-                    break
+                    return True
             if self.in_bounds(x, center_y + 1):
                 if self.terrain_map[center_y + 1][x] == TerrainType.WATER:
-                    has_water_access = True
-                    break
-        
-        return has_water_access
-    
-    def find_shipyard_placement(self, reference_x: int, reference_y: int, path_tiles: set[Tuple[int, int]], max_search_radius: int = 10) -> Optional[Tuple[int, int]]:
-        visited = set()
-        queue = [(reference_x, reference_y, 0)]
-        visited.add((reference_x, reference_y))
-        
+                    return True
+        return False
+
+    def can_place_shipyard(self, center_x: int, center_y: int, path_tiles: set[Tuple[int, int]]) -> bool:
+        if self.shipyard_candidates is not None:
+            has_water_access = self.in_bounds(center_x, center_y) and self.shipyard_candidates[center_y][center_x]
+        else:
+            has_water_access = self.has_shipyard_water_access(center_x, center_y)
+        if not has_water_access:
+            return False
+
+        for dx in [-1, 0, 1]:
+            x = center_x + dx
+            y = center_y
+            if (x, y) not in path_tiles and self.occupied_tiles_excluding_landscape[y][x]:
+                return False
+        return True
+
+    def _prepare_shipyard_search(self) -> None:
+        """
+        Build the mask of shipyard candidates (positions with water access, see has_shipyard_water_access).
+        The terrain does not change while roads are laid, so only the occupancy is checked per search.
+        """
+        self.shipyard_candidates = [[self.has_shipyard_water_access(x, y) for x in range(self.width)]
+                                    for y in range(self.height)]
+        self.shipyard_search_orders = {}
+
+    def _shipyard_search_order(self, reference_x: int, reference_y: int, max_search_radius: int) -> List[Tuple[int, int]]:
+        """
+        Shipyard candidates around a reference tile, in the order of a breadth-first search (8 directions)
+        up to max_search_radius steps. Memoized per reference tile, as roads often meet water at the same shore.
+        """
+        key = (reference_x, reference_y, max_search_radius)
+        order = self.shipyard_search_orders.get(key)
+        if order is not None:
+            return order
+
+        width, height = self.width, self.height
+        candidates = self.shipyard_candidates
+        order = []
+        visited = {(reference_x, reference_y)}
+        queue = deque([(reference_x, reference_y, 0)])
         while queue:
-            x, y, dist = queue.pop(0)
-            
+            x, y, dist = queue.popleft()
             if dist > max_search_radius:
                 break
-            
-            if self.can_place_shipyard(x, y, path_tiles):
-                return (x, y)
-            
-            for dx, dy in [(-1,0), (1,0), (0,-1), (0,1), (-1,-1), (-1,1), (1,-1), (1,1)]:
+
+            if 0 <= x < width and 0 <= y < height and candidates[y][x]:
+                order.append((x, y))
+            if dist == max_search_radius:
+                continue
+
+            for dx, dy in SHIPYARD_SEARCH_DIRECTIONS:
                 nx, ny = x + dx, y + dy
-                if self.in_bounds(nx, ny) and (nx, ny) not in visited:
+                if 0 <= nx < width and 0 <= ny < height and (nx, ny) not in visited:
                     visited.add((nx, ny))
                     queue.append((nx, ny, dist + 1))
-        
+
+        self.shipyard_search_orders[key] = order
+        return order
+
+    def find_shipyard_placement(self, reference_x: int, reference_y: int, path_tiles: set[Tuple[int, int]], max_search_radius: int = 10) -> Optional[Tuple[int, int]]:
+        if self.shipyard_candidates is None:
+            self._prepare_shipyard_search()
+
+        for x, y in self._shipyard_search_order(reference_x, reference_y, max_search_radius):
+            if self.can_place_shipyard(x, y, path_tiles):
+                return (x, y)
         return None
     
-    def _a_star_with_costs(self, start: Tuple[int,int], goal: Tuple[int,int], cost_map: List[List[float]]) -> List[Tuple[int,int]]:
-        """A* search using a precomputed per-cell cost_map.
+    def _prepare_search(self) -> None:
+        """
+        Build the walkability mask and the reusable buffers of _a_star_with_costs.
+
+        Cells are stored column by column on a grid padded with one unwalkable cell on every side,
+        at index (x + 1) * stride + (y + 1). The padding replaces the bounds checks, and comparing
+        indices orders cells the same way as comparing (x, y) tuples, so ties are broken like before.
+        """
+        stride = self.height + 2
+        size = (self.width + 2) * stride
+        walkable = bytearray(size)
+        for x in range(self.width):
+            column_start = (x + 1) * stride + 1
+            walkable[column_start:column_start + self.height] = bytes(
+                not self.occupied_tiles_excluding_actionable[y][x] for y in range(self.height))
+
+        self.search_stride = stride
+        self.walkable_mask = walkable
+        self.g_score = [math.inf] * size
+        self.came_from = [-1] * size
+        self.closed = bytearray(size)
+        # coordinates of every index, -1 / width or height on the padding
+        self.cell_x = [idx // stride - 1 for idx in range(size)]
+        self.cell_y = [idx % stride - 1 for idx in range(size)]
+
+    def _noise_fields(self, noise: float) -> List[array]:
+        """
+        Pool of per-cell cost fields (1.0 + random * noise) for the given noise, built once per map.
+        Fields are flat arrays in the layout of the search buffers (see _prepare_search).
+        Without an explicit noise_seed the pool is seeded from the entry points, so it does not
+        consume the global random state and a map is reproducible from its own content.
+        """
+        fields = self.noise_fields.get(noise)
+        if fields is not None:
+            return fields
+        if self.walkable_mask is None:
+            self._prepare_search()
+
+        seed = self.noise_seed
+        if seed is None:
+            seed = 0
+            for x, y in self.entry_points:
+                seed = (seed * 1000003) ^ (x * 73856093) ^ (y * 19349663)
+                seed &= (1 << 62) - 1
+        rng = random.Random(seed)
+        size = len(self.walkable_mask)
+        fields = [array('d', [1.0 + rng.random() * noise for _ in range(size)]) for _ in range(self.noise_pool_size)]
+        self.noise_fields[noise] = fields
+        return fields
+
+    def _a_star_with_costs(self, start: Tuple[int,int], goal: Tuple[int,int], cost_field) -> List[Tuple[int,int]]:
+        """A* search using a precomputed per-cell cost field, indexed like the search buffers.
 
         Returns path as list of (x, y) or empty list if none found.
         """
         if start == goal:
             return [start]
-
-        def heuristic(a: Tuple[int,int], b: Tuple[int,int]) -> int:
-            return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-        open_heap: List[Tuple[float, Tuple[int,int]]] = []
-        heapq.heappush(open_heap, (heuristic(start, goal), start))
-        g_score = {start: 0.0}
-        came_from = {}
-
-        # closed set of expanded nodes — prevents re-processing the same node
-        closed: set = set()
-
-        # local references for speed inside the loop
-        neigh_offsets = [(-1,0),(1,0),(0,-1),(0,1)]
-        while open_heap:
-            _, current = heapq.heappop(open_heap)
-            if current in closed:
-                continue
-
-            cx, cy = current
-            if current == goal: # reached neighbor of goal
-                path = [current]
-                while path[-1] in came_from:
-                    path.append(came_from[path[-1]])
-                path.append(start)
-                path.reverse()
-                return path
-
-            closed.add(current)
-
-            for dx, dy in neigh_offsets:
-                nx, ny = cx + dx, cy + dy
-                neighbor = (nx, ny)
-
-                # quick bounds + walkable check
-                if not self.is_walkable_cell(nx, ny):
+        if self.walkable_mask is None:
+            self._prepare_search()
+
+        stride = self.search_stride
+        walkable = self.walkable_mask
+        g_score = self.g_score
+        came_from = self.came_from
+        closed = self.closed
+        cell_x = self.cell_x
+        cell_y = self.cell_y
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        inf = math.inf
+
+        start_idx = (start[0] + 1) * stride + start[1] + 1
+        goal_idx = (goal[0] + 1) * stride + goal[1] + 1
+        gx, gy = goal
+        # (index offset, dx, dy) in the order (-1,0), (1,0), (0,-1), (0,1)
+        neigh_offsets = ((-stride, -1, 0), (stride, 1, 0), (-1, 0, -1), (1, 0, 1))
+
+        g_score[start_idx] = 0.0
+        # cells whose buffers were written, reset when the search ends
+        touched = [start_idx]
+        open_heap = [(abs(start[0] - gx) + abs(start[1] - gy), start_idx)]
+        try:
+            while open_heap:
+                _, current = heappop(open_heap)
+                if closed[current]:
                     continue
 
-                # if neighbor already expanded, skip
-                if neighbor in closed:
-                    continue
-
-                tentative_g = g_score[current] + cost_map[ny][nx]
-                if tentative_g < g_score.get(neighbor, float('inf')):
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    f = tentative_g + heuristic(neighbor, goal)
-                    heapq.heappush(open_heap, (f, neighbor))
+                if current == goal_idx:
+                    path = [goal]
+                    idx = came_from[current]
+                    while idx != -1:
+                        path.append((cell_x[idx], cell_y[idx]))
+                        idx = came_from[idx]
+                    # the start is added once more, like the dict based search did
+                    path.append(start)
+                    path.reverse()
+                    return path
+
+                closed[current] = 1
+                cx = cell_x[current]
+                cy = cell_y[current]
+                g_current = g_score[current]
+
+                for offset, dx, dy in neigh_offsets:
+                    neighbor = current + offset
+                    if not walkable[neighbor] or closed[neighbor]:
+                        continue
+
+                    nx, ny = cx + dx, cy + dy
+                    tentative_g = g_current + cost_field[neighbor]
+                    previous_g = g_score[neighbor]
+                    if tentative_g < previous_g:
+                        if previous_g == inf:
+                            touched.append(neighbor)
+                        came_from[neighbor] = current
+                        g_score[neighbor] = tentative_g
+                        heappush(open_heap, (tentative_g + abs(nx - gx) + abs(ny - gy), neighbor))
 
-        return []
+            return []
+        finally:
+            for idx in touched:
+                g_score[idx] = inf
+                came_from[idx] = -1
+                closed[idx] = 0
 
     def find_varied_path(self, start: Tuple[int,int], goal: Tuple[int,int], attempts: int = 6, noise: float = 0.8, curvature_weight: float = 0.5, seed: Optional[int] = None) -> List[Tuple[int,int]]:
         """Find varied path by running A* with randomized per-cell costs multiple times.
 
+        Every attempt uses a different noise field of the map's pool, in an order drawn from the
+        per-edge seed, so each edge still gets its own reproducible set of attempts.
         Returns one chosen path (may be more curved / longer than the shortest).
         """
         if start == goal:
@@ -155,14 +297,13 @@ class RoadGenerator:
 
         base_seed = seed if seed is not None else (start[0]*73856093 ^ start[1]*19349663 ^ goal[0]*83492791 ^ goal[1]*6700417)
         master_rng = random.Random(base_seed)
+        fields = self._noise_fields(noise)
+        field_order = master_rng.sample(range(len(fields)), len(fields))
 
         found_paths: List[List[Tuple[int,int]]] = []
-        for _ in range(attempts):
-            attempt_seed = master_rng.randrange(1 << 30)
-            arng = random.Random(attempt_seed)
-            # build noise-based cost map
-            cost_map: List[List[float]] = [[1.0 + arng.random() * noise for _ in range(self.width)] for _ in range(self.height)]
-            path = self._a_star_with_costs(start, goal, cost_map)
+        for attempt in range(attempts):
+            cost_field = fields[field_order[attempt % len(fields)]]
+            path = self._a_star_with_costs(start, goal, cost_field)
             if path:
                 found_paths.append(path)
 
@@ -196,34 +337,171 @@ class RoadGenerator:
     def get_paths_endpoints_with_mst(self, points: List[Tuple[int, int]]) -> List[Tuple[Tuple[int,int], Tuple[int,int]]]:
         """
         Return list of edges connecting all points with minimal total distance using MST (Prim's algorithm).
-        """
-        adj_list = [[] for _ in points]
-
-        for i, (x1, y1) in enumerate(points):
-            for j, (x2, y2) in enumerate(points):
-                if x1!=x2 or y1!=y2:
-                    adj_list[i].append((j, sqrt((x1-x2)**2 + (y1-y2)**2)))
 
+        Instead of pushing all n^2 edges on a heap, every tree node keeps only one heap entry: the edge
+        to its nearest point outside the tree, found in a grid of buckets holding the points not yet
+        in the tree. An entry whose point joined the tree in the meantime is replaced by the node's
+        next nearest point when it is popped. Edges are still taken in (length, node, other node)
+        order, so the tree and the order of its edges are the same as with all edges on the heap.
+        Points with equal coordinates are never connected directly.
+        """
         if not points:
             return []
 
-        visited = {0}
+        count = len(points)
+        min_x = min(x for x, _ in points)
+        min_y = min(y for _, y in points)
+        span = max(max(x for x, _ in points) - min_x, max(y for _, y in points) - min_y) + 1
+        # about two points per bucket
+        bucket_size = max(1, int(span / sqrt(count / 2)))
+        buckets_per_side = span // bucket_size + 1
+
+        buckets: dict[Tuple[int, int], List[int]] = {}
+        bucket_of = []
+        for i, (x, y) in enumerate(points):
+            bucket = ((x - min_x) // bucket_size, (y - min_y) // bucket_size)
+            buckets.setdefault(bucket, []).append(i)
+            bucket_of.append(bucket)
+
+        def nearest_outside(i: int) -> Optional[Tuple[int, int]]:
+            """(squared distance, index) of the nearest point not in the tree, ties broken by index."""
+            px, py = points[i]
+            bx, by = bucket_of[i]
+            best = None
+            for ring in range(buckets_per_side + 1):
+                # points in this ring are at least (ring - 1) * bucket_size + 1 away along one axis
+                if best is not None and ring >= 1 and ((ring - 1) * bucket_size + 1) ** 2 > best[0]:
+                    break
+                for cx in range(bx - ring, bx + ring + 1):
+                    step = 1 if cx in (bx - ring, bx + ring) else 2 * ring or 1
+                    for cy in range(by - ring, by + ring + 1, step):
+                        for j in buckets.get((cx, cy), ()):
+                            qx, qy = points[j]
+                            d = (qx - px) ** 2 + (qy - py) ** 2
+                            if d and (best is None or (d, j) < best):
+                                best = (d, j)
+            return best
+
+        def add_to_tree(i: int) -> None:
+            visited.add(i)
+            buckets[bucket_of[i]].remove(i)
+            candidate = nearest_outside(i)
+            if candidate is not None:
+                heapq.heappush(edge_heap, (candidate[0], i, candidate[1]))
+
+        visited = set()
         paths_endpoints: List[Tuple[Tuple[int, int], Tuple[int, int]]] = []
-        
         edge_heap = []
-        for other_node_idx, edge_len in adj_list[0]:
-            heapq.heappush(edge_heap, (edge_len, 0, other_node_idx)) # change order to sort by edge_len
+        add_to_tree(0)
 
-        while len(visited) < len(points):
-            edge_len, node_idx, other_node_idx = heapq.heappop(edge_heap)
+        while len(visited) < count and edge_heap:
+            _, node_idx, other_node_idx = heapq.heappop(edge_heap)
             if other_node_idx not in visited:
-                visited.add(other_node_idx)
                 paths_endpoints.append((points[node_idx], points[other_node_idx]))
-                for on, e in adj_list[other_node_idx]:
-                    heapq.heappush(edge_heap, (e, other_node_idx, on))
+                add_to_tree(other_node_idx)
+            candidate = nearest_outside(node_idx)
+            if candidate is not None:
+                heapq.heappush(edge_heap, (candidate[0], node_idx, candidate[1]))
 
         return paths_endpoints
-    
+
+    def get_steiner_paths(self, points: List[Tuple[int, int]], noise: float = 0.8) -> List[Tuple[Tuple[int,int], Tuple[int,int], List[Tuple[int,int]]]]:
+        """
+        Connect all points with a road network approximating a Steiner tree (Mehlhorn's method).
+
+        One Dijkstra search grows a shortest-path forest from all points at once, so every tile
+        is settled at most once and knows its nearest point. Neighboring tiles of two different
+        points give candidate connections, of which a minimum spanning forest is taken (Kruskal).
+        Every chosen connection is laid along the two shortest-path trees, so roads leading to the
+        same point share their tiles instead of being searched for from scratch.
+        Costs come from the first noise field of the map's pool, which keeps the roads irregular.
+
+        Returns list of (point, other_point, path) with path as list of (x, y).
+        """
+        if self.walkable_mask is None:
+            self._prepare_search()
+
+        stride = self.search_stride
+        walkable = self.walkable_mask
+        cell_x = self.cell_x
+        cell_y = self.cell_y
+        cost_field = self._noise_fields(noise)[0]
+        size = len(walkable)
+        neigh_offsets = (-stride, stride, -1, 1)
+
+        dist = [math.inf] * size
+        owner = [-1] * size
+        parent = [-1] * size
+        settled = bytearray(size)
+
+        heap = []
+        for i, (x, y) in enumerate(points):
+            idx = (x + 1) * stride + y + 1
+            if owner[idx] == -1:
+                dist[idx] = 0.0
+                owner[idx] = i
+                heap.append((0.0, idx))
+        heapq.heapify(heap)
+
+        while heap:
+            d, current = heapq.heappop(heap)
+            if settled[current]:
+                continue
+            settled[current] = 1
+            current_owner = owner[current]
+            for offset in neigh_offsets:
+                neighbor = current + offset
+                if not walkable[neighbor] or settled[neighbor]:
+                    continue
+                nd = d + cost_field[neighbor]
+                if nd < dist[neighbor]:
+                    dist[neighbor] = nd
+                    owner[neighbor] = current_owner
+                    parent[neighbor] = current
+                    heapq.heappush(heap, (nd, neighbor))
+
+        # cheapest crossing between the regions of every pair of points
+        crossings: dict[Tuple[int, int], Tuple[float, int, int]] = {}
+        for idx in range(size):
+            if not settled[idx]:
+                continue
+            for neighbor in (idx + stride, idx + 1):
+                if not settled[neighbor] or owner[neighbor] == owner[idx]:
+                    continue
+                a, b = owner[idx], owner[neighbor]
+                key = (a, b) if a < b else (b, a)
+                length = dist[idx] + dist[neighbor] + 1.0
+                if key not in crossings or length < crossings[key][0]:
+                    crossings[key] = (length, idx, neighbor)
+
+        union_find = list(range(len(points)))
+
+        def find(i: int) -> int:
+            while union_find[i] != i:
+                union_find[i] = union_find[union_find[i]]
+                i = union_find[i]
+            return i
+
+        def trace(idx: int) -> List[Tuple[int, int]]:
+            cells = []
+            while idx != -1:
+                cells.append((cell_x[idx], cell_y[idx]))
+                idx = parent[idx]
+            return cells
+
+        paths = []
+        for (a, b), (_, idx, neighbor) in sorted(crossings.items(), key=lambda item: (item[1][0], item[0])):
+            root_a, root_b = find(a), find(b)
+            if root_a == root_b:
+                continue
+            union_find[root_a] = root_b
+            to_a = trace(idx)
+            to_a.reverse()
+            path = to_a + trace(neighbor)
+            paths.append((path[0], path[-1], path))
+
+        return paths
+
     def generate(self) -> List[List[RoadType | None]]:
 
         if len(self.entry_points) < 2:
@@ -231,6 +509,17 @@ class RoadGenerator:
             return self.paths
 
         print(f"Entry points (x,y): {self.entry_points}")
+        # walkability and shores do not change while roads are laid, so their masks are built once
+        self._prepare_search()
+        self._prepare_shipyard_search()
+
+        if self.network_mode == "steiner":
+            for a, b, path in self.get_steiner_paths(self.entry_points, noise=0.8):
+                road_type = random.choice(list(RoadType))
+                print(f"Generated road path from {a} to {b}, path: {path}")
+                self.lay_road(path, road_type)
+            return self.paths
+
         paths_endpoints = self.get_paths_endpoints_with_mst(self.entry_points)
 
         # For each MST edge, compute a varied path and mark it in the grid
@@ -241,43 +530,49 @@ class RoadGenerator:
             print(f"Generated road path from {a} to {b}, path: {path}")
             if not path:
                 continue
-            
-            path_tiles = set(path)
-            
-            in_water_section = False
-            
-            for i, (x, y) in enumerate(path):
-                if self.is_walkable_cell(x, y):
-                    self.occupied_tiles_excluding_landscape[y][x] = True
-                    
-                    current_is_water = self.terrain_map[y][x] == TerrainType.WATER
-                    
-                    if current_is_water and not in_water_section:
-                        if i > 0:
-                            prev_x, prev_y = path[i-1]
-                            if self.terrain_map[prev_y][prev_x] != TerrainType.WATER:
-                                shipyard_pos = self.find_shipyard_placement(prev_x, prev_y, path_tiles)
-                                if shipyard_pos:
-                                    if shipyard_pos not in self.shipyard_positions:
-                                        self.shipyard_positions.append(shipyard_pos)
-                                        # print(f"  Found shipyard placement at {shipyard_pos} for entering water from ({prev_x},{prev_y})")
-                                else:
-                                    print(f"  WARNING: Could not find shipyard placement near ({prev_x},{prev_y}) for water entry")
-                        in_water_section = True
-                    
-                    elif not current_is_water and in_water_section:
-                        shipyard_pos = self.find_shipyard_placement(x, y, path_tiles)
-                        if shipyard_pos:
-                            if shipyard_pos not in self.shipyard_positions:
-                                self.shipyard_positions.append(shipyard_pos)
-                                # print(f"  Found shipyard placement at {shipyard_pos} for exiting water at ({x},{y})")
-                        else:
-                            print(f"  WARNING: Could not find shipyard placement near ({x},{y}) for water exit")
-                        in_water_section = False
-                    
-                    if self.terrain_map[y][x] in self.restricted_terrain:
-                        self.paths[y][x] = RoadType.NONE
-                    else: self.paths[y][x] = road_type
+            self.lay_road(path, road_type)
 
         return self.paths
-        
\ No newline at end of file
+
+    def lay_road(self, path: List[Tuple[int, int]], road_type: RoadType) -> None:
+        """
+        Mark the walkable tiles of a path as road (occupying them) and find shipyards where it crosses water.
+        """
+        path_tiles = set(path)
+
+        in_water_section = False
+
+        for i, (x, y) in enumerate(path):
+            if self.is_walkable_cell(x, y):
+                if not self.occupied_tiles_excluding_landscape[y][x]:
+                    self.occupied_tiles_excluding_landscape[y][x] = True
+                    self.road_tiles.append((x, y))
+
+                current_is_water = self.terrain_map[y][x] == TerrainType.WATER
+
+                if current_is_water and not in_water_section:
+                    if i > 0:
+                        prev_x, prev_y = path[i-1]
+                        if self.terrain_map[prev_y][prev_x] != TerrainType.WATER:
+                            shipyard_pos = self.find_shipyard_placement(prev_x, prev_y, path_tiles)
+                            if shipyard_pos:
+                                if shipyard_pos not in self.shipyard_positions:
+                                    self.shipyard_positions.append(shipyard_pos)
+                                    # print(f"  Found shipyard placement at {shipyard_pos} for entering water from ({prev_x},{prev_y})")
+                            else:
+                                print(f"  WARNING: Could not find shipyard placement near ({prev_x},{prev_y}) for water entry")
+                    in_water_section = True
+
+                elif not current_is_water and in_water_section:
+                    shipyard_pos = self.find_shipyard_placement(x, y, path_tiles)
+                    if shipyard_pos:
+                        if shipyard_pos not in self.shipyard_positions:
+                            self.shipyard_positions.append(shipyard_pos)
+                            # print(f"  Found shipyard placement at {shipyard_pos} for exiting water at ({x},{y})")
+                    else:
+                        print(f"  WARNING: Could not find shipyard placement near ({x},{y}) for water exit")
+                    in_water_section = False
+
+                if self.terrain_map[y][x] in self.restricted_terrain:
+                    self.paths[y][x] = RoadType.NONE
+                else: self.paths[y][x] = road_type
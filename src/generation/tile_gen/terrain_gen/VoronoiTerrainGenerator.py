@@ -2,7 +2,7 @@ from typing import List, Tuple, Set, Dict
 import random
 
 from classes.tile.Tile import TerrainType
-from generation.pcg_algorithms.voronoi import VoronoiRegion
+from generation.pcg_algorithms.voronoi import VoronoiRegion, label_nearest_seeds, label_neighbor_pairs
 
 class VoronoiTerrainGenerator:
     def __init__(self, height: int, width: int, terrain_weights: Dict[TerrainType, int], alpha: int = 5):
@@ -12,8 +12,8 @@ class VoronoiTerrainGenerator:
         self.alpha = alpha
         
         self.regions: List[VoronoiRegion] = []
-        # 2D array to track which regions are tiles assigned to
-        self.ownership: List[List[VoronoiRegion]] = [[None for _ in range(self.width)] for _ in range(self.height)]
+        # flat, row-major array of region indices (ownership[y * width + x]) tracking which regions are tiles assigned to
+        self.ownership: List[int] = []
         # map of terrain types and their assigned regions
         self.regions_for_terrain: Dict[TerrainType, List[VoronoiRegion]] = {}
     
@@ -21,24 +21,8 @@ class VoronoiTerrainGenerator:
         """
         Identify neighboring Voronoi regions based on tile adjacency.
         """
-        def valid_neighbors(x: int, y: int):
-            directions = [(0, 1), (1, 0), (-1, 0), (0, -1)]
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.width and 0 <= ny < self.height:
-                    yield nx, ny
-        
-        def add_neighbors(region: VoronoiRegion, neighbors: List[Tuple[int, int]]):
-            for nx, ny in neighbors:
-                neighbor = self.ownership[ny][nx]
-                if neighbor is not region:
-                    region.neighbors.add(neighbor)
-        
-        for y in range(self.height):
-            for x in range(self.width):
-                region = self.ownership[y][x]
-                neighbors = valid_neighbors(x, y)
-                add_neighbors(region, neighbors)
+        for a, b in label_neighbor_pairs(self.ownership, self.width, self.height):
+            self.regions[a].neighbors.add(self.regions[b])
 
     def generate_voronoi_regions(self, n: int):
         """
@@ -49,11 +33,9 @@ class VoronoiTerrainGenerator:
             sy = random.randint(0, self.height - 1)
             self.regions.append(VoronoiRegion(sx, sy))
         
-        for y in range(self.height):
-            for x in range(self.width):
-                closest_region = min(self.regions, key=lambda r, x=x, y=y: (r.seed_x - x) ** 2 + (r.seed_y - y) ** 2)
-                closest_region.tiles.append((x, y))
-                self.ownership[y][x] = closest_region
+        self.ownership = label_nearest_seeds(self.width, self.height, [(r.seed_x, r.seed_y) for r in self.regions])
+        for i, label in enumerate(self.ownership):
+            self.regions[label].tiles.append((i % self.width, i // self.width))
 
         self.find_neighbors()
 
@@ -0,0 +1,182 @@
+from random import randint
+
+from classes.tile.Tile import TerrainType
+from generation.tile_gen.tile_gen import TerrainSpriteType, get_terrain_type_sprite_type_range
+from generation.tile_gen.terrain_gen.terrain_sprite_mappings.sprite_type_dirt import dirt_sprite_mappings
+from generation.tile_gen.terrain_gen.terrain_sprite_mappings.sprite_type_dirt_based import dirt_based_terrain_sprite_mappings
+from generation.tile_gen.terrain_gen.terrain_sprite_mappings.sprite_type_rock import rock_sprite_mappings
+from generation.tile_gen.terrain_gen.terrain_sprite_mappings.sprite_type_water import water_sprite_mappings
+
+# Table driven version of the terrain sprite handlers (terrain_sprite_handlers/), giving the same results.
+# The 8 neighbors of a tile are encoded as a 16-bit integer, 2 bits per neighbor in reading order
+# (upper left neighbor in the highest bits): 0 - N, 1 - A or X, 2 - Y (see terrain_sprite_mappings/).
+# The neighbor strings of the sprite mappings are encoded the same way once, so choosing a sprite
+# is a dict lookup instead of building a 3x3 list and a string for every tile.
+
+_SAND_GROUP = {TerrainType.SAND, TerrainType.ROCK, TerrainType.WATER}
+_CELL_CODES = {"N": 0, "A": 1, "X": 1, "Y": 2}
+
+
+def encode_neighbors_string(neighbors_string: str) -> int | None:
+    """Encode a 'NNN\\nNNN\\nNNN' style neighbors string, None if its middle tile is not native."""
+    cells = neighbors_string.replace("\n", "")
+    if len(cells) != 9 or cells[4] != "N":
+        return None
+    code = 0
+    for cell in cells[:4] + cells[5:]:
+        code = (code << 2) | _CELL_CODES[cell]
+    return code
+
+
+def decode_neighbors_code(code: int, letters: str) -> str:
+    """Inverse of encode_neighbors_string, letters are the characters used for the codes 0, 1 and 2."""
+    cells = [letters[(code >> shift) & 3] for shift in range(14, -2, -2)]
+    cells.insert(4, "N")
+    return "\n".join("".join(cells[row:row + 3]) for row in (0, 3, 6))
+
+
+def _build_table(mappings: dict) -> dict[int, tuple[TerrainSpriteType, bool, bool]]:
+    table = {}
+    for neighbors_string, sprite in mappings.items():
+        code = encode_neighbors_string(neighbors_string)
+        if code is not None:
+            table[code] = sprite
+    return table
+
+
+def _build_conflicts(sprite_type_by_corner: list[tuple[str, TerrainSpriteType, bool, bool]]) -> dict[int, tuple]:
+    """
+    Inner corner conflicts by neighbors code. The corner index tells in which directions
+    (0: right and down, 1: left and down, 2: right and up, 3: left and up) the extended check looks.
+    """
+    return {encode_neighbors_string(neighbors_string): (corner, (sprite_type, x_flip, y_flip))
+            for corner, (neighbors_string, sprite_type, x_flip, y_flip) in enumerate(sprite_type_by_corner)}
+
+
+def _corner_strings(letter: str) -> list[str]:
+    return [f"NNN\nNNN\nNN{letter}", f"NNN\nNNN\n{letter}NN", f"NN{letter}\nNNN\nNNN", f"{letter}NN\nNNN\nNNN"]
+
+
+def _corner_conflicts(letter: str, sprite_types: list[tuple[TerrainSpriteType, bool, bool]]) -> dict[int, tuple]:
+    return _build_conflicts([(neighbors_string, *sprite)
+                             for neighbors_string, sprite in zip(_corner_strings(letter), sprite_types)])
+
+
+_FLIPPED_CORNERS = [(False, False), (True, False), (False, True), (True, True)]
+
+WATER_TABLE = _build_table(water_sprite_mappings)
+ROCK_TABLE = _build_table(rock_sprite_mappings)
+DIRT_TABLE = _build_table(dirt_sprite_mappings)
+DIRT_BASED_TABLE = _build_table(dirt_based_terrain_sprite_mappings)
+
+WATER_CONFLICTS = _corner_conflicts("A", [(TerrainSpriteType.SAND_INNER_CORNER, *flips) for flips in _FLIPPED_CORNERS])
+ROCK_CONFLICTS = _corner_conflicts("A", [
+    (TerrainSpriteType.UPPER_LEFT_INNER_CORNER, False, False),
+    (TerrainSpriteType.UPPER_RIGHT_INNER_CORNER, False, False),
+    (TerrainSpriteType.LOWER_LEFT_INNER_CORNER, False, False),
+    (TerrainSpriteType.LOWER_RIGHT_INNER_CORNER, False, False),
+])
+DIRT_CONFLICTS = _corner_conflicts("X", [(TerrainSpriteType.SAND_INNER_CORNER, *flips) for flips in _FLIPPED_CORNERS])
+DIRT_BASED_CONFLICTS = {
+    **_corner_conflicts("X", [(TerrainSpriteType.SAND_INNER_CORNER, *flips) for flips in _FLIPPED_CORNERS]),
+    **_corner_conflicts("Y", [(TerrainSpriteType.DIRT_INNER_CORNER, *flips) for flips in _FLIPPED_CORNERS]),
+}
+
+
+def _cell_classes(center: TerrainType) -> list[int]:
+    """Code of every terrain type (by value) as a neighbor of a tile of the given terrain."""
+    classes = []
+    for terrain in TerrainType:
+        if center in (TerrainType.WATER, TerrainType.ROCK):
+            classes.append(0 if terrain == center else 1)
+        elif center == TerrainType.DIRT:
+            classes.append(1 if terrain in _SAND_GROUP else 0)
+        else:
+            classes.append(0 if terrain == center else 1 if terrain in _SAND_GROUP else 2)
+    return classes
+
+
+_CELL_CLASSES = [_cell_classes(center) for center in TerrainType]
+
+# (table, conflicts, letters of the codes) of every terrain type, None for sand which ignores its neighbors
+_TABLES = {
+    TerrainType.WATER: (WATER_TABLE, WATER_CONFLICTS, "NA"),
+    TerrainType.ROCK: (ROCK_TABLE, ROCK_CONFLICTS, "NA"),
+    TerrainType.DIRT: (DIRT_TABLE, DIRT_CONFLICTS, "NX"),
+    TerrainType.SAND: None,
+}
+_DIRT_BASED = (DIRT_BASED_TABLE, DIRT_BASED_CONFLICTS, "NXY")
+
+_sprite_ranges: dict[tuple[TerrainType, TerrainSpriteType], tuple[tuple, tuple]] = {}
+
+
+def _sprite_range(terrain_type: TerrainType, sprite_type: TerrainSpriteType) -> tuple[tuple, tuple]:
+    key = (terrain_type, sprite_type)
+    ranges = _sprite_ranges.get(key)
+    if ranges is None:
+        allowed_sprite_ranges = get_terrain_type_sprite_type_range(terrain_type, sprite_type)
+        ranges = (allowed_sprite_ranges["standard"], allowed_sprite_ranges["special"])
+        _sprite_ranges[key] = ranges
+    return ranges
+
+
+def _random_sprite(terrain_type: TerrainType, sprite_type: TerrainSpriteType) -> int:
+    standard, special = _sprite_range(terrain_type, sprite_type)
+    if special and randint(1, 10) == 1:
+        return randint(special[0], special[1])
+    return randint(standard[0], standard[1])
+
+
+def _extended_corner_matches(terrain_map: list[list[TerrainType]], x: int, y: int, corner: int) -> bool:
+    """Extended inner corner check of SpriteHandler._resolve_inner_corner_conflict."""
+    height, width = len(terrain_map), len(terrain_map[0])
+    dx = 2 if corner in (0, 2) else -2
+    dy = 2 if corner in (0, 1) else -2
+    if not (0 <= x + dx < width and 0 <= y + dy < height):
+        return False
+    terrain = terrain_map[y][x]
+    return terrain_map[y][x + dx] == terrain and terrain_map[y + dy][x] == terrain
+
+
+def choose_terrain_sprites(terrain_map: list[list[TerrainType]]) -> list[list[tuple[int, bool, bool]]]:
+    """
+    Choose the sprites of all tiles of a terrain map in one pass.
+    Tiles are visited row by row, so the random numbers are drawn in the same order as when
+    calling choose_terrain_sprite for every tile.
+        Returns:
+            rows of (sprite_number, x_terrain_flip, y_terrain_flip) tuples.
+    """
+    height, width = len(terrain_map), len(terrain_map[0])
+    # terrain values with the edge rows and columns duplicated, like SpriteHandler._get_neighbors does
+    values = [[row[0].value] + [terrain.value for terrain in row] + [row[-1].value] for row in terrain_map]
+    padded = [values[0]] + values + [values[-1]]
+
+    sprites = []
+    for y in range(height):
+        up, middle, down = padded[y], padded[y + 1], padded[y + 2]
+        row = terrain_map[y]
+        sprite_row = []
+        for x in range(width):
+            terrain_type = row[x]
+            tables = _TABLES.get(terrain_type, _DIRT_BASED)
+            if tables is None:
+                sprite_row.append((_random_sprite(terrain_type, TerrainSpriteType.CENTER), False, False))
+                continue
+
+            cls = _CELL_CLASSES[middle[x + 1]]
+            code = (cls[up[x]] << 14 | cls[up[x + 1]] << 12 | cls[up[x + 2]] << 10 | cls[middle[x]] << 8
+                    | cls[middle[x + 2]] << 6 | cls[down[x]] << 4 | cls[down[x + 1]] << 2 | cls[down[x + 2]])
+            table, conflicts, letters = tables
+            sprite = table.get(code)
+            if sprite is None:
+                print("No matching sprite type for neighbors string:", decode_neighbors_code(code, letters), "at position:", (x, y))
+                sprite_row.append((1, False, False))
+                continue
+
+            conflict = conflicts.get(code)
+            if conflict is not None and _extended_corner_matches(terrain_map, x, y, conflict[0]):
+                sprite = conflict[1]
+            sprite_type, x_terrain_flip, y_terrain_flip = sprite
+            sprite_row.append((_random_sprite(terrain_type, sprite_type), x_terrain_flip, y_terrain_flip))
+        sprites.append(sprite_row)
+    return sprites
@@ -20,7 +20,6 @@ from PySide6.QtGui import QPixmap
 import sys
 import os
 import json
-import subprocess
 from datetime import datetime
 
 def _qt_message_handler(msg_type, context, message):
@@ -31,10 +30,6 @@ def _qt_message_handler(msg_type, context, message):
 # install handler for Qt stylesheet parse warnings
 QtCore.qInstallMessageHandler(_qt_message_handler)
 
-H3MTXT_NAME = "h3mtxt.exe"
-_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-H3MTXT_DEFAULT_PATH = os.path.join(_PROJECT_ROOT, H3MTXT_NAME)
-
 MAX_TOTAL_TOWNS = 48
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__))))
@@ -57,7 +52,8 @@ from classes.additional_info.VictoryConditions.DefeatMonster import DefeatMonste
 from classes.additional_info.LossConditions.LoseTown import LoseTown
 from classes.additional_info.LossConditions.LoseHero import LoseHero
 
-from ui.functions.filter_none_values import filter_none_values
+from classes.H3mWriter import save_h3m
+from classes.MapJsonWriter import write_map_json
 from ui.classes.LimitedPlainTextEdit import LimitedPlainTextEdit
 from ui.classes.OutlinedLabel import OutlinedLabel
 from ui.classes.TownPickerDialog import TownPickerDialog
@@ -770,8 +766,8 @@ class MapGeneratorGUI(QWidget):
             "Notes on generation limits:\n"
             "- If the number of neutral towns is too high for the chosen map size and player count, the generator may produce less neutral towns than requested.\n"
             "- On small maps (36x36) with many players, the generator may fail to produce a map at all due to space constraints. In such cases try a larger size or fewer players.\n\n"
-            "What if the 'h3mtxt.exe' converter is not present?\n"
-            "Only a JSON representation of the map will be saved. You can then use the h3mtxt.exe tool separately to convert JSON to .h3m.\n\n"
+            "The .h3m file is written directly by the generator. A JSON representation of the map is saved next to it; "
+            "it can be converted again with src/test_scripts/map_conversion_test.py or the h3mtxt.exe tool.\n\n"
         )
         manual_html = manual_body.replace('\n', '<br>')
         # Use a read-only QTextEdit so the manual text is scrollable and selectable
@@ -1785,7 +1781,6 @@ class MapGeneratorGUI(QWidget):
             return
 
         try:
-            map_dict = filter_none_values(map.to_dict())
             # Inject user-provided basic info if present
             name_val = self.map_name_edit.text().strip()
             desc_val = self.map_desc_edit.toPlainText().strip()
@@ -1797,9 +1792,6 @@ class MapGeneratorGUI(QWidget):
             if hasattr(map, 'basic_info') and map.basic_info is not None:
                 map.basic_info.name = name_val
                 map.basic_info.description = desc_val
-            # re-serialize after injection
-            map_dict = filter_none_values(map.to_dict())
-            json_map_representation = json.dumps(map_dict, indent=2)
             self.status_label.setText("Map representation generated successfully")
             QApplication.processEvents()
         except Exception as e:
@@ -1815,7 +1807,7 @@ class MapGeneratorGUI(QWidget):
             self.status_label.setText(f"Saving map representation to: {json_file_path}")
             QApplication.processEvents()
             with open(json_file_path, 'w', encoding='utf-8') as f:
-                f.write(json_map_representation)
+                write_map_json(map, f)
         except Exception as e:
             QMessageBox.critical(self, "File error", f"Failed to write JSON file: {e}")
             self.status_label.setText("Failed: file write error")
@@ -1823,27 +1815,15 @@ class MapGeneratorGUI(QWidget):
             return
 
         try:
-            self.status_label.setText("Converting JSON to h3m...")
+            self.status_label.setText("Writing h3m...")
             QApplication.processEvents()
-            converter = H3MTXT_DEFAULT_PATH
-
-            print(f"Using converter: {converter}")
-            if not converter:
-                QMessageBox.information(self, "Saved JSON", f"JSON saved to {json_file_path}. Converter not found; .h3m not created.")
-                self.status_label.setText("Saved JSON (no converter)")
-            else:
-                converter_dir = os.path.dirname(converter) or os.getcwd()
-                result = subprocess.run([converter, json_file_path, h3m_file_path], cwd=converter_dir)
-                if result.returncode == 0:
-                    QMessageBox.information(self, "Success", f"New file created at: {h3m_file_path}")
-                    self.status_label.setText("Done")
-                    print("successfully generated a map using GUI")
-                else:
-                    QMessageBox.information(self, "Conversion", f"Conversion finished with code {result.returncode}. JSON saved to {json_file_path}")
-                    self.status_label.setText("Saved JSON (converter returned non-zero)")
+            save_h3m(map, h3m_file_path)
+            QMessageBox.information(self, "Success", f"New file created at: {h3m_file_path}")
+            self.status_label.setText("Done")
+            print("successfully generated a map using GUI")
         except Exception as e:
-            QMessageBox.warning(self, "Conversion error", f"Failed to convert file: {e}")
-            self.status_label.setText("Converter failed")
+            QMessageBox.warning(self, "Conversion error", f"Failed to write h3m file: {e}. JSON saved to {json_file_path}")
+            self.status_label.setText("Saved JSON (h3m writing failed)")
 
         self.generate_btn.setEnabled(True)
 
@@ -1,16 +1,14 @@
 import sys
 import os
-import json
 import tkinter as tk
 from tkinter import filedialog
 import os
-import json
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__))))
 from generation.map_gen.map_gen import generate_voronoi_map
 from classes.tile.Tile import TerrainType
-
-h3mtxt_exe_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'h3mtxt.exe'))
+from classes.H3mWriter import save_h3m
+from classes.MapJsonWriter import save_map_json
 
 root = tk.Tk()
 root.withdraw()
@@ -42,19 +40,8 @@ terrain_values = {
     # TerrainType.ROUGH: 2,
     # TerrainType.LAVA: 1,
 }
-map = generate_voronoi_map(terrain_values, size=36)
-
-def filter_none_values(obj):
-    """Recursively remove keys with None values from dictionaries"""
-    if isinstance(obj, dict):
-        return {k: filter_none_values(v) for k, v in obj.items() if v is not None}
-    elif isinstance(obj, list):
-        return [filter_none_values(item) for item in obj if item is not None]
-    else:
-        return obj
+map, _, _, _ = generate_voronoi_map(terrain_values, size=36)
 
-map_dict = filter_none_values(map.to_dict())
-json_map_representation = json.dumps(map_dict, indent=2)
 print("Map representation generated successfully")
 
 json_file_path = os.path.join(folder_path, f"{filename}.json")
@@ -62,15 +49,14 @@ h3m_file_path = os.path.join(folder_path, f"{filename}.h3m")
 
 print(f"Saving map representation to: {json_file_path}")
 try:
-    with open(json_file_path, 'w', encoding='utf-8') as f:
-        f.write(json_map_representation)
+    save_map_json(map, json_file_path)
     print(f"File created successfully at: {json_file_path}")
 except Exception as e:
     print(f"Failed to create file: {e}")
 
-print("Converting JSON to h3m...")
+print("Writing h3m...")
 try:
-    os.system(f'{h3mtxt_exe_path} {json_file_path} {h3m_file_path}')
+    save_h3m(map, h3m_file_path)
     print("Conversion completed successfully.")
     print(f"New file created at: {h3m_file_path}")
 
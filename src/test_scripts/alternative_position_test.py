@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import random
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from generation.object_gen.json_parser import read_object_templates_from_json
+from generation.object_gen.object_template_helper import ObjectTemplateHelper
+from generation.object_gen.template_footprint import get_template_footprint
+
+# Checks that find_alternative_position, which now reads whole rows of free positions from the
+# occupancy row bitsets, returns the same positions as the previous ring by ring search (kept below
+# as reference), and reports the time of both versions for small and large search radii.
+
+
+def reference_find_alternative_position(helper, template, preferred_x, preferred_y, max_offset, validation_function):
+    if validation_function(template, preferred_x, preferred_y):
+        return preferred_x, preferred_y
+    for offset in range(1, max_offset + 1):
+        for dx in range(-offset, offset + 1):
+            for dy in range(-offset, offset + 1):
+                if abs(dx) == offset or abs(dy) == offset:
+                    new_x = preferred_x + dx
+                    new_y = preferred_y + dy
+                    if validation_function(template, new_x, new_y):
+                        return new_x, new_y
+    return None, None
+
+
+def random_helper(size: int, density: float) -> ObjectTemplateHelper:
+    """Helper with only the occupancy state set, occupancy is a set of random rectangles."""
+    helper = ObjectTemplateHelper.__new__(ObjectTemplateHelper)
+    helper.map_format = size
+    helper.occupied_tiles = [[False] * size for _ in range(size)]
+    helper.occupied_tiles_excluding_landscape = [[False] * size for _ in range(size)]
+    helper.reserved_tiles = set()
+    for _ in range(int(size * size * density / 6)):
+        x, y, w, h = random.randrange(size), random.randrange(size), random.randint(1, 4), random.randint(1, 3)
+        for ty in range(y, min(y + h, size)):
+            for tx in range(x, min(x + w, size)):
+                helper.occupied_tiles[ty][tx] = True
+                if random.random() < 0.7:
+                    helper.occupied_tiles_excluding_landscape[ty][tx] = True
+        if random.random() < 0.3:
+            helper.reserved_tiles.add((x, y))
+    helper.occupancy_version = 0
+    helper._distance_layers = None
+    helper.refresh_occupancy_rows()
+    return helper
+
+
+templates = [template for name in ["towns", "dwellings", "mines", "artifacts", "grass_obj"]
+             for template in read_object_templates_from_json(name)]
+for template in templates:
+    get_template_footprint(template)
+
+failed = False
+print(f"{'map':>10} {'max offset':>11} {'searches':>9} {'found':>6} {'time [ms]':>10} {'reference':>10} {'result':>10}")
+for seed, size, density, max_offset, searches in [(0, 72, 0.5, 1, 2000), (1, 72, 1.0, 5, 1000), (5, 144, 1.5, 8, 500), (2, 144, 1.5, 15, 300),
+                                                   (3, 144, 2.5, 100, 30), (4, 144, 3.5, 510, 10)]:
+    random.seed(seed)
+    helper = random_helper(size, density)
+    queries = [(random.choice(templates), random.randint(-2, size + 1), random.randint(-2, size + 1),
+                random.choice([helper.validate_placement, helper.validate_placement_for_landscape]))
+               for _ in range(searches)]
+
+    start = time.perf_counter()
+    actual = [helper.find_alternative_position(template, x, y, max_offset, validation)
+              for template, x, y, validation in queries]
+    search_time = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = [reference_find_alternative_position(helper, template, x, y, max_offset, validation)
+                for template, x, y, validation in queries]
+    reference_time = time.perf_counter() - start
+
+    same = actual == expected
+    failed = failed or not same
+    found = sum(position != (None, None) for position in actual)
+    print(f"{f'{size} {density}':>10} {max_offset:>11} {searches:>9} {found:>6} {search_time * 1000:>10.1f} "
+          f"{reference_time * 1000:>10.1f} {'identical' if same else 'DIFFERENT':>10}")
+
+print("FAILED" if failed else "OK")
@@ -0,0 +1,105 @@
+import os
+import sys
+import time
+import tempfile
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import generation.object_gen.json_parser as json_parser
+from generation.object_gen.json_parser import load_catalog, load_json_with_comments, TEMPLATES_DIR
+
+# Checks load_catalog (in-process cache of pickled catalogs and their snapshots in __pycache__) against
+# load_json_with_comments on a temporary file: after modifying the returned data, after rewriting the file,
+# after changing it with the same size and a new mtime, after damaging the snapshot and when the in-process
+# cache is empty (as in a new process). Also compares all template files and reports the time of both.
+
+CATALOG = """[
+    {
+        "def": "AVLtree0.def", // first tree
+        "passability": [255, 255, 255, 255, 255, 127],
+        "allowed_landscapes": [0, 1]
+    },
+    {
+        "passability": [255, 255, 255, 255, 255, 63], // rock
+        "def": "AVLrk10.def"
+    },
+]
+"""
+
+
+def step_edit_returned_data(path):
+    data = load_catalog(path)
+    data[0]["def"] = "changed.def"
+    data[0]["passability"].append(0)
+    data.append({"def": "added.def"})
+
+
+def step_rewrite_file(path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(CATALOG.replace("// rock", "// rock\n        \"is_ground\": 1, // ground object"))
+
+
+def step_same_size_new_mtime(path):
+    stat = os.stat(path)
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content.replace("AVLtree0", "AVLtree1"))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def step_damage_snapshot(path):
+    with open(json_parser._snapshot_path(path), "wb") as f:
+        f.write(b"not a pickle")
+    json_parser._catalogs.clear()
+
+
+def step_truncate_snapshot(path):
+    snapshot = json_parser._snapshot_path(path)
+    with open(snapshot, "rb") as f:
+        content = f.read()
+    with open(snapshot, "wb") as f:
+        f.write(content[:len(content) // 2])
+    json_parser._catalogs.clear()
+
+
+def step_new_process(path):
+    json_parser._catalogs.clear()
+
+
+STEPS = [("first load", lambda path: None), ("edit returned data", step_edit_returned_data),
+         ("rewrite file", step_rewrite_file), ("same size, new mtime", step_same_size_new_mtime),
+         ("damaged snapshot", step_damage_snapshot), ("truncated snapshot", step_truncate_snapshot),
+         ("new process", step_new_process)]
+
+failed = False
+print(f"{'step':>22} {'snapshot':>9} {'result':>10}")
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, "catalog.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(CATALOG)
+    for name, step in STEPS:
+        step(path)
+        same = load_catalog(path) == load_json_with_comments(path) and load_catalog(path) == load_json_with_comments(path)
+        snapshot = os.path.exists(json_parser._snapshot_path(path))
+        failed = failed or not (same and snapshot)
+        print(f"{name:>22} {'yes' if snapshot else 'missing':>9} {'identical' if same else 'DIFFERENT':>10}")
+
+print(f"{'templates':>22} {'files':>9} {'load_catalog [ms]':>18} {'parsing [ms]':>13} {'result':>10}")
+paths = [os.path.join(folder, name) for folder in (TEMPLATES_DIR, os.path.join(TEMPLATES_DIR, "objects"))
+         for name in sorted(os.listdir(folder)) if name.endswith(".json")]
+for name in ["new process", "cached"]:
+    if name == "new process":
+        json_parser._catalogs.clear()
+    start = time.perf_counter()
+    cached = [load_catalog(path) for path in paths]
+    cached_time = time.perf_counter() - start
+    start = time.perf_counter()
+    parsed = [load_json_with_comments(path) for path in paths]
+    parsed_time = time.perf_counter() - start
+    same = cached == parsed
+    failed = failed or not same
+    print(f"{name:>22} {len(paths):>9} {cached_time * 1000:>18.1f} {parsed_time * 1000:>13.1f} "
+          f"{'identical' if same else 'DIFFERENT':>10}")
+
+print("FAILED" if failed else "OK")
@@ -0,0 +1,226 @@
+import os
+import sys
+import copy
+import time
+import random
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from generation.object_gen.json_parser import read_object_templates_from_json
+from generation.object_gen.object_template_helper import ObjectTemplateHelper
+from generation.object_gen.template_footprint import tiles_to_row_bits
+
+# Checks the footprint / row bitset placement checks of ObjectTemplateHelper against their previous
+# bit-by-bit implementations (kept below as reference) for every template of the template files,
+# at every position of maps with random occupancy, and reports the time of both versions.
+# Marking objects as occupied is checked the same way, including the offset around the objects.
+# mark_tiles (tiles of roads and forests) has to keep the row bitsets and the free tile pool equal to a rebuild.
+# The water object check is compared with its previous version with the water test fixed to (x, y) order.
+
+TEMPLATE_FILES = ["towns", "dwellings", "mines", "resources", "random_monsters", "artifacts", "water_obj",
+                  "special_buildings_level1", "special_buildings_level3", "grass_obj", "lava_obj"]
+
+
+def reference_validate_placement(helper, template, x, y):
+    if x < 0 or x >= helper.map_format or y < 0 or y >= helper.map_format:
+        return False
+    if not template.passability:
+        return False
+    for row in range(6):
+        for col in range(8):
+            tile_x = x - col
+            tile_y = y - 5 + row
+            passable = bool(not((template.passability[row] >> (7 - col)) & 1))
+            actionable = bool((template.actionability[row] >> (7 - col)) & 1)
+            if not (2 <= tile_x < helper.map_format - 2 and 2 <= tile_y < helper.map_format - 2):
+                if passable or actionable:
+                    return False
+                continue
+            if passable or actionable:
+                if helper.occupied_tiles[tile_y][tile_x]:
+                    return False
+                if (tile_x, tile_y) in helper.reserved_tiles:
+                    return False
+            if actionable:
+                neighbors_occupied = 0
+                for i in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                    nx = tile_x + i[0]
+                    ny = tile_y + i[1]
+                    if 0 <= nx < helper.map_format and 0 <= ny < helper.map_format:
+                        if helper.occupied_tiles[ny][nx] or (nx, ny) in helper.reserved_tiles:
+                            neighbors_occupied += 1
+                if neighbors_occupied == 4:
+                    return False
+    return True
+
+
+def reference_validate_placement_for_landscape(helper, template, x, y):
+    if x < 0 or x >= helper.map_format or y < 0 or y >= helper.map_format:
+        return False
+    if not template.passability:
+        return False
+    for row in range(6):
+        for col in range(8):
+            tile_x = x - col
+            tile_y = y - 5 + row
+            passable = bool(not((template.passability[row] >> (7 - col)) & 1))
+            actionable = bool((template.actionability[row] >> (7 - col)) & 1)
+            if not (0 <= tile_x < helper.map_format and 0 <= tile_y < helper.map_format):
+                if passable or actionable:
+                    return False
+                continue
+            if passable or actionable:
+                if helper.occupied_tiles_excluding_landscape[tile_y][tile_x] or (tile_x, tile_y) in helper.reserved_tiles:
+                    return False
+    return True
+
+
+def reference_validate_placement_for_water_objects(helper, template, x, y):
+    if x < 0 or x >= helper.map_format or y < 0 or y >= helper.map_format:
+        return False
+    if not template.passability:
+        return False
+    for row in range(6):
+        for col in range(8):
+            tile_x = x - col
+            tile_y = y - 5 + row
+            passable = bool(not((template.passability[row] >> (7 - col)) & 1))
+            actionable = bool((template.actionability[row] >> (7 - col)) & 1)
+            if not (0 <= tile_x < helper.map_format and 0 <= tile_y < helper.map_format):
+                if passable or actionable:
+                    return False
+                continue
+            if passable or actionable:
+                if helper.occupied_tiles[tile_y][tile_x] and (tile_x, tile_y) not in helper.water:
+                    return False
+                offset = 3
+                for i in range(-offset, offset + 1):
+                    for j in range(-offset, offset + 1):
+                        if (tile_x + i, tile_y + j) not in helper.reserved_tiles:
+                            return False
+    return True
+
+
+def reference_mark_object_tiles_as_occupied(helper, template, x, y, offset=0):
+    for row in range(6):
+        for col in range(8):
+            tile_x = x - col
+            tile_y = y - 5 + row
+            passable = bool(not((template.passability[row] >> (7 - col)) & 1))
+            actionable = bool((template.actionability[row] >> (7 - col)) & 1)
+            if passable or actionable:
+                helper.occupied_tiles_excluding_landscape[tile_y][tile_x] = True
+                if not actionable:
+                    helper.occupied_tiles_excluding_actionable[tile_y][tile_x] = True
+                helper.occupied_tiles[tile_y][tile_x] = True
+                for dy in range(-offset, offset + 1):
+                    for dx in range(-offset, offset + 1):
+                        nx = tile_x + dx
+                        ny = tile_y + dy
+                        if 0 <= nx < helper.map_format and 0 <= ny < helper.map_format:
+                            helper.occupied_tiles[ny][nx] = True
+                if actionable:
+                    helper.actionable_tiles.append((tile_x, tile_y))
+
+
+def random_helper(size: int, density: float) -> ObjectTemplateHelper:
+    """Helper with only the occupancy state set, occupancy is a set of random rectangles."""
+    helper = ObjectTemplateHelper.__new__(ObjectTemplateHelper)
+    helper.map_format = size
+    helper.actionable_tiles = []
+    helper.occupied_tiles = [[False] * size for _ in range(size)]
+    helper.occupied_tiles_excluding_landscape = [[False] * size for _ in range(size)]
+    helper.occupied_tiles_excluding_actionable = [[False] * size for _ in range(size)]
+    helper.reserved_tiles = set()
+    for _ in range(int(size * size * density / 6)):
+        x, y, w, h = random.randrange(size), random.randrange(size), random.randint(1, 4), random.randint(1, 3)
+        for ty in range(y, min(y + h, size)):
+            for tx in range(x, min(x + w, size)):
+                helper.occupied_tiles[ty][tx] = True
+                if random.random() < 0.7:
+                    helper.occupied_tiles_excluding_landscape[ty][tx] = True
+        if random.random() < 0.3:
+            helper.reserved_tiles.add((x, y))
+    # a few lakes: reserved (with a 1 tile shore) and mostly water
+    helper.water = []
+    for _ in range(4):
+        cx, cy, radius = random.randrange(size), random.randrange(size), random.randint(4, size // 4)
+        for ty in range(max(cy - radius - 1, 0), min(cy + radius + 2, size)):
+            for tx in range(max(cx - radius - 1, 0), min(cx + radius + 2, size)):
+                if (tx - cx) ** 2 + (ty - cy) ** 2 <= (radius + 1) ** 2:
+                    helper.reserved_tiles.add((tx, ty))
+                    if (tx - cx) ** 2 + (ty - cy) ** 2 <= radius ** 2 and random.random() < 0.9:
+                        helper.water.append((tx, ty))
+    helper.occupancy_version = 0
+    helper._distance_layers = None
+    helper.refresh_occupancy_rows()
+    helper.water_rows = tiles_to_row_bits(helper.water, size)
+    return helper
+
+
+templates = [template for name in TEMPLATE_FILES for template in read_object_templates_from_json(name)]
+checks = [("validate_placement", ObjectTemplateHelper.validate_placement, reference_validate_placement),
+          ("validate_placement_for_landscape", ObjectTemplateHelper.validate_placement_for_landscape,
+           reference_validate_placement_for_landscape),
+          ("validate_placement_for_water_objects", ObjectTemplateHelper.validate_placement_for_water_objects,
+           reference_validate_placement_for_water_objects)]
+
+failed = False
+print(f"{len(templates)} templates")
+print(f"{'check':>34} {'map':>10} {'calls':>8} {'time [ms]':>10} {'reference':>10} {'result':>10}")
+for seed, size, density in [(0, 36, 0.2), (1, 72, 0.4), (2, 144, 0.6)]:
+    random.seed(seed)
+    helper = random_helper(size, density)
+    positions = [(x, y) for y in range(-1, size + 1) for x in range(-1, size + 1)]
+    for name, function, reference in checks:
+        sampled = random.sample(templates, 12)
+        start = time.perf_counter()
+        actual = [function(helper, template, x, y) for template in sampled for x, y in positions]
+        function_time = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = [reference(helper, template, x, y) for template in sampled for x, y in positions]
+        reference_time = time.perf_counter() - start
+
+        same = actual == expected
+        failed = failed or not same
+        print(f"{name:>34} {f'{size} {density}':>10} {len(actual):>8} {function_time * 1000:>10.1f} "
+              f"{reference_time * 1000:>10.1f} {'identical' if same else 'DIFFERENT':>10}")
+
+    marked, expected = copy.deepcopy(helper), copy.deepcopy(helper)
+    for _ in range(200):
+        template, offset = random.choice(templates), random.randint(0, 4)
+        x, y = random.randrange(8, size), random.randrange(6, size)
+        marked.mark_object_tiles_as_occupied(template, x, y, offset)
+        reference_mark_object_tiles_as_occupied(expected, template, x, y, offset)
+    rows = (marked.occupied_rows, marked.occupied_rows_excluding_landscape)
+    marked.refresh_occupancy_rows()
+    same = (marked.occupied_tiles == expected.occupied_tiles
+            and marked.occupied_tiles_excluding_landscape == expected.occupied_tiles_excluding_landscape
+            and marked.occupied_tiles_excluding_actionable == expected.occupied_tiles_excluding_actionable
+            and marked.actionable_tiles == expected.actionable_tiles
+            and rows == (marked.occupied_rows, marked.occupied_rows_excluding_landscape))
+    failed = failed or not same
+    print(f"{'mark_object_tiles_as_occupied':>34} {f'{size} {density}':>10} {200:>8} {'':>10} {'':>10} "
+          f"{'identical' if same else 'DIFFERENT':>10}")
+
+    marked, expected = copy.deepcopy(helper), copy.deepcopy(helper)
+    marked.free_tile_sampler()
+    for _ in range(50):
+        tiles = [(random.randrange(size), random.randrange(size)) for _ in range(random.randint(0, 20))]
+        for_objects, for_landscape = random.choice([(True, True), (True, False), (False, True)])
+        marked.mark_tiles(tiles, for_objects=for_objects, for_landscape=for_landscape)
+        for x, y in tiles:
+            if for_objects:
+                expected.occupied_tiles[y][x] = True
+            if for_landscape:
+                expected.occupied_tiles_excluding_landscape[y][x] = True
+    rows = (marked.occupied_rows, marked.occupied_rows_excluding_landscape, marked.free_tile_sampler().rows)
+    marked.refresh_occupancy_rows()
+    same = (marked.occupied_tiles == expected.occupied_tiles
+            and marked.occupied_tiles_excluding_landscape == expected.occupied_tiles_excluding_landscape
+            and rows == (marked.occupied_rows, marked.occupied_rows_excluding_landscape, marked.free_tile_sampler().rows))
+    failed = failed or not same
+    print(f"{'mark_tiles':>34} {f'{size} {density}':>10} {50:>8} {'':>10} {'':>10} "
+          f"{'identical' if same else 'DIFFERENT':>10}")
+
+print("FAILED" if failed else "OK")
@@ -0,0 +1,169 @@
+import os
+import sys
+import copy
+import math
+import time
+import random
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from generation.object_gen.forest_placer import ForestPlacer, create_default_tree_types
+from generation.object_gen.json_parser import read_object_templates_from_json
+
+# Checks ForestPlacer against its previous implementation (kept below as reference): the spatial hash
+# used for the minimum distance between trees and the summed-area table used by find_cluster_center
+# have to give the same forests for the same random seed. Reports the time of both versions, and the
+# number of trees and their smallest distance for the Poisson-disk sampling mode.
+# can_place_object and mark_object_as_placed are checked against a bit by bit decoding of the templates
+# in the convention of ObjectTemplateHelper (object at (x, y) covers (x - col, y - 5 + row), bit 7 - col).
+
+
+def reference_covered_tiles(template, x, y):
+    tiles = []
+    for row in range(6):
+        for col in range(8):
+            passable = bool((template.passability[row] >> (7 - col)) & 1)
+            actionable = bool((template.actionability[row] >> (7 - col)) & 1)
+            if not passable or actionable:
+                tiles.append((x - col, y - 5 + row))
+    return tiles
+
+
+def reference_can_place_object(placer, template, x, y):
+    for tile_x, tile_y in reference_covered_tiles(template, x, y):
+        if not (0 <= tile_x < placer.map_width and 0 <= tile_y < placer.map_height):
+            return False
+        if placer.occupied_tiles[tile_y][tile_x]:
+            return False
+    return True
+
+
+def reference_find_cluster_center(placer, cluster_seed_x, cluster_seed_y, cluster_radius):
+    best_x, best_y = cluster_seed_x, cluster_seed_y
+    best_count = 0
+    for cx in range(max(0, cluster_seed_x - cluster_radius), min(placer.map_width, cluster_seed_x + cluster_radius + 1)):
+        for cy in range(max(0, cluster_seed_y - cluster_radius), min(placer.map_height, cluster_seed_y + cluster_radius + 1)):
+            free_count = 0
+            for dx in range(-2, 3):
+                for dy in range(-2, 3):
+                    if placer.is_tile_available(cx + dx, cy + dy):
+                        free_count += 1
+            if free_count > best_count:
+                best_count = free_count
+                best_x, best_y = cx, cy
+    return best_x, best_y
+
+
+def reference_generate_forest_on_region(placer, tree_types, region_tiles, density):
+    trees_placed = []
+    for _ in range(int(len(region_tiles) * density)):
+        tile_x, tile_y = random.choice(region_tiles)
+        if not placer.is_tile_available(tile_x, tile_y):
+            continue
+        tree_type = random.choice(tree_types)
+        if placer.can_place_object(tree_type.template, tile_x, tile_y):
+            too_close = False
+            for placed_x, placed_y, _ in trees_placed:
+                if math.sqrt((tile_x - placed_x) ** 2 + (tile_y - placed_y) ** 2) < tree_type.min_distance:
+                    too_close = True
+                    break
+            if not too_close:
+                placer.mark_object_as_placed(tree_type.template, tile_x, tile_y)
+                trees_placed.append((tile_x, tile_y, tree_type.template))
+    return trees_placed
+
+
+def random_occupancy(size: int, density: float) -> list[list[bool]]:
+    occupied = [[False] * size for _ in range(size)]
+    for _ in range(int(size * size * density / 6)):
+        x, y, w, h = random.randrange(size), random.randrange(size), random.randint(1, 4), random.randint(1, 3)
+        for ty in range(y, min(y + h, size)):
+            for tx in range(x, min(x + w, size)):
+                occupied[ty][tx] = True
+    return occupied
+
+
+def smallest_distance(trees) -> float:
+    return min((math.dist(a[:2], b[:2]) for i, a in enumerate(trees) for b in trees[i + 1:]), default=math.inf)
+
+
+tree_types = create_default_tree_types(read_object_templates_from_json("grass_obj")[:5])
+for tree_type in tree_types:
+    tree_type.min_distance = 2
+
+failed = False
+templates = [template for name in ["grass_obj", "dirt_obj", "towns", "mines"] for template in read_object_templates_from_json(name)]
+print(f"{'map':>10} {'checks':>8} {'time [ms]':>10} {'reference':>10} {'result':>10}")
+for seed, size, occupancy in [(3, 72, 0.5), (4, 144, 1.0)]:
+    random.seed(seed)
+    placer = ForestPlacer(size, size, random_occupancy(size, occupancy))
+    sampled = random.sample(templates, 10)
+    positions = [(x, y) for y in range(-1, size + 1) for x in range(-1, size + 1)]
+    start = time.perf_counter()
+    actual = [placer.can_place_object(template, x, y) for template in sampled for x, y in positions]
+    actual_time = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = [reference_can_place_object(placer, template, x, y) for template in sampled for x, y in positions]
+    reference_time = time.perf_counter() - start
+
+    expected_tiles = copy.deepcopy(placer.occupied_tiles)
+    for _ in range(300):
+        template, x, y = random.choice(templates), random.randrange(size), random.randrange(size)
+        placer.mark_object_as_placed(template, x, y)
+        for tile_x, tile_y in reference_covered_tiles(template, x, y):
+            if 0 <= tile_x < size and 0 <= tile_y < size:
+                expected_tiles[tile_y][tile_x] = True
+    rows = placer.occupied_rows
+    placer.refresh_occupancy_rows()
+    same = actual == expected and placer.occupied_tiles == expected_tiles and rows == placer.occupied_rows
+    failed = failed or not same
+    print(f"{size:>10} {len(actual):>8} {actual_time * 1000:>10.1f} {reference_time * 1000:>10.1f} "
+          f"{'identical' if same else 'DIFFERENT':>10}")
+
+print(f"{'map':>10} {'region':>7} {'mode':>8} {'trees':>6} {'min dist':>9} {'time [ms]':>10} {'reference':>10} {'result':>10}")
+for seed, size, occupancy, region_size, density in [(0, 72, 0.3, 400, 0.4), (1, 144, 0.3, 3000, 0.5), (2, 144, 0.6, 8000, 0.8)]:
+    random.seed(seed)
+    occupied = random_occupancy(size, occupancy)
+    x0, y0 = random.randrange(size // 2), random.randrange(size // 2)
+    side = int(math.sqrt(region_size))
+    region = [(x, y) for y in range(y0, min(y0 + side, size)) for x in range(x0, min(x0 + side, size))]
+
+    placer = ForestPlacer(size, size, copy.deepcopy(occupied))
+    random.seed(seed)
+    start = time.perf_counter()
+    actual = placer.generate_forest_on_region(tree_types, region, density)
+    actual_time = time.perf_counter() - start
+    reference_placer = ForestPlacer(size, size, copy.deepcopy(occupied))
+    random.seed(seed)
+    start = time.perf_counter()
+    expected = reference_generate_forest_on_region(reference_placer, tree_types, region, density)
+    reference_time = time.perf_counter() - start
+    same = actual == expected and placer.occupied_tiles == reference_placer.occupied_tiles
+    failed = failed or not same
+    print(f"{size:>10} {len(region):>7} {'random':>8} {len(actual):>6} {smallest_distance(actual):>9.2f} "
+          f"{actual_time * 1000:>10.1f} {reference_time * 1000:>10.1f} {'identical' if same else 'DIFFERENT':>10}")
+
+    placer = ForestPlacer(size, size, copy.deepcopy(occupied))
+    random.seed(seed)
+    start = time.perf_counter()
+    trees = placer.generate_forest_on_region(tree_types, region, density, sampling="poisson")
+    poisson_time = time.perf_counter() - start
+    ok = smallest_distance(trees) >= 2 and all((x, y) in set(region) for x, y, _ in trees)
+    failed = failed or not ok
+    print(f"{size:>10} {len(region):>7} {'poisson':>8} {len(trees):>6} {smallest_distance(trees):>9.2f} "
+          f"{poisson_time * 1000:>10.1f} {'':>10} {'OK' if ok else 'WRONG':>10}")
+
+    placer = ForestPlacer(size, size, copy.deepcopy(occupied))
+    queries = [(random.randrange(size), random.randrange(size), random.randint(3, 12)) for _ in range(50)]
+    start = time.perf_counter()
+    centers = [placer.find_cluster_center(x, y, radius) for x, y, radius in queries]
+    actual_time = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = [reference_find_cluster_center(placer, x, y, radius) for x, y, radius in queries]
+    reference_time = time.perf_counter() - start
+    same = centers == expected
+    failed = failed or not same
+    print(f"{size:>10} {'':>7} {'centers':>8} {len(queries):>6} {'':>9} {actual_time * 1000:>10.1f} "
+          f"{reference_time * 1000:>10.1f} {'identical' if same else 'DIFFERENT':>10}")
+
+print("FAILED" if failed else "OK")
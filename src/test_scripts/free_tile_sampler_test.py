@@ -0,0 +1,101 @@
+import os
+import sys
+import time
+import random
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from generation.object_gen.free_tile_sampler import FreeTileSampler
+from generation.object_gen.json_parser import read_object_templates_from_json
+from generation.object_gen.object_template_helper import ObjectTemplateHelper, ONE_BY_ONE_TEMPLATE
+
+# Checks the pool of free positions used by find_place_one_by_one:
+# 1. FreeTileSampler.tile(i) enumerates exactly the set bits of its rows, row by row, also after rows are replaced.
+# 2. While objects are marked on maps with random occupancy, the pool of ObjectTemplateHelper stays equal to
+#    a freshly computed one and every drawn position passes validate_placement_for_landscape.
+# Reports the time of drawing positions against the previous search (100 random points, each followed by
+# find_alternative_position with max_offset=5, kept below as reference) while the map fills up.
+
+
+def reference_find_place_one_by_one(helper):
+    for _ in range(100):
+        x, y = random.randint(0, helper.map_format), random.randint(0, helper.map_format)
+        final_x, final_y = helper.find_alternative_position(ONE_BY_ONE_TEMPLATE, x, y, max_offset=5,
+                                                            validation_function=helper.validate_placement_for_landscape)
+        if final_x is not None and final_y is not None:
+            return final_x, final_y
+    return None, None
+
+
+def random_helper(size: int, density: float) -> ObjectTemplateHelper:
+    """Helper with only the occupancy state set, occupancy is a set of random rectangles."""
+    helper = ObjectTemplateHelper.__new__(ObjectTemplateHelper)
+    helper.map_format = size
+    helper.actionable_tiles = []
+    helper.occupied_tiles = [[False] * size for _ in range(size)]
+    helper.occupied_tiles_excluding_landscape = [[False] * size for _ in range(size)]
+    helper.occupied_tiles_excluding_actionable = [[False] * size for _ in range(size)]
+    helper.reserved_tiles = set()
+    for _ in range(int(size * size * density / 6)):
+        x, y, w, h = random.randrange(size), random.randrange(size), random.randint(1, 4), random.randint(1, 3)
+        for ty in range(y, min(y + h, size)):
+            for tx in range(x, min(x + w, size)):
+                helper.occupied_tiles[ty][tx] = True
+                if random.random() < 0.7:
+                    helper.occupied_tiles_excluding_landscape[ty][tx] = True
+        if random.random() < 0.3:
+            helper.reserved_tiles.add((x, y))
+    helper.occupancy_version = 0
+    helper._distance_layers = None
+    helper._free_tile_sampler = None
+    helper.refresh_occupancy_rows()
+    return helper
+
+
+failed = False
+
+random.seed(0)
+for height, width in [(1, 1), (7, 40), (144, 144)]:
+    rows = [random.getrandbits(width) & random.getrandbits(width) for _ in range(height)]
+    sampler = FreeTileSampler(rows)
+    for _ in range(20):
+        y = random.randrange(height)
+        rows[y] = random.getrandbits(width) if random.random() < 0.7 else 0
+        sampler.update_row(y, rows[y])
+    expected = [(x, y) for y, row in enumerate(rows) for x in range(width) if row >> x & 1]
+    same = len(sampler) == len(expected) and [sampler.tile(i) for i in range(len(sampler))] == expected
+    failed = failed or not same
+    print(f"FreeTileSampler {height}x{width}: {len(expected)} tiles, {'identical' if same else 'DIFFERENT'}")
+
+templates = [template for name in ["resources", "random_monsters", "artifacts", "mines"]
+             for template in read_object_templates_from_json(name)]
+
+print(f"{'map':>10} {'placed':>7} {'sampler [ms]':>13} {'reference [ms]':>15} {'ref. misses':>12} {'result':>7}")
+for seed, size, density, count in [(1, 72, 0.5, 150), (2, 144, 0.5, 400), (3, 144, 1.5, 400), (4, 144, 3.0, 300), (5, 144, 4.0, 1500)]:
+    random.seed(seed)
+    helper = random_helper(size, density)
+    ok = True
+    sampler_time = reference_time = 0.0
+    misses = placed = 0
+    for _ in range(count):
+        start = time.perf_counter()
+        position = helper.find_place_one_by_one()
+        sampler_time += time.perf_counter() - start
+        start = time.perf_counter()
+        if reference_find_place_one_by_one(helper) == (None, None):
+            misses += 1
+        reference_time += time.perf_counter() - start
+        if position == (None, None):
+            ok = ok and len(helper.free_tile_sampler()) == 0
+            break
+        ok = ok and helper.validate_placement_for_landscape(ONE_BY_ONE_TEMPLATE, *position)
+        helper.mark_object_tiles_as_occupied(random.choice(templates), *position, random.randint(0, 1))
+        placed += 1
+
+    rows = [helper.free_anchor_row_for_landscape(ONE_BY_ONE_TEMPLATE, y) for y in range(size)]
+    ok = ok and helper.free_tile_sampler().rows == rows
+    failed = failed or not ok
+    print(f"{f'{size} {density}':>10} {placed:>7} {sampler_time * 1000:>13.1f} {reference_time * 1000:>15.1f} "
+          f"{misses:>12} {'OK' if ok else 'WRONG':>7}")
+
+print("FAILED" if failed else "OK")
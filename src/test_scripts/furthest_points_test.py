@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+import random
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from generation.object_gen.object_template_helper import ObjectTemplateHelper
+
+# Checks the bitset distance transform of ObjectTemplateHelper (occupancy_distance_layers, find_furthest_points)
+# against a brute force Chebyshev distance to the nearest occupied tile, on maps with random occupancy.
+
+
+def random_helper(size: int, occupied_count: int) -> ObjectTemplateHelper:
+    helper = ObjectTemplateHelper.__new__(ObjectTemplateHelper)
+    helper.map_format = size
+    helper.occupied_tiles = [[False] * size for _ in range(size)]
+    helper.occupied_tiles_excluding_landscape = [[False] * size for _ in range(size)]
+    helper.reserved_tiles = set()
+    for _ in range(occupied_count):
+        helper.occupied_tiles[random.randrange(size)][random.randrange(size)] = True
+    helper.occupancy_version = 0
+    helper._distance_layers = None
+    helper.refresh_occupancy_rows()
+    return helper
+
+
+def reference_distances(helper) -> dict[tuple[int, int], int]:
+    size = helper.map_format
+    occupied = [(x, y) for y in range(size) for x in range(size) if helper.occupied_tiles[y][x]]
+    return {(x, y): min(max(abs(x - ox), abs(y - oy)) for ox, oy in occupied) for y in range(size) for x in range(size)}
+
+
+failed = False
+print(f"{'map':>8} {'occupied':>9} {'max distance':>13} {'time [ms]':>10} {'result':>10}")
+for seed, size, occupied_count in [(0, 36, 3), (1, 72, 20), (2, 72, 1), (3, 144, 40)]:
+    random.seed(seed)
+    helper = random_helper(size, occupied_count)
+    start = time.perf_counter()
+    layers = helper.occupancy_distance_layers()
+    points = helper.find_furthest_points(10)
+    elapsed = time.perf_counter() - start
+
+    expected = reference_distances(helper)
+    distances = {(x, y): distance for distance, layer in enumerate(layers)
+                 for y, row in enumerate(layer) for x in range(size) if row >> x & 1}
+    inner = sorted(((-distance, y, x) for (x, y), distance in expected.items()
+                    if 5 <= x < size - 5 and 5 <= y < size - 5))[:10]
+    same = distances == expected and points == [(x, y, -distance) for distance, y, x in inner]
+    failed = failed or not same
+    print(f"{size:>8} {occupied_count:>9} {points[0][2]:>13} {elapsed * 1000:>10.1f} {'identical' if same else 'DIFFERENT':>10}")
+
+print("FAILED" if failed else "OK")
@@ -0,0 +1,74 @@
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import contextlib
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from classes.H3mWriter import H3mWriter, load_map_json
+from generation.map_gen.map_gen import generate_voronoi_map
+from ui.functions.filter_none_values import filter_none_values
+
+# Checks the native .h3m writer against the JSON path.
+# 1. Every sample map in sprite_usage_maps/ is encoded from its JSON and compared byte by byte
+#    with the (decompressed) .h3m produced by h3mtxt.exe.
+# 2. A freshly generated map is encoded straight from the Map object and from its JSON
+#    representation; both encodings have to be identical.
+
+SAMPLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'sprite_usage_maps'))
+
+
+def first_difference(a: bytes, b: bytes) -> int:
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return i
+    return min(len(a), len(b))
+
+
+failed = False
+
+print("Sample maps (JSON -> native writer vs h3mtxt.exe output):")
+for filename in sorted(os.listdir(SAMPLES_DIR)):
+    if not filename.endswith(".json"):
+        continue
+    name = filename[:-len(".json")]
+    h3m_path = os.path.join(SAMPLES_DIR, f"{name}.h3m")
+    if not os.path.exists(h3m_path):
+        print(f"  {name}: no .h3m to compare with, skipped")
+        continue
+
+    with gzip.open(h3m_path, "rb") as f:
+        expected = f.read()
+    actual = H3mWriter().write_map_dict(load_map_json(os.path.join(SAMPLES_DIR, filename)))
+    if actual == expected:
+        print(f"  {name}: identical ({len(actual)} bytes)")
+    else:
+        failed = True
+        differing = sum(x != y for x, y in zip(actual, expected))
+        print(f"  {name}: DIFFERENT - first difference at byte {first_difference(actual, expected)}, "
+              f"{differing} differing bytes, sizes {len(actual)} / {len(expected)}")
+
+print("Generated map (Map object vs JSON representation):")
+for size in [72, 144]:
+    random.seed(size)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        map, _, _, _ = generate_voronoi_map(size=size, players_count=4, player_cities=4)
+
+    start = time.perf_counter()
+    json_representation = json.dumps(filter_none_values(map.to_dict()), indent=2)
+    from_json = H3mWriter().write_map_dict(json.loads(json_representation))
+    json_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from_map = H3mWriter().write_map(map)
+    native_time = time.perf_counter() - start
+
+    status = "identical" if from_map == from_json else f"DIFFERENT at byte {first_difference(from_map, from_json)}"
+    failed = failed or from_map != from_json
+    print(f"  {size}x{size}: {status}, {len(map.objects)} objects, "
+          f"via JSON {json_time * 1000:.0f} ms, native {native_time * 1000:.0f} ms")
+
+print("FAILED" if failed else "OK")
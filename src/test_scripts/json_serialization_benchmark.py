@@ -0,0 +1,123 @@
+import gc
+import os
+import sys
+import json
+import time
+import pickle
+import random
+import tempfile
+import contextlib
+import subprocess
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Compares writing a map JSON file the old way (to_dict -> filter_none_values -> json.dumps)
+# with the streaming MapJsonWriter. Every measurement runs in a fresh process that only loads
+# the pickled map, so the peak RSS growth belongs to the serialization alone.
+# On Linux the peak RSS counter is reset after loading the map, so the growth is exact.
+# Elsewhere the peak comes from the 'resource' module (or is not reported on Windows) and
+# growth smaller than the unpickling peak may be hidden.
+
+MODES = ["dumps indent=2", "stream indent=2", "dumps compact", "stream compact"]
+SIZES = [72, 144]
+
+
+def reset_peak_rss() -> bool:
+    """Reset the peak RSS counter of this process (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_kb() -> int | None:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def current_rss_kb() -> int | None:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_kb()
+
+
+def run_child(mode: str, map_path: str, output_path: str) -> None:
+    from ui.functions.filter_none_values import filter_none_values
+    from classes.MapJsonWriter import save_map_json
+
+    with open(map_path, "rb") as f:
+        map = pickle.load(f)
+    gc.collect()
+    reset_peak_rss()
+    rss_before = current_rss_kb()
+
+    start = time.perf_counter()
+    compact = mode.endswith("compact")
+    if mode.startswith("stream"):
+        save_map_json(map, output_path, compact=compact)
+    else:
+        map_dict = filter_none_values(map.to_dict())
+        if compact:
+            text = json.dumps(map_dict, separators=(",", ":"))
+        else:
+            text = json.dumps(map_dict, indent=2)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    elapsed = time.perf_counter() - start
+
+    rss_after = peak_rss_kb()
+    growth = None if rss_before is None or rss_after is None else max(0, rss_after - rss_before)
+    print(json.dumps({"seconds": elapsed, "rss_growth_kb": growth, "bytes": os.path.getsize(output_path)}))
+
+
+def main() -> None:
+    from generation.map_gen.map_gen import generate_voronoi_map
+
+    print(f"{'size':>5} {'mode':>16} {'time [ms]':>10} {'peak RSS growth [MB]':>21} {'file [MB]':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            random.seed(size)
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                map, _, _, _ = generate_voronoi_map(size=size, players_count=4, player_cities=4)
+            map_path = os.path.join(tmp, f"map_{size}.pkl")
+            with open(map_path, "wb") as f:
+                pickle.dump(map, f)
+
+            outputs = {}
+            for mode in MODES:
+                output_path = os.path.join(tmp, f"map_{size}_{mode.replace(' ', '_')}.json")
+                result = subprocess.run([sys.executable, __file__, "--child", mode, map_path, output_path],
+                                        capture_output=True, text=True, check=True)
+                stats = json.loads(result.stdout.strip().splitlines()[-1])
+                rss = "n/a" if stats["rss_growth_kb"] is None else f"{stats['rss_growth_kb'] / 1024:.1f}"
+                print(f"{size:>5} {mode:>16} {stats['seconds'] * 1000:>10.0f} {rss:>21} {stats['bytes'] / 2**20:>10.2f}")
+                with open(output_path, "r", encoding="utf-8") as f:
+                    outputs[mode] = f.read()
+
+            same_indent = outputs["dumps indent=2"] == outputs["stream indent=2"]
+            same_compact = outputs["dumps compact"] == outputs["stream compact"]
+            print(f"{size:>5} identical output: indent=2 {same_indent}, compact {same_compact}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3], sys.argv[4])
+    else:
+        main()
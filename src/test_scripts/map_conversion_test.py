@@ -1,6 +1,11 @@
 import tkinter as tk
 from tkinter import filedialog
 import os
+import sys
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from classes.H3mWriter import load_map_json, save_h3m
 
 root = tk.Tk()
 root.withdraw()
@@ -29,9 +34,9 @@ new_file_path = os.path.join(output_folder, f'{new_filename}.h3m')
 
 print("Converting JSON to h3m...")
 try:
-    os.system(f'h3mtxt.exe {input_file_path} {new_file_path}')
+    save_h3m(load_map_json(input_file_path), new_file_path)
     print("Conversion completed successfully.")
-    print(f"New file created at: {new_file_path}.h3m")
+    print(f"New file created at: {new_file_path}")
 
 except Exception as e:
     print(f"Failed to convert file: {e}")
\ No newline at end of file
@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+import heapq
+import random
+from math import sqrt
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from generation.tile_gen.roads_gen.RoadGenerator import RoadGenerator
+
+# Checks RoadGenerator.get_paths_endpoints_with_mst against the previous Prim's algorithm over all
+# n^2 edges (kept below as reference): same edges in the same order, also with duplicated points.
+# Then compares the time of both for growing numbers of entry points on a 144x144 map.
+
+
+def reference_mst(points):
+    adj_list = [[] for _ in points]
+    for i, (x1, y1) in enumerate(points):
+        for j, (x2, y2) in enumerate(points):
+            if x1 != x2 or y1 != y2:
+                adj_list[i].append((j, sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)))
+    if not points:
+        return []
+
+    visited = {0}
+    paths_endpoints = []
+    edge_heap = []
+    for other_node_idx, edge_len in adj_list[0]:
+        heapq.heappush(edge_heap, (edge_len, 0, other_node_idx))
+    while len(visited) < len(points):
+        edge_len, node_idx, other_node_idx = heapq.heappop(edge_heap)
+        if other_node_idx not in visited:
+            visited.add(other_node_idx)
+            paths_endpoints.append((points[node_idx], points[other_node_idx]))
+            for on, e in adj_list[other_node_idx]:
+                heapq.heappush(edge_heap, (e, other_node_idx, on))
+    return paths_endpoints
+
+
+generator = RoadGenerator(size=144, terrain_map=[], entry_points=[],
+                          occupied_tiles_excluding_landscape=[], occupied_tiles_excluding_actionable=[])
+rng = random.Random(0)
+
+failed = False
+checked = 0
+for _ in range(500):
+    map_size = rng.choice([6, 24, 144])
+    points = [(rng.randrange(map_size), rng.randrange(map_size)) for _ in range(rng.randint(2, 120))]
+    if len(set(points)) < 2:
+        continue
+    checked += 1
+    if generator.get_paths_endpoints_with_mst(points) != reference_mst(points):
+        failed = True
+        print(f"DIFFERENT for points {points}")
+print(f"{checked} random point sets compared with the reference")
+
+print(f"{'points':>7} {'grid Prim [ms]':>15} {'reference [ms]':>15}")
+for count in [100, 400, 1000, 2000]:
+    points = [(rng.randrange(144), rng.randrange(144)) for _ in range(count)]
+    start = time.perf_counter()
+    result = generator.get_paths_endpoints_with_mst(points)
+    grid_time = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = reference_mst(points)
+    reference_time = time.perf_counter() - start
+    failed = failed or result != expected
+    print(f"{count:>7} {grid_time * 1000:>15.0f} {reference_time * 1000:>15.0f}")
+
+print("FAILED" if failed else "OK")
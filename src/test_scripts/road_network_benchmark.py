@@ -0,0 +1,71 @@
+import os
+import sys
+import copy
+import time
+import random
+import contextlib
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import generation.map_gen.map_gen as map_gen
+from generation.tile_gen.roads_gen.RoadGenerator import RoadGenerator, ROAD_NETWORK_MODES
+
+# Compares the road network modes of RoadGenerator on the inputs of real generated maps
+# (every map has far more than 40 entry points): time of generate(), number of road tiles,
+# and the number of groups of entry points the roads connect (1 - everything is connected).
+
+MAPS = [(72, 8, 0), (108, 8, 1), (144, 8, 2), (144, 8, 3)]
+
+
+class RecordingRoadGenerator(RoadGenerator):
+    """Keeps a copy of the arguments of every road generator created by generate_voronoi_map."""
+    recorded = []
+
+    def __init__(self, **kwargs):
+        RecordingRoadGenerator.recorded.append(copy.deepcopy(kwargs))
+        super().__init__(**kwargs)
+
+
+def connected_groups(paths, entry_points) -> int:
+    """Number of groups of entry points connected to each other by road tiles."""
+    height, width = len(paths), len(paths[0])
+    seen = set()
+    groups = 0
+    for start in set(entry_points):
+        if start in seen:
+            continue
+        groups += 1
+        stack = [start]
+        seen.add(start)
+        while stack:
+            x, y = stack.pop()
+            for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if 0 <= nx < width and 0 <= ny < height and (nx, ny) not in seen \
+                        and (paths[ny][nx] is not None or (nx, ny) in entry_points):
+                    seen.add((nx, ny))
+                    stack.append((nx, ny))
+    return groups
+
+
+map_gen.RoadGenerator = RecordingRoadGenerator
+
+print(f"{'map':>12} {'entry points':>13} {'mode':>8} {'time [ms]':>10} {'road tiles':>11} {'groups':>7}")
+for size, players, seed in MAPS:
+    RecordingRoadGenerator.recorded.clear()
+    random.seed(seed)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        map_gen.generate_voronoi_map(size=size, players_count=players, player_cities=players)
+    arguments = RecordingRoadGenerator.recorded[-1]
+    entry_points = set(arguments["entry_points"])
+
+    for mode in ROAD_NETWORK_MODES:
+        generator = RoadGenerator(**{**copy.deepcopy(arguments), "network_mode": mode})
+        random.seed(seed)
+        start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            paths = generator.generate()
+        elapsed = time.perf_counter() - start
+
+        road_tiles = sum(cell is not None for row in paths for cell in row)
+        print(f"{f'{size}x{size} #{seed}':>12} {len(arguments['entry_points']):>13} {mode:>8} {elapsed * 1000:>10.0f} "
+              f"{road_tiles:>11} {connected_groups(paths, entry_points):>7}")
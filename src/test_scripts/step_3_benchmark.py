@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+import random
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from generation.object_gen.city_gen.VoronoiCityPlacer import VoronoiCityPlacer
+
+# Measures VoronoiCityPlacer.generate_step_3 for a growing number of regions on a 144x144 map.
+# The last column is the cost of one all-pairs adjacency scan with are_regions_adjacent,
+# which is what every BFS node paid before step 3 used the precomputed region adjacency graph.
+
+MAP_SIZE = 144
+MIN_DISTANCE = 30
+REPEATS = 3
+
+print(f"{'regions':>8} {'cities':>7} {'step 3 [ms]':>12} {'pairwise scan [ms]':>19}")
+for total_regions in [16, 32, 48, 64, 96, 128]:
+    total_cities = max(2, total_regions // 4)
+    step_3_time = 0.0
+    pairwise_time = 0.0
+
+    for repeat in range(REPEATS):
+        random.seed(repeat)
+        placer = VoronoiCityPlacer(MAP_SIZE)
+        all_regions, region_min_distance, regions_count = placer.generate_step_1(MIN_DISTANCE, set(), total_regions)
+        _, city_regions = placer.generate_step_2(total_cities, 0, all_regions)
+
+        start = time.perf_counter()
+        placer.generate_step_3(region_min_distance, set(), total_cities, city_regions, all_regions, regions_count)
+        step_3_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for region in all_regions:
+            for other in all_regions:
+                if other is not region:
+                    placer.are_regions_adjacent(region, other)
+        pairwise_time += time.perf_counter() - start
+
+    print(f"{regions_count:>8} {total_cities:>7} {step_3_time / REPEATS * 1000:>12.1f} {pairwise_time / REPEATS * 1000:>19.1f}")
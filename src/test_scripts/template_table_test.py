@@ -0,0 +1,51 @@
+import os
+import sys
+import json
+import random
+import contextlib
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from classes.H3mWriter import H3mWriter
+from classes.ObjectsTemplate import ObjectsTemplate
+from generation.map_gen.map_gen import generate_voronoi_map
+from generation.object_gen.object_template_helper import ObjectTemplateHelper
+
+# Checks the objects_templates table of generated maps, where equal templates are stored once:
+# every record of the table is distinct, the default template stays at index 0, and every
+# object points at the template it was placed with (recorded by wrapping ObjectTemplateHelper.add_object).
+# Reports the size of the table against one template per object, and the size of the .h3m output.
+
+MAPS = [(72, 8, 0), (108, 8, 1), (144, 8, 2)]
+
+placed = []
+add_object = ObjectTemplateHelper.add_object
+
+
+def recording_add_object(self, template, object):
+    placed.append((json.dumps(template.to_dict()), object))
+    return add_object(self, template, object)
+
+
+ObjectTemplateHelper.add_object = recording_add_object
+
+failed = False
+print(f"{'map':>12} {'objects':>8} {'templates':>10} {'distinct':>9} {'h3m bytes':>10} {'result':>7}")
+for size, players, seed in MAPS:
+    placed.clear()
+    random.seed(seed)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        generated, _, _, _ = generate_voronoi_map(size=size, players_count=players, player_cities=players)
+    templates = [json.dumps(template.to_dict()) for template in generated.objects_templates]
+
+    ok = len(set(templates)) == len(templates)
+    ok = ok and templates[0] == json.dumps(ObjectsTemplate.create_default().to_dict())
+    ok = ok and [object for _, object in placed] == generated.objects
+    ok = ok and all(templates[object.template_idx] == template for template, object in placed)
+    failed = failed or not ok
+
+    h3m_size = len(H3mWriter().write_map(generated))
+    print(f"{f'{size}x{size} #{seed}':>12} {len(generated.objects):>8} {len(templates):>10} "
+          f"{len(set(templates)):>9} {h3m_size:>10} {'OK' if ok else 'WRONG':>7}")
+
+print("FAILED" if failed else "OK")
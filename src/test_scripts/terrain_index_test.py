@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import random
+import contextlib
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import generation.map_gen.map_gen as map_gen
+from classes.tile.Tile import TerrainType
+from generation.object_gen.object_template_helper import ObjectTemplateHelper
+
+# Checks the per terrain row bitsets of ObjectTemplateHelper on generated maps, just before generate_forests:
+# the free tiles of every terrain and count_each_terrain_free_tiles against plain scans of the map
+# (tile (x, y) is tiles[y * size + x] and occupied_tiles_excluding_landscape[y][x]).
+# Reports the time of generate_forests, which places the decorations of all terrains from these bitsets.
+
+MAPS = [(72, 4, 1), (108, 4, 3), (144, 8, 2)]
+
+results = []
+generate_forests = ObjectTemplateHelper.generate_forests
+
+
+def checked_generate_forests(self):
+    ok = check(self)
+    start = time.perf_counter()
+    generate_forests(self)
+    results.append((ok, time.perf_counter() - start))
+
+
+def check(helper) -> bool:
+    size = helper.map_format
+    for terrain in TerrainType:
+        free = [(x, y) for y in range(size) for x in range(size)
+                if helper.tiles[y * size + x].terrain_type == terrain.value
+                and not helper.occupied_tiles_excluding_landscape[y][x] and (x, y) not in helper.reserved_tiles]
+        rows = helper.free_terrain_rows(terrain)
+        if free != [(x, y) for y in range(size) for x in range(size) if rows[y] >> x & 1]:
+            return False
+
+    counters = [0] * len(TerrainType)
+    for y in range(size):
+        for x in range(size):
+            if not helper.occupied_tiles_excluding_landscape[y][x]:
+                counters[helper.tiles[y * size + x].terrain_type] += 1
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return helper.count_each_terrain_free_tiles() == [counter / (size * size) for counter in counters]
+
+
+ObjectTemplateHelper.generate_forests = checked_generate_forests
+
+failed = False
+print(f"{'map':>12} {'objects':>8} {'forests [ms]':>13} {'result':>7}")
+for size, players, seed in MAPS:
+    results.clear()
+    random.seed(seed)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        generated, _, _, _ = map_gen.generate_voronoi_map(size=size, players_count=players, player_cities=players)
+    ok, elapsed = results[-1]
+    failed = failed or not ok
+    print(f"{f'{size}x{size} #{seed}':>12} {len(generated.objects):>8} {elapsed * 1000:>13.1f} {'OK' if ok else 'WRONG':>7}")
+
+print("FAILED" if failed else "OK")
@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import random
+import contextlib
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from classes.tile.Tile import TerrainType
+from generation.map_gen.utils import upscale_map, smooth_map, _get_corner, _is_part_of_valid_block
+from generation.tile_gen.terrain_gen.VoronoiTerrainGenerator import VoronoiTerrainGenerator
+
+# Checks upscale_map and smooth_map against their previous tile-by-tile implementations
+# (kept below as reference) on fixed seeds and reports the time of both versions.
+# Noise maps are smoothed without upscaling, so that many corners interact with each other.
+
+TERRAIN_WEIGHTS = {
+    TerrainType.WATER: 1,
+    TerrainType.GRASS: 3,
+    TerrainType.SAND: 2,
+    TerrainType.DIRT: 3,
+}
+
+
+def reference_upscale_map(terrain_map):
+    height, width = len(terrain_map), len(terrain_map[0])
+    upscaled_map = [[None for _ in range(width * 2)] for _ in range(height * 2)]
+    for y in range(height):
+        for x in range(width):
+            terrain_type = terrain_map[y][x]
+            upscaled_map[2*y][2*x] = terrain_type
+            upscaled_map[2*y][2*x + 1] = terrain_type
+            upscaled_map[2*y + 1][2*x] = terrain_type
+            upscaled_map[2*y + 1][2*x + 1] = terrain_type
+    return upscaled_map
+
+
+def reference_smooth_map(terrain_map):
+    height, width = len(terrain_map), len(terrain_map[0])
+    new_map = [[terrain_map[y][x] for x in range(width)] for y in range(height)]
+    for y in range(height):
+        for x in range(width):
+            corner = _get_corner(y, x, new_map)
+            if corner is None:
+                continue
+            old_terrain = new_map[y][x]
+            sy, sx = corner["different"][0]
+            new_map[y][x] = new_map[sy][sx]
+            for dy, dx in corner["same"]:
+                if not _is_part_of_valid_block(dy, dx, new_map):
+                    new_map[y][x] = old_terrain
+                    break
+    return new_map
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+failed = False
+print(f"{'map':>16} {'upscale [ms]':>13} {'reference':>10} {'smooth [ms]':>12} {'reference':>10} {'result':>10}")
+for seed in range(3):
+    for size in [36, 72, 144]:
+        random.seed(seed)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            terrain_map = VoronoiTerrainGenerator(height=size // 2, width=size // 2, terrain_weights=TERRAIN_WEIGHTS).generate_map()
+
+        upscaled, upscale_time = timed(upscale_map, terrain_map)
+        expected_upscaled, reference_upscale_time = timed(reference_upscale_map, terrain_map)
+        smoothed, smooth_time = timed(smooth_map, expected_upscaled)
+        expected_smoothed, reference_smooth_time = timed(reference_smooth_map, expected_upscaled)
+
+        same = upscaled == expected_upscaled and smoothed == expected_smoothed
+        failed = failed or not same
+        print(f"{f'voronoi {size} #{seed}':>16} {upscale_time * 1000:>13.1f} {reference_upscale_time * 1000:>10.1f} "
+              f"{smooth_time * 1000:>12.1f} {reference_smooth_time * 1000:>10.1f} {'identical' if same else 'DIFFERENT':>10}")
+
+    random.seed(seed)
+    terrains = [TerrainType.WATER, TerrainType.GRASS, TerrainType.SAND]
+    noise_map = [[random.choice(terrains) for _ in range(72)] for _ in range(72)]
+    same = smooth_map(noise_map) == reference_smooth_map(noise_map)
+    failed = failed or not same
+    print(f"{f'noise 72 #{seed}':>16} {'':>13} {'':>10} {'':>12} {'':>10} {'identical' if same else 'DIFFERENT':>10}")
+
+print("FAILED" if failed else "OK")
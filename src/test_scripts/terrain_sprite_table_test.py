@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+import random
+import contextlib
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from classes.tile.Tile import TerrainType
+from generation.map_gen.utils import upscale_map, smooth_map, choose_terrain_sprite
+from generation.tile_gen.terrain_gen.VoronoiTerrainGenerator import VoronoiTerrainGenerator
+from generation.tile_gen.terrain_gen.terrain_sprite_tables import choose_terrain_sprites
+
+# Checks that the table driven choose_terrain_sprites picks exactly the sprites (and draws exactly
+# the same random numbers) as calling the sprite handlers through choose_terrain_sprite for every tile.
+# Generated Voronoi terrain maps cover the usual borders, random noise maps every odd neighborhood.
+
+TERRAIN_WEIGHTS = {
+    TerrainType.WATER: 1,
+    TerrainType.GRASS: 3,
+    TerrainType.SAND: 2,
+    TerrainType.DIRT: 3,
+    TerrainType.ROCK: 1,
+    TerrainType.SNOW: 2,
+}
+
+
+def voronoi_terrain_map(size: int) -> list[list[TerrainType]]:
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        terrain_map = VoronoiTerrainGenerator(height=size // 2, width=size // 2, terrain_weights=TERRAIN_WEIGHTS).generate_map()
+        return smooth_map(upscale_map(terrain_map))
+
+
+def noise_terrain_map(size: int) -> list[list[TerrainType]]:
+    terrains = list(TerrainType)
+    return [[random.choice(terrains) for _ in range(size)] for _ in range(size)]
+
+
+failed = False
+print(f"{'map':>16} {'tiles':>6} {'handlers [ms]':>14} {'tables [ms]':>12} {'result':>10}")
+for name, make_map, size in [("voronoi", voronoi_terrain_map, 72), ("voronoi", voronoi_terrain_map, 144),
+                             ("noise", noise_terrain_map, 36), ("noise", noise_terrain_map, 72)]:
+    random.seed(size)
+    terrain_map = make_map(size)
+
+    random.seed(0)
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        expected = [[choose_terrain_sprite(terrain_map, x, y) for x in range(size)] for y in range(size)]
+    handlers_time = time.perf_counter() - start
+    expected_state = random.getstate()
+
+    random.seed(0)
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        actual = choose_terrain_sprites(terrain_map)
+    tables_time = time.perf_counter() - start
+
+    same = actual == expected and random.getstate() == expected_state
+    failed = failed or not same
+    print(f"{f'{name} {size}x{size}':>16} {size * size:>6} {handlers_time * 1000:>14.1f} {tables_time * 1000:>12.1f} "
+          f"{'identical' if same else 'DIFFERENT':>10}")
+
+print("FAILED" if failed else "OK")
@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import random
+
+# Ensure that imports are done from the level of the src directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from generation.pcg_algorithms.voronoi import label_nearest_seeds, label_neighbor_pairs
+
+# Checks label_nearest_seeds (lower envelope of the seed distance parabolas, row by row) and
+# label_neighbor_pairs (shifted label rows) against plain scans kept below as reference:
+# every tile takes the nearest seed by squared Euclidean distance, ties go to the lower seed index
+# (min() over the seed list), and neighbor pairs are collected tile by tile over the 4-neighborhood.
+# Covers random seeds, duplicated seeds, seeds sharing rows and columns, and seeds on the map edges.
+
+
+def reference_label_nearest_seeds(width, height, seeds):
+    return [min(((x - sx) ** 2 + (y - sy) ** 2, idx) for idx, (sx, sy) in enumerate(seeds))[1]
+            for y in range(height) for x in range(width)]
+
+
+def reference_label_neighbor_pairs(labels, width, height):
+    pairs = set()
+    for y in range(height):
+        for x in range(width):
+            a = labels[y * width + x]
+            for nx, ny in ((x + 1, y), (x, y + 1), (x - 1, y), (x, y - 1)):
+                if 0 <= nx < width and 0 <= ny < height and labels[ny * width + nx] != a:
+                    pairs.add((a, labels[ny * width + nx]))
+    return pairs
+
+
+def random_seeds(width, height, count):
+    return [(random.randrange(width), random.randrange(height)) for _ in range(count)]
+
+
+def edge_seeds(width, height, count):
+    seeds = [(0, 0), (width - 1, 0), (0, height - 1), (width - 1, height - 1)]
+    while len(seeds) < count:
+        side = random.randrange(4)
+        if side == 0:
+            seeds.append((random.randrange(width), 0))
+        elif side == 1:
+            seeds.append((random.randrange(width), height - 1))
+        elif side == 2:
+            seeds.append((0, random.randrange(height)))
+        else:
+            seeds.append((width - 1, random.randrange(height)))
+    return seeds
+
+
+def duplicated_seeds(width, height, count):
+    seeds = random_seeds(width, height, count // 2)
+    return [random.choice(seeds) for _ in range(count)]
+
+
+def lattice_seeds(width, height, count):
+    # seeds on a coarse lattice: many equal distances, shared rows and shared columns
+    step = max(2, int((width * height / count) ** 0.5))
+    return [(x, y) for y in range(0, height, step) for x in range(0, width, step)][:count]
+
+
+CASES = [("random", random_seeds, 36, 36, 12), ("random", random_seeds, 72, 48, 60), ("random", random_seeds, 144, 144, 64),
+         ("edges", edge_seeds, 36, 36, 10), ("edges", edge_seeds, 72, 72, 40),
+         ("duplicates", duplicated_seeds, 36, 36, 16), ("duplicates", duplicated_seeds, 72, 72, 50),
+         ("lattice", lattice_seeds, 36, 36, 30), ("lattice", lattice_seeds, 72, 72, 100),
+         ("single", random_seeds, 20, 10, 1), ("one row", random_seeds, 50, 1, 7), ("one column", random_seeds, 1, 50, 7)]
+
+failed = False
+print(f"{'seeds':>11} {'map':>8} {'count':>6} {'time [ms]':>10} {'reference':>10} {'labels':>10} {'pairs':>10}")
+random.seed(0)
+for name, make_seeds, width, height, count in CASES:
+    seeds = make_seeds(width, height, count)
+
+    start = time.perf_counter()
+    labels = label_nearest_seeds(width, height, seeds)
+    label_time = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = reference_label_nearest_seeds(width, height, seeds)
+    reference_time = time.perf_counter() - start
+
+    same_labels = labels == expected
+    same_pairs = label_neighbor_pairs(labels, width, height) == reference_label_neighbor_pairs(expected, width, height)
+    failed = failed or not (same_labels and same_pairs)
+    print(f"{name:>11} {f'{width}x{height}':>8} {len(seeds):>6} {label_time * 1000:>10.1f} {reference_time * 1000:>10.1f} "
+          f"{'identical' if same_labels else 'DIFFERENT':>10} {'identical' if same_pairs else 'DIFFERENT':>10}")
+
+print("FAILED" if failed else "OK")